@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # No sound card needed
+
+import threading
+import time
+import pytest
+
+pytest.importorskip("pygame")
+from cancellation import CancellationToken, active_requests
+from playBusyWaitAudio import play_busy_wait_audioMusic
+
+# Every clip is about two seconds long
+STOPPED_WITHIN = 0.5
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_cancelling_the_token_stops_the_clip(capsys):
+    token = CancellationToken("busy wait audio")
+    threading.Timer(0.1, token.cancel).start()
+    started = time.monotonic()
+    play_busy_wait_audioMusic(token)
+    assert time.monotonic() - started < 0.1 + STOPPED_WITHIN
+    assert "Busy wait audio stopped" in capsys.readouterr().out
+
+
+def test_stop_cancels_a_clip_started_without_a_token(capsys):
+    in_flight = active_requests.stats()["in_flight"]
+    player = threading.Thread(target=play_busy_wait_audioMusic)
+    player.start()
+    deadline = time.monotonic() + 1.0
+    while active_requests.stats()["in_flight"] == in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # Let the clip start
+    assert active_requests.cancel_all("stop command") >= 1
+    player.join(STOPPED_WITHIN)
+    assert not player.is_alive()
+    assert "Busy wait audio stopped" in capsys.readouterr().out
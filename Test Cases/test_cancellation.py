@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import pytest
+from cancellation import CancellationToken, RequestRegistry, Cancelled
+
+
+def test_callbacks_run_once_on_cancel():
+    token = CancellationToken("answer")
+    calls = []
+    token.on_cancel(lambda: calls.append("stop player"))
+    token.cancel("stop command")
+    token.cancel("again")
+    assert calls == ["stop player"]
+    assert token.cancelled and token.reason == "stop command"
+
+
+def test_callback_registered_after_cancel_runs_immediately():
+    token = CancellationToken()
+    token.cancel()
+    calls = []
+    token.on_cancel(lambda: calls.append(True))
+    assert calls == [True]
+
+
+def test_failing_callback_does_not_block_the_others():
+    token = CancellationToken()
+    calls = []
+    token.on_cancel(lambda: 1 / 0)
+    token.on_cancel(lambda: calls.append(True))
+    token.cancel()
+    assert calls == [True]
+
+
+def test_raise_if_cancelled_and_wait():
+    token = CancellationToken()
+    assert not token.wait(0.01)
+    token.raise_if_cancelled()
+    threading.Timer(0.02, token.cancel).start()
+    assert token.wait(1.0)
+    with pytest.raises(Cancelled):
+        token.raise_if_cancelled()
+
+
+def test_registry_cancels_only_in_flight_requests():
+    registry = RequestRegistry()
+    with registry.track("finished") as finished:
+        pass
+    with registry.track("answer") as answer:
+        assert registry.stats()["in_flight"] == 1
+        assert registry.cancel_all("stop") == 1
+    assert answer.cancelled and not finished.cancelled
+    stats = registry.stats()
+    assert (stats["in_flight"], stats["started"], stats["cancelled"]) == (0, 2, 1)
+    assert len(registry.cancel_latency_ms) == 1
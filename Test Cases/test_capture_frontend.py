@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from capture_frontend import Resampler
+
+
+def tone(rate, seconds, frequency=440, amplitude=8000):
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def dominant_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples.astype(np.float32)))
+    return np.argmax(spectrum) * rate / samples.size
+
+
+def resample(native_rate, audio, channels=1, block_ms=100):
+    resampler = Resampler(native_rate, channels)
+    block = int(native_rate * block_ms / 1000) * channels
+    return np.concatenate([resampler.process(audio[i:i + block]).copy() for i in range(0, audio.size, block)])
+
+
+def test_native_rates_are_converted_to_16_khz():
+    for rate in (48000, 44100, 22050):
+        out = resample(rate, tone(rate, 1.0))
+        assert abs(out.size - 16000) <= 2
+        assert abs(dominant_frequency(out, 16000) - 440) <= 2
+
+
+def test_stereo_is_downmixed():
+    mono = tone(48000, 0.5)
+    stereo = np.column_stack((mono, mono)).ravel()
+    out = resample(48000, stereo, channels=2)
+    assert abs(out.size - 8000) <= 2
+    assert abs(dominant_frequency(out, 16000) - 440) <= 2
+
+
+def test_16_khz_mono_passes_through():
+    audio = tone(16000, 0.2)
+    assert np.array_equal(resample(16000, audio), audio)
+
+
+def test_content_above_the_target_nyquist_is_filtered():
+    out = resample(48000, tone(48000, 1.0, frequency=12000))
+    assert np.sqrt(np.mean(out.astype(np.float32) ** 2)) < 8000 * 0.05
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import time
+from command_coalescer import CommandCoalescer, repetitions
+
+WINDOW = 0.05
+
+
+class Recorder:
+    """Stands in for the Spotify operations, recording each applied step."""
+
+    def __init__(self):
+        self.calls = []
+        self.done = threading.Event()
+
+    def operation(self, group):
+        def run(step):
+            self.calls.append((group, step, time.perf_counter()))
+            self.done.set()
+        return run
+
+    def operations(self):
+        return {group: self.operation(group) for group in ("volume", "seek", "track")}
+
+
+def settle():
+    time.sleep(WINDOW * 4)
+
+
+def test_first_command_runs_immediately():
+    recorder = Recorder()
+    coalescer = CommandCoalescer(recorder.operations(), window=10.0)
+    started = time.perf_counter()
+    coalescer.add("volume up")
+    assert recorder.calls[0][:2] == ("volume", 10)
+    assert recorder.calls[0][2] - started < 0.05
+
+
+def test_burst_after_the_first_command_is_summed():
+    recorder = Recorder()
+    coalescer = CommandCoalescer(recorder.operations(), window=WINDOW)
+    for _ in range(4):
+        coalescer.add("volume up")
+    coalescer.add("next", count=3)
+    settle()
+    assert sorted(call[:2] for call in recorder.calls) == [("track", 3), ("volume", 10), ("volume", 30)]
+    assert coalescer.stats()["operations"] == 3
+    assert coalescer.stats()["commands"] == 7
+
+
+def test_followers_that_cancel_out_apply_nothing():
+    recorder = Recorder()
+    coalescer = CommandCoalescer(recorder.operations(), window=WINDOW)
+    coalescer.add("skip")
+    coalescer.add("skip")
+    coalescer.add("rewind")
+    coalescer.add("rewind")
+    settle()
+    assert [call[:2] for call in recorder.calls] == [("seek", 5000), ("seek", -5000)]
+    recorder.calls.clear()
+    coalescer.add("volume up")
+    coalescer.add("volume up")
+    coalescer.add("volume down")
+    settle()
+    assert [call[:2] for call in recorder.calls] == [("volume", 10)]
+
+
+def test_a_new_burst_starts_after_the_window():
+    recorder = Recorder()
+    coalescer = CommandCoalescer(recorder.operations(), window=WINDOW)
+    coalescer.add("next")
+    settle()
+    coalescer.add("next")
+    assert [call[:2] for call in recorder.calls] == [("track", 1), ("track", 1)]
+
+
+def test_dispatch_errors_do_not_escape_the_timer():
+    recorder = Recorder()
+    errors = []
+    threading.excepthook, previous = (lambda args: errors.append(args)), threading.excepthook
+    try:
+        def dispatch(label, operation):
+            raise RuntimeError("executor shut down")
+        coalescer = CommandCoalescer(recorder.operations(), window=WINDOW, dispatch=dispatch)
+        coalescer.add("volume up")
+        coalescer.add("volume up")
+        settle()
+    finally:
+        threading.excepthook = previous
+    assert errors == []
+    assert [call[:2] for call in recorder.calls] == [("volume", 10)]
+
+
+def test_repetitions():
+    assert repetitions("next next next", "next") == 3
+    assert repetitions("volume up", "volume up") == 1
+    assert repetitions("play the next episode", "next") == 1
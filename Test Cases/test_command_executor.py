@@ -0,0 +1,30 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+from command_executor import CommandExecutor, DOMAIN_WORKERS
+
+
+def test_speech_plays_while_the_llm_worker_takes_the_next_request():
+    executor = CommandExecutor()
+    playing, finished, answered = threading.Event(), threading.Event(), threading.Event()
+    order = []
+
+    def answer():
+        # The answer hands its playback to the TTS worker and returns right away
+        executor.submit("tts", lambda: (playing.set(), finished.wait(1.0)), "speech")
+        order.append("answer")
+
+    executor.submit("llm", answer, "what is music")
+    executor.submit("llm", lambda: (order.append("next question"), answered.set()), "who is queen")
+    assert playing.wait(1.0)
+    assert answered.wait(1.0)
+    assert order == ["answer", "next question"]
+    assert not finished.is_set()  # still speaking
+    finished.set()
+    executor.shutdown()
+
+
+def test_every_domain_has_a_worker():
+    assert set(DOMAIN_WORKERS) == {"spotify", "llm", "system", "tts"}
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from command_router import build_command_router, UNRECOGNIZED
+
+# Keys of CommandProcessor.SYSTEM_COMMANDS and SpotifyCommandHandler.SPOTIFY_COMMANDS
+# (the handlers are not needed to route, and importing them needs Spotify credentials)
+SYSTEM_COMMANDS = dict.fromkeys(["open browser", "open terminal", "open finder"])
+SPOTIFY_COMMANDS = dict.fromkeys([
+    "play", "resume", "pause", "next", "previous", "back", "shuffle", "repeat",
+    "volume up", "volume down", "skip", "rewind", "playlist", "artist", "current",
+])
+
+router = build_command_router(SYSTEM_COMMANDS, SPOTIFY_COMMANDS)
+
+
+def route(command):
+    match = router.match(command)
+    return match.intent, match.keyword, match.argument
+
+
+def test_keywords_inside_a_song_name_are_part_of_the_argument():
+    assert route("play exit music") == ("spotify", "play", "exit music")
+    assert route("play don't stop me now") == ("spotify", "play", "don't stop me now")
+
+
+def test_keywords_inside_a_question_are_part_of_the_argument():
+    assert route("tell me about stop motion") == ("llm", "tell me about", "stop motion")
+    assert route("what is the current exchange rate") == ("llm", "what is", "the current exchange rate")
+    assert route("what is music") == ("llm", "what is", "music")
+
+
+def test_more_specific_argument_keyword_takes_over():
+    assert route("play the playlist rap caviar") == ("spotify", "playlist", "rap caviar")
+    assert route("play the artist drake") == ("spotify", "artist", "drake")
+
+
+def test_keywords_before_an_argument_keep_their_priority():
+    assert route("stop play music")[0] == "stop"
+    assert route("stop play the playlist chill")[0] == "stop"
+    assert route("exit")[0] == "exit"
+
+
+def test_plain_commands():
+    assert route("volume up") == ("spotify", "volume up", None)
+    assert route("pause the music") == ("spotify", "pause", None)
+    assert route("open browser") == ("open browser", "open browser", None)
+    assert route("music") == ("spotify", "music", None)
+
+
+def test_whole_words_only():
+    assert router.match("start the stopwatch") == UNRECOGNIZED
+    assert route("playlist chill vibes on spotify") == ("spotify", "playlist", "chill vibes")
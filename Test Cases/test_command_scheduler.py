@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import queue
+import threading
+import pytest
+from command_scheduler import CommandScheduler, CONTROL, NORMAL, BACKGROUND
+
+
+def drain(scheduler):
+    items = []
+    while not scheduler.empty():
+        items.append(scheduler.get(block=False))
+    return items
+
+
+def test_priority_then_fifo():
+    scheduler = CommandScheduler()
+    scheduler.put("what is music", BACKGROUND)
+    scheduler.put("play despacito", NORMAL)
+    scheduler.put("pause", CONTROL)
+    scheduler.put("next", NORMAL)
+    assert drain(scheduler) == ["pause", "play despacito", "next", "what is music"]
+    assert scheduler.stats()["preemptions"] == 3  # each ran ahead of the older question
+
+
+def test_newer_command_supersedes_a_queued_one_with_the_same_key():
+    scheduler = CommandScheduler()
+    scheduler.put("play despacito", NORMAL, key="playback")
+    scheduler.put("what is music", BACKGROUND)
+    scheduler.put("play hello", NORMAL, key="playback")
+    assert scheduler.qsize() == 2
+    assert drain(scheduler) == ["play hello", "what is music"]
+    assert scheduler.stats()["superseded"] == 1
+
+
+def test_a_key_is_free_again_once_its_command_was_taken():
+    scheduler = CommandScheduler()
+    scheduler.put("play despacito", NORMAL, key="playback")
+    assert scheduler.get(block=False) == "play despacito"
+    scheduler.put("play hello", NORMAL, key="playback")
+    assert drain(scheduler) == ["play hello"]
+    assert scheduler.stats()["superseded"] == 0
+
+
+def test_get_times_out_when_only_superseded_items_remain():
+    scheduler = CommandScheduler()
+    scheduler.put("next", NORMAL, key="next")
+    scheduler.put("next", NORMAL, key="next")
+    scheduler.get(block=False)
+    with pytest.raises(queue.Empty):
+        scheduler.get(timeout=0.01)
+
+
+def test_blocking_get_wakes_on_put_and_notifies_listeners():
+    scheduler = CommandScheduler()
+    woken = []
+    scheduler.subscribe(lambda: woken.append(True))
+    threading.Timer(0.02, scheduler.put, args=("pause", CONTROL)).start()
+    assert scheduler.get(timeout=1.0) == "pause"
+    assert woken == [True]
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from early_dispatch import PartialCommandDispatcher
+from command_router import build_command_router
+
+dispatcher = PartialCommandDispatcher(["pause", "next", "volume up"])
+
+
+def feed(partials):
+    dispatcher.reset()
+    return [dispatcher.feed(partial) for partial in partials]
+
+
+def test_stable_command_is_dispatched_once():
+    assert feed(["pau", "pause", "pause", "pause"]) == [None, None, "pause", None]
+
+
+def test_unstable_or_partial_commands_wait():
+    assert feed(["volume", "volume up", "volume"]) == [None, None, None]
+    assert feed(["next", "next song"]) == [None, None]
+
+
+def test_commands_with_arguments_are_never_dispatched_early():
+    assert feed(["play", "play", "play"]) == [None, None, None]
+
+
+def test_matching_final_is_dropped():
+    feed(["next", "next"])
+    assert dispatcher.confirm("Next.") is True
+    assert dispatcher.confirm("next") is False  # the utterance is over, nothing is pending
+
+
+def test_different_final_is_still_processed():
+    feed(["pause", "pause"])
+    assert dispatcher.confirm("play despacito") is False
+
+
+def test_final_containing_the_early_command_is_still_processed():
+    feed(["next", "next"])
+    assert dispatcher.confirm("play next to me") is False
+
+
+def test_router_key_drops_the_same_command_with_extra_words():
+    router = build_command_router({}, dict.fromkeys(["play", "next", "pause"]))
+    routed = PartialCommandDispatcher(["next"], key=lambda text: router.match(text)[:3])
+    for final, dropped in (("next song", True), ("play next to me", False)):
+        routed.feed("next")
+        routed.feed("next")
+        assert routed.confirm(final) is dropped
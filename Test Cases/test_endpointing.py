@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from endpointing import AdaptiveEndpointer, COMPLETE_COMMAND_SILENCE, DEFAULT_SILENCE, OPEN_ENDED_SILENCE
+
+endpointer = AdaptiveEndpointer(["pause", "next", "volume up"])
+
+
+def test_window_follows_the_partial_transcript():
+    assert endpointer.silence_window("Pause ") == COMPLETE_COMMAND_SILENCE
+    assert endpointer.silence_window("play") == DEFAULT_SILENCE
+    assert endpointer.silence_window("what is the tallest mountain") == OPEN_ENDED_SILENCE
+    assert endpointer.max_silence == OPEN_ENDED_SILENCE
+
+
+def test_complete_command_ends_quickly():
+    assert not endpointer.should_end(0.2, "next")
+    assert endpointer.should_end(0.3, "next")
+
+
+def test_questions_survive_a_mid_sentence_pause():
+    assert not endpointer.should_end(0.8, "tell me about the")
+    assert endpointer.should_end(1.3, "tell me about the moon")
+
+
+def test_nothing_heard_never_ends():
+    assert not endpointer.should_end(5.0, "")
+
+
+def test_stats_record_the_delays():
+    model = AdaptiveEndpointer(["pause"])
+    model.should_end(0.3, "pause")
+    model.should_end(0.7, "play")
+    stats = model.stats()
+    assert stats["utterances"] == 2
+    assert round(stats["endpoint_delay_ms_mean"]) == 500
+    assert round(stats["endpoint_delay_ms_max"]) == 700
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from intent_classifier import IntentClassifier, extract_slots, evaluate
+
+classifier = IntentClassifier(log_path=None)
+
+
+def confident(text):
+    prediction = classifier.predict(text)
+    return prediction.intent if classifier.is_confident(prediction) else None
+
+
+def test_side_effecting_lookalikes_are_left_to_the_llm():
+    assert confident("shut down the computer") is None
+    assert confident("open the pod bay doors") is None
+    assert confident("turn down the thermostat") is None
+    assert confident("delete all my files") is None
+
+
+def test_paraphrases_are_answered_locally():
+    assert confident("get the calendar going")["parameters"] == {"app_name": "Calendar"}
+    assert confident("how do vaccines work")["intent"] == "question"
+
+
+def test_confident_volume_change_needs_sound_words():
+    intent = confident("turn it down")
+    assert intent["intent"] == "music_control"
+    assert intent["parameters"]["command"] == "volume down"
+
+
+def test_only_allowlisted_applications_are_launched():
+    assert extract_slots("launch_app", "open the calculator") == {"app_name": "Calculator"}
+    assert extract_slots("launch_app", "open the pod bay doors") == {}
+    intent = confident("launch the calculator")
+    assert intent == {"intent": "launch_app", "action": "open_application", "parameters": {"app_name": "Calculator"}}
+
+
+def test_slots_are_extracted():
+    assert extract_slots("get_weather", "what's the weather in miami today") == {"location": "miami"}
+    assert extract_slots("play_music", "queue up levitating by dua lipa") == {"song": "levitating", "artist": "dua lipa"}
+
+
+def test_learned_examples_are_persisted_once(tmp_path):
+    log = tmp_path / "intent_examples.jsonl"
+    model = IntentClassifier(log_path=log)
+    intent = {"intent": "music_control", "action": "spotify_command", "parameters": {"command": "volume up"}}
+    assert model.learn("bump the tunes", intent)
+    assert not model.learn("Bump the tunes!", intent)
+    assert len(log.read_text().splitlines()) == 1
+    assert IntentClassifier(log_path=log).predict("bump the tunes").intent["parameters"]["command"] == "volume up"
+
+
+def test_evaluate_counts_deferrals_and_wrong_answers():
+    samples = [("a", "search", {}), ("b", None, {}), ("c", "question", {})]
+    answers = {"a": {"intent": "search"}, "b": None, "c": {"intent": "search"}}
+    result = evaluate(answers.get, samples)
+    assert result["accuracy"] == 2 / 3
+    assert result["wrong"] == 1 / 3
+    assert result["answered"] == 2 / 3
+
+
+def test_evaluate_counts_wrong_parameters_as_wrong():
+    samples = [("freeze the track", "music_control", {"command": "pause"})]
+    result = evaluate(lambda text: {"intent": "music_control", "parameters": {"command": "previous"}}, samples)
+    assert result["accuracy"] == 1.0
+    assert result["wrong"] == 1.0
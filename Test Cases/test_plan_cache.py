@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from plan_cache import PlanCache, ExecutionPlan, normalize_transcript
+
+
+def plan(library_dependent=False):
+    return ExecutionPlan("spotify", lambda: None, library_dependent)
+
+
+def test_transcripts_are_normalized():
+    assert normalize_transcript("  Play   Don't Stop Me Now! ") == "play don't stop me now"
+    cache = PlanCache()
+    cached = plan()
+    cache.put("Next song.", cached)
+    assert cache.get("next   song") is cached
+    assert cache.contains("NEXT SONG")
+
+
+def test_least_recently_used_plan_is_evicted():
+    cache = PlanCache(capacity=2)
+    cache.put("pause", plan())
+    cache.put("next", plan())
+    cache.get("pause")
+    cache.put("previous", plan())
+    assert cache.contains("pause") and cache.contains("previous")
+    assert not cache.contains("next")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_library_change_drops_only_library_plans():
+    cache = PlanCache()
+    cache.put("pause", plan())
+    cache.put("play despacito", plan(library_dependent=True))
+    cache.on_library_change()
+    assert cache.contains("pause")
+    assert not cache.contains("play despacito")
+
+
+def test_invalidate_one_or_all():
+    cache = PlanCache()
+    cache.put("pause", plan())
+    cache.put("next", plan())
+    assert cache.invalidate("Pause") == 1
+    assert cache.invalidate("pause") == 0
+    assert cache.invalidate() == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_hit_rate():
+    cache = PlanCache()
+    cache.get("pause")
+    cache.put("pause", plan())
+    cache.get("pause")
+    cache.contains("pause")  # does not count as a lookup
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
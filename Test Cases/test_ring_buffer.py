@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import numpy as np
+from ring_buffer import AudioRingBuffer
+
+
+def samples(start, count):
+    return np.arange(start, start + count, dtype=np.int16)
+
+
+def test_reads_return_samples_in_order():
+    ring = AudioRingBuffer(8)
+    assert ring.write(samples(0, 5)) == 5
+    assert list(np.frombuffer(ring.read(3), dtype=np.int16)) == [0, 1, 2]
+    assert ring.available() == 2
+
+
+def test_reads_that_wrap_are_contiguous():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 6))
+    ring.read(6)
+    ring.release()
+    ring.write(samples(6, 6))
+    assert list(np.frombuffer(ring.read(6, timeout=1.0), dtype=np.int16)) == list(range(6, 12))
+
+
+def test_overflow_is_dropped_and_counted():
+    ring = AudioRingBuffer(4)
+    assert ring.write(samples(0, 6)) == 4
+    assert ring.overflow_samples == 2
+    # Unreleased samples from the last read still occupy the ring
+    ring.read(2)
+    assert ring.write(samples(6, 2)) == 0
+    ring.release()
+    assert ring.write(samples(6, 2)) == 2
+    assert ring.stats()["overflow_samples"] == 4
+
+
+def test_read_times_out_without_enough_samples():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 2))
+    assert ring.read(4, timeout=0.01) is None
+    assert ring.available() == 2
+
+
+def test_read_waits_for_the_producer():
+    ring = AudioRingBuffer(8)
+    threading.Timer(0.02, ring.write, args=(samples(0, 4),)).start()
+    assert list(np.frombuffer(ring.read(4, timeout=1.0), dtype=np.int16)) == [0, 1, 2, 3]
+
+
+def test_external_buffer_shares_the_cursors():
+    memory = bytearray(AudioRingBuffer.required_bytes(8))
+    producer = AudioRingBuffer(8, buffer=memory)
+    consumer = AudioRingBuffer(8, buffer=memory)
+    producer.write(samples(0, 3))
+    assert consumer.available() == 3
+    assert list(np.frombuffer(consumer.read(3), dtype=np.int16)) == [0, 1, 2]
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+from tracing import Tracer
+from command_scheduler import CommandScheduler
+
+
+def test_identical_queued_commands_keep_their_own_traces():
+    tracer = Tracer()
+    queue = CommandScheduler()
+    first = tracer.start_trace()
+    queue.put(tracer.handoff("next"))
+    second = tracer.start_trace()
+    queue.put(tracer.handoff("next"))
+    assert tracer.current() is None
+    assert tracer.resume(queue.get()) is first
+    assert tracer.resume(queue.get()) is second
+
+
+def test_superseded_commands_take_their_trace_with_them():
+    tracer = Tracer()
+    queue = CommandScheduler()
+    tracer.start_trace()
+    queue.put(tracer.handoff("next"), key="next")
+    latest = tracer.start_trace()
+    queue.put(tracer.handoff("next"), key="next")
+    assert queue.qsize() == 1
+    assert tracer.resume(queue.get()) is latest
+
+
+def test_plain_commands_have_no_trace():
+    tracer = Tracer()
+    assert tracer.resume("pause") is None
+    tracer.enabled = False
+    assert tracer.handoff("pause") == "pause"
+
+
+def test_bound_actions_record_spans_on_the_worker_thread():
+    tracer = Tracer()
+    trace = tracer.start_trace()
+    command = tracer.handoff("volume up")
+    action = tracer.bind(lambda: None, "execute.spotify", tracer.resume(command))
+    worker = threading.Thread(target=action)
+    worker.start()
+    worker.join()
+    assert [span[0] for span in trace.spans] == ["execute.spotify"]
+    assert trace.spans[0][1] == worker.ident
+    assert trace.finished is not None
+    assert tracer.stats()["execute.spotify"]["count"] == 1
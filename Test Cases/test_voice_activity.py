@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from voice_activity import VoiceActivityDetector, VAD_FRAME_MS
+
+RATE = 16000
+FRAME = RATE * VAD_FRAME_MS // 1000
+
+
+def silence(seconds, seed=0):
+    return np.random.default_rng(seed).integers(-20, 20, int(RATE * seconds)).astype(np.int16)
+
+
+def tone(seconds, frequency=220, amplitude=6000):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def segments_ended(vad, audio, block=1600):
+    """Feed audio in capture-sized blocks and count the segment ends reported."""
+    ended = 0
+    for start in range(0, audio.size, block):
+        vad.process(audio[start:start + block])
+        ended += vad.segment_ended
+    return ended
+
+
+def test_silence_is_dropped():
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    assert vad.process(silence(1.0)) == b""
+    assert vad.stats()["segments"] == 0
+    assert vad.stats()["drop_ratio"] == 1.0
+
+
+def test_speech_is_forwarded_with_pre_roll_and_hangover():
+    vad = VoiceActivityDetector(sample_rate=RATE, pre_roll_frames=5, hangover_frames=10)
+    vad.process(silence(0.5))
+    forwarded = vad.process(tone(0.2))
+    assert len(forwarded) == (5 + 10) * FRAME * 2  # pre-roll plus the 10 speech frames
+    assert vad.in_speech
+
+    tail = vad.process(silence(0.5, seed=1))
+    assert len(tail) == 10 * FRAME * 2
+    assert vad.segment_ended and not vad.in_speech
+
+
+def test_hiss_is_not_speech():
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    vad.process(silence(0.5))
+    hiss = np.random.default_rng(2).integers(-8000, 8000, RATE // 2).astype(np.int16)
+    assert vad.process(hiss) == b""
+
+
+def test_breath_pause_does_not_split_a_sentence_with_listen_length_hangover():
+    # "play the song ... by queen" with a half-second pause in the middle
+    audio = np.concatenate((silence(0.5), tone(0.6), silence(0.5, seed=1), tone(0.6), silence(1.2, seed=2)))
+
+    short = VoiceActivityDetector(sample_rate=RATE, hangover_frames=15)
+    assert segments_ended(short, audio) == 2
+
+    listen_pause = VoiceActivityDetector(sample_rate=RATE, hangover_frames=int(800 / VAD_FRAME_MS))
+    assert segments_ended(listen_pause, audio) == 1
+
+
+def test_blocks_that_do_not_fill_a_frame_are_carried_over():
+    vad = VoiceActivityDetector(sample_rate=RATE, pre_roll_frames=0)
+    vad.process(silence(0.2))
+    audio = tone(0.1)
+    forwarded = b"".join(vad.process(audio[i:i + 100]) for i in range(0, audio.size, 100))
+    assert len(forwarded) == audio.size // FRAME * FRAME * 2
+
+
+def test_calibration_sets_the_noise_floor_for_the_persistent_stream():
+    # A humming room well above VAD_MIN_ENERGY, with a click during calibration
+    room = tone(1.0, frequency=50, amplitude=1000)
+    room[4000:4160] = 20000
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    assert abs(vad.calibrate(room) - 1000 / np.sqrt(2)) < 50
+
+    assert vad.process(tone(0.5, frequency=50, amplitude=1000)) == b""
+    assert vad.process(tone(0.5, amplitude=6000)) != b""
+
+
+def test_noise_floor_keeps_following_the_room_after_calibration():
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    floor = vad.calibrate(tone(1.0, frequency=50, amplitude=1000))
+    louder_room = tone(0.1, frequency=50, amplitude=2500)
+    for _ in range(50):
+        assert vad.process(louder_room) == b""
+    assert vad.noise_energy > 2 * floor
+    assert vad.stats()["segments"] == 0
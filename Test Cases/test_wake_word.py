@@ -0,0 +1,118 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import time
+from wake_word import WakeWordCascade
+
+RATE = 16000
+
+
+class FakeRecognizer:
+    """Scripted KaldiRecognizer: returns the next partial/result and records the audio it was fed."""
+
+    def __init__(self):
+        self.fed = []
+        self.partials = []
+        self.final = ""
+
+    def SetWords(self, enabled):
+        pass
+
+    def SetPartialWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, data):
+        self.fed.append(data)
+        return False
+
+    def PartialResult(self):
+        return json.dumps(self.partials.pop(0) if self.partials else {"partial": ""})
+
+    def FinalResult(self):
+        return json.dumps({"text": self.final})
+
+    def Reset(self):
+        pass
+
+
+class FakeManager:
+    def __init__(self):
+        self.recognizers = []
+
+    def acquire(self, sample_rate, grammar=None):
+        self.recognizers.append(FakeRecognizer())
+        return self.recognizers[-1]
+
+
+def cascade():
+    manager = FakeManager()
+    model = WakeWordCascade(["hey nova"], sample_rate=RATE, manager=manager)
+    return model, manager.recognizers[0], manager.recognizers[1]
+
+
+def block(samples):
+    return (bytes(range(256)) * (samples * 2 // 256 + 1))[:samples * 2]
+
+
+def test_audio_after_the_wake_word_reaches_the_command_stage():
+    model, wake, command = cascade()
+    data = block(8000)  # 0.5 s, wake phrase ends 0.3 s in
+    wake.partials = [{"partial": "hey nova", "partial_result": [
+        {"word": "hey", "end": 0.1}, {"word": "nova", "end": 0.3}]}]
+    command.final = "pause"
+
+    assert model.process(data, segment_ended=True) == "pause"
+    assert command.fed == [data[int(0.3 * RATE) * 2:]]
+
+
+def test_wake_word_times_are_counted_across_blocks():
+    model, wake, command = cascade()
+    first, second = block(8000), block(8000)
+    wake.partials = [{"partial": ""}, {"partial": "hey nova", "partial_result": [{"word": "nova", "end": 0.75}]}]
+    model.process(first)
+    model.process(second)
+    assert model.awake
+    assert command.fed == [second[int(0.25 * RATE) * 2:]]
+
+
+def test_without_word_times_the_whole_block_is_kept_and_the_wake_phrase_dropped():
+    model, wake, command = cascade()
+    data = block(1600)
+    wake.partials = [{"partial": "hey nova"}]
+    command.final = "hey nova play despacito"
+    assert model.process(data, segment_ended=True) == "play despacito"
+    assert command.fed == [data]
+
+
+def test_wake_to_ready_is_measured_from_the_wake_word():
+    model, wake, command = cascade()
+    wake.partials = [{"partial": "hey nova", "partial_result": [{"word": "nova", "end": 0.25}]}]
+    received = time.perf_counter() - 0.05
+    model.process(block(8000), received_at=received)  # wake phrase ended 0.25 s before the block's end
+    ready = model.stats()["wake_to_ready_ms_max"]
+    assert 300 <= ready < 1000
+
+
+def test_wake_to_ready_does_not_include_the_pause_before_the_command():
+    model, wake, command = cascade()
+    wake.partials = [{"partial": "hey nova", "partial_result": [{"word": "nova", "end": 0.5}]}]
+    model.process(block(8000), received_at=time.perf_counter())  # nothing left over after the wake phrase
+    assert len(model.wake_to_ready_ms) == 1
+    ready = model.stats()["wake_to_ready_ms_max"]
+
+    # Behind a VAD the silence arrives as empty blocks before the user speaks
+    time.sleep(0.05)
+    model.process(b"")
+    model.process(block(1600))
+    assert list(model.wake_to_ready_ms) == [ready]
+    assert ready < 50
+
+
+def test_a_bare_wake_phrase_keeps_the_window_open():
+    model, wake, command = cascade()
+    wake.partials = [{"partial": "hey nova"}]
+    command.final = "hey nova"
+    assert model.process(block(1600), segment_ended=True) is None
+    assert model.awake
@@ -0,0 +1,257 @@
+# asr_benchmark.py
+"""
+Replay recorded utterances through the listener pipeline and benchmark ASR backends.
+
+Each 16-bit WAV fixture (converted to 16 kHz mono if needed) is fed frame by frame through the same
+capture -> VAD -> ASR -> CommandProcessor path the microphone listener uses. An
+optional <name>.txt next to each WAV holds the reference transcript used for WER.
+
+Usage:
+    python Tools/asr_benchmark.py fixtures/ --backends google-stub vosk
+    python Tools/asr_benchmark.py fixtures/ --realtime --execute
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import wave
+from pathlib import Path
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from speech_backends import SpeechBackend, VoskBackend, GrammarCommandBackend, SAMPLE_RATE, SAMPLE_WIDTH
+from command_grammar import build_command_grammar
+from spotify_command_handler import SpotifyCommandHandler
+from vosk_model_manager import model_manager
+from capture_frontend import Resampler
+from main import CommandProcessor, STREAM_CHUNK, _create_vad
+
+STAGES = ("capture", "vad", "asr", "finalize", "route", "total")
+DEFAULT_STUB_LATENCY = 0.4  # seconds, roughly one Google Web Speech round trip
+
+
+class GoogleStubBackend(SpeechBackend):
+    """
+    Offline stand-in for the Google backend.
+
+    Ignores the audio and returns the reference transcript after a fixed delay, so the
+    rest of the pipeline can be measured against a Google-like round trip offline.
+    """
+
+    name = "google-stub"
+    streaming = False
+
+    def __init__(self, latency=DEFAULT_STUB_LATENCY):
+        self.latency = latency
+        self.expected = ""
+
+    def accept_frame(self, frame):
+        return False
+
+    def final_text(self):
+        time.sleep(self.latency)
+        return self.expected
+
+
+# Backend factories available to the benchmark
+BENCHMARK_BACKENDS = {
+    "google-stub": lambda args: GoogleStubBackend(args.stub_latency),
+    "vosk": lambda args: VoskBackend(),
+    "vosk-grammar": lambda args: GrammarCommandBackend(
+        build_command_grammar(SpotifyCommandHandler.SPOTIFY_COMMANDS, CommandProcessor.SYSTEM_COMMANDS)),
+}
+
+
+def load_fixtures(directory):
+    """
+    Load WAV fixtures and their reference transcripts.
+
+    Args:
+        directory (str): Directory containing *.wav files (and optional *.txt references)
+
+    Returns:
+        list: (name, samples, reference) tuples; reference is None without a .txt file
+    """
+    fixtures = []
+    for path in sorted(Path(directory).glob("*.wav")):
+        with wave.open(str(path), "rb") as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                print(f"Skipping {path.name}: expected 16-bit PCM")
+                continue
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            if (wav.getframerate(), wav.getnchannels()) != (SAMPLE_RATE, 1):
+                # Same conversion the live capture front end applies
+                resampler = Resampler(wav.getframerate(), wav.getnchannels(), SAMPLE_RATE,
+                                      block_frames=samples.size // wav.getnchannels())
+                samples = resampler.process(samples).copy()
+
+        reference_path = path.with_suffix(".txt")
+        reference = reference_path.read_text().strip().lower() if reference_path.exists() else None
+        fixtures.append((path.name, samples, reference))
+    return fixtures
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Compute word error rate with a word-level edit distance.
+
+    Args:
+        reference (str): Expected transcript
+        hypothesis (str): Recognized transcript
+
+    Returns:
+        float: (substitutions + deletions + insertions) / reference word count
+    """
+    ref = reference.split()
+    hyp = hypothesis.split()
+    if not ref:
+        return float(bool(hyp))
+
+    distance = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distance[0] = distance[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            current = min(distance[j] + 1, distance[j - 1] + 1, previous + (ref_word != hyp_word))
+            previous, distance[j] = distance[j], current
+    return distance[-1] / len(ref)
+
+
+def run_fixture(backend, samples, realtime=False, execute=False):
+    """
+    Feed one fixture through capture -> VAD -> ASR -> routing.
+
+    Args:
+        backend (SpeechBackend): Backend under test (reset before use)
+        samples (np.ndarray): int16 audio
+        realtime (bool): Pace frames at the microphone rate instead of as fast as possible
+        execute (bool): Run CommandProcessor.process_command instead of only routing
+
+    Returns:
+        tuple: (str, dict) - Transcript and per-stage timings in seconds
+    """
+    vad, endpointer = _create_vad(backend)
+    timings = dict.fromkeys(STAGES, 0.0)
+    frame_duration = STREAM_CHUNK / SAMPLE_RATE
+    started = time.perf_counter()
+
+    for offset in range(0, samples.size, STREAM_CHUNK):
+        t0 = time.perf_counter()
+        frame = samples[offset:offset + STREAM_CHUNK].tobytes()
+        t1 = time.perf_counter()
+        speech = vad.process(frame)
+        t2 = time.perf_counter()
+        finished = bool(speech) and backend.accept_frame(speech)
+        if endpointer and not finished and vad.in_speech and vad.trailing_silence > 0:
+            finished = endpointer.should_end(vad.trailing_silence, backend.partial_text())
+        t3 = time.perf_counter()
+
+        timings["capture"] += t1 - t0
+        timings["vad"] += t2 - t1
+        timings["asr"] += t3 - t2
+
+        if finished or vad.segment_ended:
+            break
+        if realtime:
+            time.sleep(max(0.0, frame_duration - (t3 - t0)))
+
+    # End of speech: everything from here until a routed command is user-visible latency
+    t0 = time.perf_counter()
+    transcript = backend.final_text()
+    t1 = time.perf_counter()
+    if transcript:
+        if execute:
+            CommandProcessor.process_command(transcript)
+        else:
+            CommandProcessor.route(transcript)
+    t2 = time.perf_counter()
+
+    timings["finalize"] = t1 - t0
+    timings["route"] = t2 - t1
+    timings["total"] = t2 - started
+    return transcript, timings
+
+
+def benchmark_backend(name, backend, fixtures, realtime=False, execute=False):
+    """
+    Run every fixture through one backend and summarize the results.
+
+    Returns:
+        dict: Per-stage p50/p95 latency (ms), real-time factor and WER
+    """
+    stage_samples = {stage: [] for stage in STAGES}
+    errors = []
+    audio_seconds = 0.0
+    processing_seconds = 0.0
+
+    for fixture_name, samples, reference in fixtures:
+        backend.reset()
+        if isinstance(backend, GoogleStubBackend):
+            backend.expected = reference or ""
+
+        transcript, timings = run_fixture(backend, samples, realtime, execute)
+        for stage, seconds in timings.items():
+            stage_samples[stage].append(seconds * 1000)
+
+        audio_seconds += samples.size / SAMPLE_RATE
+        processing_seconds += timings["vad"] + timings["asr"] + timings["finalize"]
+        if reference is not None:
+            errors.append(word_error_rate(reference, transcript))
+        print(f"[{name}] {fixture_name}: '{transcript}' ({timings['total'] * 1000:.0f} ms)")
+
+    summary = {"backend": name, "fixtures": len(fixtures)}
+    for stage, values in stage_samples.items():
+        if values:
+            summary[f"{stage}_p50_ms"] = float(np.percentile(values, 50))
+            summary[f"{stage}_p95_ms"] = float(np.percentile(values, 95))
+    summary["rtf"] = processing_seconds / audio_seconds if audio_seconds else 0.0
+    summary["wer"] = float(np.mean(errors)) if errors else None
+    return summary
+
+
+def print_summary(summaries):
+    """Print a per-backend latency table."""
+    print(f"\n{'backend':<14}" + "".join(f"{stage + ' p50/p95':>22}" for stage in STAGES) + f"{'RTF':>8}{'WER':>8}")
+    for summary in summaries:
+        row = f"{summary['backend']:<14}"
+        for stage in STAGES:
+            row += f"{summary.get(f'{stage}_p50_ms', 0):>13.1f}/{summary.get(f'{stage}_p95_ms', 0):<8.1f}"
+        wer = summary["wer"]
+        row += f"{summary['rtf']:>8.3f}" + (f"{wer:>8.3f}" if wer is not None else f"{'n/a':>8}")
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ASR backends on recorded utterances")
+    parser.add_argument("fixtures", help="Directory of 16 kHz mono WAV files with optional .txt references")
+    parser.add_argument("--backends", nargs="+", default=list(BENCHMARK_BACKENDS),
+                        choices=list(BENCHMARK_BACKENDS), help="Backends to compare")
+    parser.add_argument("--realtime", action="store_true", help="Feed audio at microphone speed")
+    parser.add_argument("--execute", action="store_true", help="Execute commands instead of only routing them")
+    parser.add_argument("--stub-latency", type=float, default=DEFAULT_STUB_LATENCY,
+                        help="Simulated Google round trip in seconds")
+    parser.add_argument("--json", help="Write the summaries to this file")
+    args = parser.parse_args()
+
+    # Load the shared model while fixtures are read; every Vosk backend reuses it
+    model_manager.preload()
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No usable WAV fixtures found in {args.fixtures}")
+        return
+
+    summaries = []
+    for name in args.backends:
+        backend = BENCHMARK_BACKENDS[name](args)
+        summaries.append(benchmark_backend(name, backend, fixtures, args.realtime, args.execute))
+
+    print_summary(summaries)
+    print(f"\nVosk model: {model_manager.stats()}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
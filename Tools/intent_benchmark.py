@@ -0,0 +1,104 @@
+# intent_benchmark.py
+"""
+Compare the local intent classifier with the ollama JSON intent extractor on held-out
+paraphrases, including utterances that must be left to the LLM.
+
+Usage:
+    python Tools/intent_benchmark.py
+    python Tools/intent_benchmark.py --llm            # also time the ollama.chat path
+    python Tools/intent_benchmark.py --threshold 0.5
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from intent_classifier import IntentClassifier, evaluate, CONFIDENCE_THRESHOLD, CONFIDENCE_MARGIN
+
+# Held-out paraphrases: none reuses a TRAINING_EXAMPLES template (no "turn it up",
+# "put on X", "weather in X", "open X app"), so they measure generalization rather
+# than recall. (utterance, expected intent, expected parameters)
+SAMPLES = [
+    ("could you bring the volume up a notch", "music_control", {"command": "volume up"}),
+    ("i can barely hear the song", "music_control", {"command": "volume up"}),
+    ("the music is way too loud", "music_control", {"command": "volume down"}),
+    ("bring the sound down a little", "music_control", {"command": "volume down"}),
+    ("freeze the track for a minute", "music_control", {"command": "pause"}),
+    ("carry on with the song", "music_control", {"command": "resume"}),
+    ("move on to whatever is next", "music_control", {"command": "next"}),
+    ("i'm sick of this tune", "music_control", {"command": "next"}),
+    ("take me back to the song before", "music_control", {"command": "previous"}),
+    ("which track is this", "music_control", {"command": "current"}),
+    ("what am i listening to", "music_control", {"command": "current"}),
+    ("scramble the queue order", "music_control", {"command": "shuffle"}),
+    ("keep repeating this one", "music_control", {"command": "repeat"}),
+    ("i'd love to hear hey jude", "play_music", {"song": "hey jude"}),
+    ("can we get some fleetwood mac going", "play_artist", {"artist": "fleetwood mac"}),
+    ("bring up the bbc homepage", "open_website", {}),
+    ("head over to espn", "open_website", {}),
+    ("do a web search on knitting patterns", "search", {"query": "knitting patterns"}),
+    ("find me info about black holes online", "search", {}),
+    ("do i need an umbrella in dublin", "get_weather", {"location": "dublin"}),
+    ("how cold will it be in oslo tomorrow", "get_weather", {"location": "oslo"}),
+    ("what's happening in the world of science", "get_news", {}),
+    ("any updates on the election", "get_news", {}),
+    ("get the calendar going", "launch_app", {"app_name": "Calendar"}),
+    ("i need the calculator", "launch_app", {"app_name": "Calculator"}),
+    ("let priya know i'm outside", "send_message", {"recipient": "priya"}),
+    ("ping ben that the meeting moved", "send_message", {"recipient": "ben"}),
+    ("what causes earthquakes", "question", {}),
+    ("how do vaccines work", "question", {}),
+    ("explain compound interest to me", "question", {}),
+    # Not supported, or not safe to act on without the LLM: expected to be left to it
+    ("shut down the computer", None, {}),
+    ("open the pod bay doors", None, {}),
+    ("start the car", None, {}),
+    ("turn down the thermostat", None, {}),
+    ("delete all my files", None, {}),
+    ("launch the missiles", None, {}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local intent classification against the LLM")
+    parser.add_argument("--llm", action="store_true", help="Also run the ollama.chat intent extractor")
+    parser.add_argument("--threshold", type=float, default=CONFIDENCE_THRESHOLD, help="Confidence threshold")
+    parser.add_argument("--margin", type=float, default=CONFIDENCE_MARGIN, help="Required lead over other intents")
+    args = parser.parse_args()
+
+    classifier = IntentClassifier(log_path=None, threshold=args.threshold, margin=args.margin)
+
+    def confident_only(text):
+        prediction = classifier.predict(text)
+        return prediction.intent if classifier.is_confident(prediction) else None
+
+    rows = [
+        ("classifier (all)", evaluate(lambda text: classifier.predict(text).intent, SAMPLES)),
+        ("classifier (confident)", evaluate(confident_only, SAMPLES)),
+    ]
+    if args.llm:
+        from llm_intents import extract_intent
+        rows.append(("ollama.chat", evaluate(extract_intent, SAMPLES)))
+
+    print(f"{len(SAMPLES)} held-out utterances, threshold {args.threshold}, margin {args.margin}\n")
+    print(f"{'predictor':<24}{'answered':>10}{'wrong':>8}{'accuracy':>10}{'exact':>8}{'mean ms':>10}{'p95 ms':>10}")
+    for name, result in rows:
+        print(f"{name:<24}{result['answered']:>10.0%}{result['wrong']:>8.0%}{result['accuracy']:>10.0%}"
+              f"{result['exact']:>8.0%}{result['latency_ms_mean']:>10.3f}{result['latency_ms_p95']:>10.3f}")
+
+    if not args.llm:
+        print("\nRun with --llm to compare against the ollama.chat path.")
+
+    print("\nConfident local answers:")
+    for text, expected, parameters in SAMPLES:
+        prediction = classifier.predict(text)
+        if prediction.confidence >= args.threshold and prediction.margin >= args.margin:
+            got = prediction.intent["intent"]
+            wrong = evaluate(lambda _: prediction.intent, [(text, expected, parameters)])["wrong"]
+            print(f"  {'WRONG' if wrong else 'ok   '} {text!r} -> {got} {prediction.intent['parameters']} "
+                  f"({prediction.confidence:.2f}, margin {prediction.margin:.2f})")
+
+
+if __name__ == "__main__":
+    main()
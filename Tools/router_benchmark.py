@@ -0,0 +1,89 @@
+# router_benchmark.py
+"""
+Microbenchmark command routing: the compiled word-boundary router against the old
+chain of substring scans over the command tables.
+
+Usage:
+    python Tools/router_benchmark.py
+    python Tools/router_benchmark.py --repeat 50000
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from command_router import benchmark
+from spotify_command_handler import SpotifyCommandHandler
+from main import CommandProcessor
+
+# Representative transcripts, including ones the substring scans misrouted
+COMMANDS = [
+    "pause",
+    "next",
+    "volume up",
+    "play die for you by the weeknd",
+    "playlist chill vibes on spotify",
+    "play the playlist rap caviar",
+    "artist taylor swift",
+    "stop",
+    "start the stopwatch",
+    "open browser",
+    "what is the capital of france",
+    "tell me about black holes",
+    "exit",
+    "good morning",
+]
+
+
+def substring_route(command):
+    """The previous routing order, kept here as the baseline."""
+    command = command.lower().strip()
+    if "exit" in command or "quit" in command:
+        return "exit"
+    if "stop" in command:
+        return "stop"
+    if ("spotify" in command or "music" in command or
+            any(cmd in command for cmd in SpotifyCommandHandler.SPOTIFY_COMMANDS)):
+        if "play " in command:
+            return "spotify:play"
+        if "playlist " in command:
+            return "spotify:playlist"
+        if "artist " in command:
+            return "spotify:artist"
+        for cmd in SpotifyCommandHandler.SPOTIFY_COMMANDS:
+            if cmd in command:
+                return f"spotify:{cmd}"
+        return "spotify"
+    for cmd in CommandProcessor.SYSTEM_COMMANDS:
+        if cmd in command:
+            return cmd
+    if "what is" in command or "tell me about" in command:
+        return "llm"
+    return "unrecognized"
+
+
+def compiled_route(command):
+    """Route with the compiled router, in the same intent:keyword form as the baseline."""
+    match = CommandProcessor.ROUTER.match(command)
+    if match.intent == "spotify" and match.keyword in SpotifyCommandHandler.SPOTIFY_COMMANDS:
+        return f"spotify:{match.keyword}"
+    return match.intent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark the command router")
+    parser.add_argument("--repeat", type=int, default=10000, help="Passes over the command list")
+    args = parser.parse_args()
+
+    print(f"{'command':<34} {'substring':<20} {'compiled':<20}")
+    for command in COMMANDS:
+        print(f"{command:<34} {substring_route(command):<20} {compiled_route(command):<20}")
+
+    print()
+    print(f"substring scans: {benchmark(substring_route, COMMANDS, args.repeat):.2f} us/command")
+    print(f"compiled router: {benchmark(CommandProcessor.ROUTER.match, COMMANDS, args.repeat):.2f} us/command")
+
+
+if __name__ == "__main__":
+    main()
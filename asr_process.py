@@ -0,0 +1,86 @@
+# asr_process.py
+"""
+Entry points of the ASR worker processes (see asr_worker.ASRWorker).
+
+Spawned processes import their main module before running, so this module only
+imports the audio path (ring buffer, VAD, speech backends) and has no setup of its
+own. ASRWorker starts the processes with this module standing in for __main__, so the
+assistant's main.py (Spotify, TTS and LLM clients) is never re-run in them.
+"""
+import time
+from multiprocessing import shared_memory
+from logger import logger
+from ring_buffer import AudioRingBuffer
+from speech_backends import create_backend
+from voice_activity import VoiceActivityDetector
+
+DECODE_FRAME = 1600  # samples per decoder read
+READ_TIMEOUT = 0.1  # seconds; lets the decoder notice shutdown while idle
+STATS_INTERVAL = 1.0  # seconds between stats reports from the decoder
+
+
+def attach_ring(shm_name, capacity):
+    """Open the shared ring created by the parent process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    return shm, AudioRingBuffer(capacity, buffer=shm.buf)
+
+
+def close_shared_memory(shm):
+    """Close a shared memory mapping once the caller has dropped its ring views."""
+    try:
+        shm.close()
+    except BufferError:
+        pass  # a view is still alive; the OS frees the mapping at process exit
+
+
+def capture_main(shm_name, capacity, stop_event, sample_rate, block_size):
+    """Capture process: convert microphone audio to mono at sample_rate straight into the shared ring."""
+    from capture_frontend import CaptureFrontend
+
+    shm, ring = attach_ring(shm_name, capacity)
+    frontend = None
+    try:
+        frontend = CaptureFrontend(ring, target_rate=sample_rate, block_ms=block_size * 1000 / sample_rate)
+        with frontend:
+            stop_event.wait()
+    except Exception as e:
+        logger.error(f"Error in ASR capture process: {e}")
+    finally:
+        ring = frontend = None
+        close_shared_memory(shm)
+
+
+def decoder_main(shm_name, capacity, stop_event, conn, backend_name, backend_kwargs, sample_rate):
+    """Decoder process: read the shared ring, gate with VAD, decode and send transcripts back."""
+    shm, ring = attach_ring(shm_name, capacity)
+    frame = None
+    try:
+        backend = create_backend(backend_name, **backend_kwargs)
+        vad = VoiceActivityDetector(sample_rate=sample_rate)
+        last_stats = time.monotonic()
+
+        while not stop_event.is_set():
+            frame = ring.read(DECODE_FRAME, timeout=READ_TIMEOUT)
+            if frame is not None:
+                speech = vad.process(frame)
+                finished = bool(speech) and backend.accept_frame(speech)
+                if finished or vad.segment_ended:
+                    text = backend.final_text()
+                    if text:
+                        # How far behind live audio the decoder was when it finished
+                        lag = ring.available() / sample_rate
+                        conn.send(("transcript", text, lag))
+
+            now = time.monotonic()
+            if now - last_stats >= STATS_INTERVAL:
+                last_stats = now
+                conn.send(("stats", {
+                    "decode_lag_seconds": ring.available() / sample_rate,
+                    "vad": vad.stats(),
+                }, None))
+    except Exception as e:
+        logger.error(f"Error in ASR decoder process: {e}")
+        conn.send(("error", str(e), None))
+    finally:
+        frame = ring = None
+        close_shared_memory(shm)
@@ -0,0 +1,158 @@
+# asr_worker.py
+import multiprocessing as mp
+import sys
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from logger import logger
+from ring_buffer import AudioRingBuffer
+from speech_backends import SAMPLE_RATE
+import asr_process
+from asr_process import capture_main, decoder_main, close_shared_memory
+
+RING_SECONDS = 10  # audio the shared ring can hold while the decoder catches up
+CAPTURE_BLOCK = 1600  # samples per capture callback (100 ms)
+
+
+@contextmanager
+def _process_main():
+    """
+    Make asr_process the main module while worker processes are started.
+
+    Spawned children import the parent's __main__ before unpickling their target; with
+    asr_process standing in, they load only the audio path instead of re-running main.py.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = asr_process
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class ASRWorker:
+    """
+    Runs audio capture and speech decoding in dedicated processes.
+
+    Capture writes into an AudioRingBuffer placed in multiprocessing shared memory; the
+    decoder process reads it, runs the VAD and speech backend, and sends transcripts
+    back over a Pipe. Command execution, LLM calls and TTS in the main process can then
+    no longer hold the GIL or block the audio path.
+    """
+
+    def __init__(self, backend_name="vosk", backend_kwargs=None, sample_rate=SAMPLE_RATE,
+                 ring_seconds=RING_SECONDS, capture=True):
+        """
+        Args:
+            backend_name (str): Speech backend to run in the decoder process
+            backend_kwargs (dict, optional): Picklable constructor arguments for the backend
+            sample_rate (int): Capture and decode sample rate
+            ring_seconds (float): Capacity of the shared ring in seconds of audio
+            capture (bool): Start the microphone capture process; when False, audio is
+                supplied with write() instead (e.g. for replaying recordings)
+        """
+        self.backend_name = backend_name
+        self.backend_kwargs = backend_kwargs or {}
+        self.sample_rate = sample_rate
+        self.capacity = int(sample_rate * ring_seconds)
+        self.capture = capture
+
+        self._shm = None
+        self._ring = None
+        self._processes = []
+        self._stop_event = None
+        self._conn = None
+
+        # Latest figures reported by the decoder
+        self.decode_lag = 0.0
+        self.decoder_stats = {}
+        self.transcripts = 0
+
+    def start(self):
+        """Create the shared ring and start the worker processes."""
+        self._shm = shared_memory.SharedMemory(create=True, size=AudioRingBuffer.required_bytes(self.capacity))
+        self._ring = AudioRingBuffer(self.capacity, buffer=self._shm.buf)
+        self._ring.clear()  # shared memory is not guaranteed to start zeroed
+
+        self._stop_event = mp.Event()
+        self._conn, child_conn = mp.Pipe(duplex=False)
+
+        decoder = mp.Process(target=decoder_main, name="asr-decoder", daemon=True,
+                             args=(self._shm.name, self.capacity, self._stop_event, child_conn,
+                                   self.backend_name, self.backend_kwargs, self.sample_rate))
+        self._processes.append(decoder)
+        if self.capture:
+            capture = mp.Process(target=capture_main, name="asr-capture", daemon=True,
+                                 args=(self._shm.name, self.capacity, self._stop_event,
+                                       self.sample_rate, CAPTURE_BLOCK))
+            self._processes.append(capture)
+
+        with _process_main():
+            for process in self._processes:
+                process.start()
+        logger.info(f"ASR worker started ({self.backend_name}, {len(self._processes)} processes)")
+
+    def write(self, block):
+        """Feed audio to the decoder when capture=False. Returns samples accepted."""
+        return self._ring.write(block)
+
+    def get_transcript(self, timeout=None):
+        """
+        Wait for the next transcript from the decoder.
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            str | None: Transcript, or None if none arrived within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self._conn.poll(remaining):
+                return None
+
+            kind, payload, lag = self._conn.recv()
+            if kind == "transcript":
+                self.transcripts += 1
+                self.decode_lag = lag
+                return payload
+            if kind == "stats":
+                self.decode_lag = payload["decode_lag_seconds"]
+                self.decoder_stats = payload
+            elif kind == "error":
+                raise RuntimeError(f"ASR decoder failed: {payload}")
+
+    def stats(self):
+        """
+        Get worker health figures.
+
+        Returns:
+            dict: Ring queue depth, overflow, decode lag and transcript count
+        """
+        ring = self._ring.stats() if self._ring is not None else {}
+        return {
+            "queue_depth_samples": ring.get("queued", 0),
+            "queue_depth_seconds": ring.get("queued", 0) / self.sample_rate,
+            "overflow_samples": ring.get("overflow_samples", 0),
+            "decode_lag_seconds": self.decode_lag,
+            "transcripts": self.transcripts,
+            "alive": all(process.is_alive() for process in self._processes),
+        }
+
+    def stop(self, timeout=2.0):
+        """Stop the worker processes and free the shared memory."""
+        if self._stop_event is None:
+            return
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+        self._ring = None
+        close_shared_memory(self._shm)
+        self._shm.unlink()
+        self._shm = None
+        self._stop_event = None
@@ -0,0 +1,273 @@
+# async_runtime.py
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+from command_scheduler import CommandScheduler, NORMAL
+from command_executor import DOMAIN_WORKERS, WAIT_HISTORY
+from cancellation import active_requests
+
+LAG_HISTORY = 500  # event-loop lag samples kept for stats
+LAG_PROBE_INTERVAL = None  # seconds between idle lag probes; None keeps the loop fully asleep when idle
+
+
+class EventBus:
+    """
+    In-loop publish/subscribe between runtime components.
+
+    Handlers may be plain functions or coroutine functions; coroutines are scheduled as
+    tasks so a slow subscriber never blocks the publisher. publish_threadsafe() lets
+    listener and worker threads post events onto the loop.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._handlers = defaultdict(list)
+        self._tasks = set()
+        self.lag_ms = deque(maxlen=LAG_HISTORY)  # thread -> loop handoff delay
+        self.published = 0
+
+    def subscribe(self, topic, handler):
+        """Register handler(payload) for a topic."""
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic, payload=None):
+        """Deliver an event to every subscriber (must be called on the loop thread)."""
+        self.published += 1
+        for handler in self._handlers[topic]:
+            try:
+                result = handler(payload)
+                if asyncio.iscoroutine(result):
+                    task = self._loop.create_task(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except Exception as e:
+                logger.error(f"Error in '{topic}' event handler: {e}")
+
+    def publish_threadsafe(self, topic, payload=None):
+        """Post an event from another thread; the handoff delay is recorded as loop lag."""
+        posted = time.monotonic()
+
+        def deliver():
+            self.lag_ms.append((time.monotonic() - posted) * 1000)
+            self.publish(topic, payload)
+
+        self._loop.call_soon_threadsafe(deliver)
+
+
+class AsyncDomainExecutor:
+    """
+    Per-domain command runner for the asyncio runtime.
+
+    Each domain has a priority CommandScheduler, a task that awaits new work (no polling)
+    and a bounded thread pool where the blocking handlers (spotipy, ollama, pyautogui)
+    run. With one worker per domain, commands keep their order within the domain.
+    Offers the same submit()/stats() interface as command_executor.CommandExecutor.
+    """
+
+    def __init__(self, loop, bus=None, domain_workers=DOMAIN_WORKERS):
+        self._loop = loop
+        self._bus = bus
+        self._queues = {name: CommandScheduler() for name in domain_workers}
+        self._ready = {name: asyncio.Event() for name in domain_workers}
+        self._pools = {name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-executor")
+                       for name, workers in domain_workers.items()}
+        self._slots = {name: asyncio.Semaphore(workers) for name, workers in domain_workers.items()}
+        self._tasks = []
+        self._running = set()
+
+        self.wait_ms = {name: deque(maxlen=WAIT_HISTORY) for name in domain_workers}
+        self.run_ms = {name: deque(maxlen=WAIT_HISTORY) for name in domain_workers}
+        self.completed = defaultdict(int)
+        self.failed = defaultdict(int)
+
+    def start(self):
+        self._tasks = [self._loop.create_task(self._drain(name), name=f"{name}-domain")
+                       for name in self._queues]
+
+    def submit(self, domain, action, label="", priority=NORMAL, key=None):
+        """Queue a command on its domain (safe to call from any thread)."""
+        self._queues[domain].put((action, label, time.monotonic()), priority, key)
+        self._loop.call_soon_threadsafe(self._ready[domain].set)
+
+    async def _drain(self, domain):
+        queue, ready, slots = self._queues[domain], self._ready[domain], self._slots[domain]
+        while True:
+            await ready.wait()
+            ready.clear()
+            while not queue.empty():
+                await slots.acquire()
+                action, label, queued_at = queue.get(block=False)
+                task = self._loop.create_task(self._run(domain, action, label, queued_at))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self, domain, action, label, queued_at):
+        started = time.monotonic()
+        self.wait_ms[domain].append((started - queued_at) * 1000)
+        try:
+            await self._loop.run_in_executor(self._pools[domain], action)
+            self.completed[domain] += 1
+        except Exception as e:
+            self.failed[domain] += 1
+            logger.error(f"Error executing {domain} command '{label}': {e}")
+            print(f"Error processing command: {str(e)}")
+        finally:
+            self._slots[domain].release()
+            self.run_ms[domain].append((time.monotonic() - started) * 1000)
+            if self._bus is not None:
+                self._bus.publish("command.done", {"domain": domain, "label": label})
+
+    async def shutdown(self):
+        """Stop taking work, let running commands finish and close the thread pools."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        """Domain -> queue depth, completed/failed counts and wait/run times (ms)."""
+        stats = {}
+        for name, queue in self._queues.items():
+            waits = sorted(self.wait_ms[name])
+            runs = list(self.run_ms[name])
+            scheduler = queue.stats()
+            stats[name] = {
+                "preemptions": scheduler["preemptions"],
+                "superseded": scheduler["superseded"],
+                "queued": queue.qsize(),
+                "completed": self.completed[name],
+                "failed": self.failed[name],
+                "wait_ms_p50": waits[len(waits) // 2] if waits else 0.0,
+                "wait_ms_max": waits[-1] if waits else 0.0,
+                "run_ms_mean": sum(runs) / len(runs) if runs else 0.0,
+            }
+        return stats
+
+
+class AssistantRuntime:
+    """
+    asyncio core: commands arrive on the scheduler, get routed on the loop and run on
+    per-domain executors, with components connected through an EventBus.
+
+    Blocking audio capture stays on its listener thread and hands commands over through
+    the CommandScheduler, which wakes the router via call_soon_threadsafe. Nothing wakes
+    up while the assistant is idle. stop() shuts everything down in a fixed order.
+    """
+
+    def __init__(self, command_queue, process_command, listener=None, on_start=None):
+        """
+        Args:
+            command_queue (CommandScheduler): Queue the listener thread puts commands on
+            process_command (callable): process_command(command, executor) -> True to exit
+            listener (callable, optional): Blocking listener loop, run on its own thread
+            on_start (callable, optional): on_start(runtime) runs on the loop before listening
+        """
+        self.command_queue = command_queue
+        self.process_command = process_command
+        self.listener = listener
+        self.on_start = on_start
+        self.loop = None
+        self.bus = None
+        self.executor = None
+        self._commands_ready = None
+        self._stopped = None
+        self._listener_thread = None
+        self._probe_lag_ms = deque(maxlen=LAG_HISTORY)
+
+    def _wake_router(self):
+        # Runs on the thread that queued the command
+        self.bus.publish_threadsafe("command.queued")
+
+    async def _route_commands(self):
+        while True:
+            await self._commands_ready.wait()
+            self._commands_ready.clear()
+            while not self.command_queue.empty():
+                command = self.command_queue.get(block=False)
+                self.bus.publish("command.received", command)
+                if self.process_command(command, self.executor):
+                    print("Exiting from command processor...")
+                    self.stop()
+                    return
+
+    async def _probe_lag(self, interval):
+        while True:
+            started = self.loop.time()
+            await asyncio.sleep(interval)
+            self._probe_lag_ms.append((self.loop.time() - started - interval) * 1000)
+
+    def stop(self):
+        """Request shutdown (safe to call from any thread)."""
+        if self.loop is not None and self._stopped is not None:
+            self.loop.call_soon_threadsafe(self._stopped.set)
+
+    async def run(self, stop_listener=None):
+        """
+        Run until stop() is called.
+
+        Args:
+            stop_listener (threading.Event, optional): Set during shutdown so the
+                listener thread leaves its loop
+        """
+        self.loop = asyncio.get_running_loop()
+        self.bus = EventBus(self.loop)
+        self.executor = AsyncDomainExecutor(self.loop, self.bus)
+        self._commands_ready = asyncio.Event()
+        self._stopped = asyncio.Event()
+
+        self.executor.start()
+        self.bus.subscribe("command.queued", lambda _: self._commands_ready.set())
+        self.command_queue.subscribe(self._wake_router)
+        tasks = [self.loop.create_task(self._route_commands(), name="router")]
+        if LAG_PROBE_INTERVAL:
+            tasks.append(self.loop.create_task(self._probe_lag(LAG_PROBE_INTERVAL), name="lag-probe"))
+        if self.on_start is not None:
+            self.on_start(self)
+
+        if self.listener is not None:
+            self._listener_thread = threading.Thread(target=self.listener, name="listener", daemon=True)
+            self._listener_thread.start()
+        if not self.command_queue.empty():
+            self._commands_ready.set()
+
+        try:
+            await self._stopped.wait()
+        finally:
+            # Shutdown order: stop input, stop routing, cancel in-flight requests,
+            # let running commands return, close pools
+            if stop_listener is not None:
+                stop_listener.set()
+            self.command_queue.unsubscribe(self._wake_router)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            active_requests.cancel_all("shutdown")
+            await self.executor.shutdown()
+            if self._listener_thread is not None:
+                # Audio reads block; the daemon listener exits at its next frame
+                await self.loop.run_in_executor(None, self._listener_thread.join, 1.0)
+            logger.info(f"Runtime stopped: {self.stats()}")
+
+    def stats(self):
+        """
+        Get runtime metrics.
+
+        Returns:
+            dict: Event-loop lag (thread handoff and optional idle probe, ms), events
+                published and per-domain executor stats
+        """
+        handoff = sorted(self.bus.lag_ms) if self.bus else []
+        probe = sorted(self._probe_lag_ms)
+        return {
+            "events": self.bus.published if self.bus else 0,
+            "loop_lag_ms_p50": handoff[len(handoff) // 2] if handoff else 0.0,
+            "loop_lag_ms_max": max(handoff[-1:] + probe[-1:], default=0.0),
+            "probe_lag_ms_p50": probe[len(probe) // 2] if probe else 0.0,
+            "executor": self.executor.stats() if self.executor else {},
+        }
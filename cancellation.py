@@ -0,0 +1,143 @@
+# cancellation.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logger import logger
+
+CANCEL_POLL_INTERVAL = 0.05  # seconds between cancellation checks in blocking stages
+LATENCY_HISTORY = 200  # cancel-to-stopped samples kept for stats
+
+
+class Cancelled(Exception):
+    """Raised by CancellationToken.raise_if_cancelled inside a cancelled stage."""
+
+
+class CancellationToken:
+    """
+    Cancellation signal attached to one in-flight request.
+
+    Long stages (LLM generation, TTS synthesis and playback, busy-wait audio) poll
+    `cancelled` or wait on the token, and may register callbacks that run the moment
+    the token is cancelled (e.g. terminating a player process).
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.reason = None
+        self.cancelled_at = None
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """Cancel the request and run registered callbacks (only the first call counts)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in cancellation callback for '{self.label}': {e}")
+
+    def on_cancel(self, callback):
+        """Run callback() when the token is cancelled (immediately if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def wait(self, timeout=None):
+        """Sleep until cancelled or until timeout; returns True if cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+    def since_cancel_ms(self):
+        """Milliseconds since cancel() was called (0 if it was not)."""
+        return (time.monotonic() - self.cancelled_at) * 1000 if self.cancelled_at else 0.0
+
+
+class RequestRegistry:
+    """
+    Tracks the cancellation tokens of in-flight requests so "stop" can cancel them all.
+    """
+
+    def __init__(self):
+        self._tokens = set()
+        self._lock = threading.Lock()
+        self.cancel_latency_ms = deque(maxlen=LATENCY_HISTORY)
+
+        # Counters
+        self.started = 0
+        self.cancelled = 0
+
+    @contextmanager
+    def track(self, label=""):
+        """
+        Register a new token for the duration of a request.
+
+        Yields:
+            CancellationToken: The request's token
+        """
+        token = CancellationToken(label)
+        with self._lock:
+            self._tokens.add(token)
+            self.started += 1
+        try:
+            yield token
+        finally:
+            with self._lock:
+                self._tokens.discard(token)
+            if token.cancelled:
+                self.cancel_latency_ms.append(token.since_cancel_ms())
+                logger.info(f"Request '{label}' stopped {token.since_cancel_ms():.0f} ms after cancel")
+
+    def cancel_all(self, reason="stop"):
+        """
+        Cancel every in-flight request.
+
+        Returns:
+            int: Number of requests cancelled
+        """
+        with self._lock:
+            tokens = list(self._tokens)
+        for token in tokens:
+            token.cancel(reason)
+        self.cancelled += len(tokens)
+        if tokens:
+            logger.info(f"Cancelled {len(tokens)} in-flight request(s): {reason}")
+        return len(tokens)
+
+    def stats(self):
+        """
+        Get request counters.
+
+        Returns:
+            dict: In-flight, started and cancelled counts and cancel-to-stopped latency (ms)
+        """
+        latencies = list(self.cancel_latency_ms)
+        return {
+            "in_flight": len(self._tokens),
+            "started": self.started,
+            "cancelled": self.cancelled,
+            "cancel_latency_ms_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "cancel_latency_ms_max": max(latencies) if latencies else 0.0,
+        }
+
+
+# Shared registry for the whole assistant
+active_requests = RequestRegistry()
@@ -0,0 +1,215 @@
+# capture_frontend.py
+import time
+import numpy as np
+from logger import logger
+
+TARGET_RATE = 16000
+CAPTURE_BLOCK_MS = 100
+FILTER_TAPS = 63  # anti-aliasing low-pass length used when downsampling
+CUTOFF_FRACTION = 0.9  # low-pass cutoff as a fraction of the target Nyquist frequency
+
+
+def _lowpass_taps(native_rate, target_rate, taps=FILTER_TAPS):
+    """Design a Hamming-windowed sinc low-pass for downsampling native_rate -> target_rate."""
+    cutoff = CUTOFF_FRACTION * (target_rate / 2) / native_rate  # cycles per input sample
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+class Resampler:
+    """
+    Streaming downmix + resample of int16 audio to 16 kHz mono.
+
+    Channels are averaged, an anti-aliasing FIR is applied when downsampling, and output
+    samples are taken by linear interpolation with the fractional phase carried across
+    blocks, so integer ratios (48 kHz -> 16 kHz) reduce to exact decimation. Work
+    buffers are preallocated for the expected block size.
+    """
+
+    def __init__(self, native_rate, channels, target_rate=TARGET_RATE, block_frames=None):
+        """
+        Args:
+            native_rate (int): Sample rate of the input
+            channels (int): Number of interleaved input channels
+            target_rate (int): Output sample rate
+            block_frames (int, optional): Expected frames per block, used to size buffers
+        """
+        self.native_rate = native_rate
+        self.channels = channels
+        self.target_rate = target_rate
+        self.step = native_rate / target_rate  # input samples per output sample
+        self.passthrough = native_rate == target_rate
+
+        self._taps = _lowpass_taps(native_rate, target_rate) if native_rate > target_rate else None
+        history = 0 if self._taps is None else self._taps.size - 1
+        block_frames = block_frames or int(native_rate * CAPTURE_BLOCK_MS / 1000)
+
+        self._history = np.zeros(history, dtype=np.float32)  # filter state from the last block
+        self._work = np.empty(history + block_frames, dtype=np.float32)
+        self._out = np.empty(int(block_frames / self.step) + 2, dtype=np.int16)
+        self._position = 0.0  # where the next output sample falls, relative to this block
+        self._previous = 0.0  # last filtered sample of the previous block
+
+    def _ensure_capacity(self, frames):
+        """Grow the work buffers if a block is larger than expected."""
+        needed = self._history.size + frames
+        if self._work.size < needed:
+            self._work = np.empty(needed, dtype=np.float32)
+            self._out = np.empty(int(frames / self.step) + 2, dtype=np.int16)
+
+    def process(self, block):
+        """
+        Convert one block of captured audio.
+
+        Args:
+            block (np.ndarray | buffer): int16 samples, shape (frames, channels) or interleaved
+
+        Returns:
+            np.ndarray: int16 mono samples at the target rate (a view into an internal
+                buffer, valid until the next call)
+        """
+        samples = block if isinstance(block, np.ndarray) else np.frombuffer(block, dtype=np.int16)
+        samples = samples.reshape(-1, self.channels)
+        frames = samples.shape[0]
+
+        if self.passthrough and self.channels == 1:
+            return samples[:, 0]
+
+        self._ensure_capacity(frames)
+        history = self._history.size
+        work = self._work[:history + frames]
+        work[:history] = self._history
+
+        # Downmix straight into the work buffer
+        if self.channels == 1:
+            work[history:] = samples[:, 0]
+        else:
+            np.mean(samples, axis=1, dtype=np.float32, out=work[history:])
+
+        if self.passthrough:
+            mono = work[history:]
+        else:
+            if self._taps is not None:
+                mono = np.convolve(work, self._taps, mode="valid")
+                self._history[:] = work[frames:]
+            else:
+                mono = work[history:]
+            mono = self._resample(mono)
+
+        count = mono.size
+        out = self._out[:count]
+        np.clip(mono, -32768, 32767, out=mono)
+        out[:] = mono
+        return out
+
+    def _resample(self, mono):
+        """Linearly interpolate output samples, carrying the fractional phase over."""
+        length = mono.size
+        if self._position > length - 1:
+            self._position -= length
+            self._previous = float(mono[-1])
+            return mono[:0]
+
+        count = int((length - 1 - self._position) // self.step) + 1
+        positions = self._position + self.step * np.arange(count, dtype=np.float64)
+
+        # Index -1 refers to the last sample of the previous block
+        left = np.floor(positions).astype(np.int64)
+        fraction = (positions - left).astype(np.float32)
+        right = np.minimum(left + 1, length - 1)
+        left_values = np.where(left >= 0, mono[np.maximum(left, 0)], self._previous)
+        resampled = left_values + (mono[right] - left_values) * fraction
+
+        self._position = positions[-1] + self.step - length
+        self._previous = float(mono[-1])
+        return resampled.astype(np.float32)
+
+
+class CaptureFrontend:
+    """
+    Opens an input device at its native rate and channel count and feeds 16 kHz mono
+    audio into an AudioRingBuffer.
+
+    Many USB microphones and headsets reject a 16 kHz mono stream or make the OS
+    resample it; converting in the callback avoids both.
+    """
+
+    def __init__(self, ring, device=None, target_rate=TARGET_RATE, block_ms=CAPTURE_BLOCK_MS):
+        """
+        Args:
+            ring (AudioRingBuffer): Destination for converted samples
+            device (int | str, optional): sounddevice input device (default device if None)
+            target_rate (int): Output sample rate
+            block_ms (int): Capture block length in milliseconds
+        """
+        import sounddevice as sd
+
+        self._sd = sd
+        self.ring = ring
+        self.device = device
+
+        info = sd.query_devices(device, "input")
+        self.native_rate = int(info["default_samplerate"])
+        self.channels = max(1, min(int(info["max_input_channels"]), 2))
+        self.block_frames = int(self.native_rate * block_ms / 1000)
+        self.resampler = Resampler(self.native_rate, self.channels, target_rate, self.block_frames)
+        self._stream = None
+
+        logger.info(f"Capture device '{info['name']}': {self.native_rate} Hz, {self.channels} channel(s) "
+                    f"-> {target_rate} Hz mono")
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            logger.warning(f"Audio capture status: {status}")
+        self.ring.write(self.resampler.process(indata))
+
+    def start(self):
+        """Open and start the input stream."""
+        self._stream = self._sd.InputStream(samplerate=self.native_rate, channels=self.channels,
+                                            dtype="int16", blocksize=self.block_frames,
+                                            device=self.device, callback=self._callback)
+        self._stream.start()
+
+    def stop(self):
+        """Stop and close the input stream."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def benchmark(native_rate, channels, seconds=10.0, block_ms=CAPTURE_BLOCK_MS):
+    """
+    Measure the CPU cost of converting audio to 16 kHz mono.
+
+    Args:
+        native_rate (int): Input sample rate
+        channels (int): Input channel count
+        seconds (float): Amount of audio to convert
+
+    Returns:
+        float: CPU milliseconds spent per second of audio
+    """
+    block_frames = int(native_rate * block_ms / 1000)
+    resampler = Resampler(native_rate, channels, block_frames=block_frames)
+    rng = np.random.default_rng(0)
+    block = rng.integers(-3000, 3000, size=(block_frames, channels), dtype=np.int16)
+
+    blocks = int(seconds * 1000 / block_ms)
+    started = time.process_time()
+    for _ in range(blocks):
+        resampler.process(block)
+    return (time.process_time() - started) * 1000 / seconds
+
+
+if __name__ == "__main__":
+    for rate, channels in ((16000, 1), (32000, 1), (44100, 2), (48000, 1), (48000, 2)):
+        print(f"{rate} Hz x{channels}: {benchmark(rate, channels):.2f} ms CPU per second of audio")
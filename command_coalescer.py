@@ -0,0 +1,121 @@
+# command_coalescer.py
+import re
+import threading
+from logger import logger
+from tracing import tracer
+
+COALESCE_WINDOW = 0.35  # seconds after a command during which repeats are merged
+
+# Relative Spotify commands -> (operation group, step)
+COALESCE_GROUPS = {
+    "volume up": ("volume", 10),
+    "volume down": ("volume", -10),
+    "skip": ("seek", 5000),
+    "rewind": ("seek", -5000),
+    "next": ("track", 1),
+    "previous": ("track", -1),
+    "back": ("track", -1),
+}
+
+API_CALLS_PER_COMMAND = 2  # playback GET plus the PUT/POST each relative command costs
+
+
+def repetitions(text, keyword):
+    """Count how often a keyword is repeated in one utterance ("next next next" -> 3)."""
+    return max(1, len(re.findall(rf"\b{re.escape(keyword)}\b", text.lower())))
+
+
+class CommandCoalescer:
+    """
+    Merges bursts of relative Spotify commands into one absolute operation.
+
+    Each relative command (volume up, skip, next, ...) otherwise costs a playback read,
+    a write and a sleep. The first command of a group runs at once, so a lone command
+    is never delayed. Commands in the same group that follow within the window are
+    summed and applied together when it closes, so "volume up" four times becomes +10
+    followed by a single +30.
+    """
+
+    def __init__(self, operations, window=COALESCE_WINDOW, dispatch=None):
+        """
+        Args:
+            operations (dict): Operation group -> function taking the summed step
+                (e.g. spotify_command_handler.COALESCED_OPERATIONS)
+            window (float): Seconds after a command during which repeats are merged
+            dispatch (callable, optional): dispatch(label, operation) runs a merged
+                operation (e.g. on the Spotify executor); called on the timer thread
+                when omitted
+        """
+        self.window = window
+        self.operations = operations
+        self.dispatch = dispatch
+        self._pending = {}  # group -> [total step, command count, trace of the first merged command]
+        self._lock = threading.Lock()
+
+        # Counters
+        self.commands = 0
+        self.operations_applied = 0
+
+    def add(self, keyword, count=1):
+        """
+        Add a relative command, running it now unless a burst of its group is open.
+
+        Args:
+            keyword (str): A key of COALESCE_GROUPS
+            count (int): Number of times the command was said
+        """
+        group, step = COALESCE_GROUPS[keyword]
+        with self._lock:
+            self.commands += count
+            pending = self._pending.get(group)
+            if pending is not None:
+                if pending[1] == 0:
+                    pending[2] = tracer.current()
+                pending[0] += step * count
+                pending[1] += count
+                return
+            self._pending[group] = [0, 0, None]
+            self.operations_applied += 1
+
+        timer = threading.Timer(self.window, self._flush, args=(group,))
+        timer.daemon = True
+        timer.start()
+        # Runs on the caller's thread (already the Spotify worker when executed from a plan)
+        self.operations[group](step * count)
+
+    def _flush(self, group):
+        with self._lock:
+            total, count, trace = self._pending.pop(group)
+            if total:
+                self.operations_applied += 1
+        if count == 0:
+            return
+        if total == 0:
+            logger.info(f"Coalesced {count} {group} command(s) cancel out")
+            return
+
+        logger.info(f"Coalesced {count} {group} command(s) into one {group} change of {total:+d}")
+        operation = self.operations[group]
+        label = f"{group} {total:+d}"
+        # The merged operation belongs to the utterance that first joined the burst
+        apply = tracer.bind(lambda: operation(total), f"coalesced.{group}", trace)
+        try:
+            if self.dispatch is not None:
+                self.dispatch(label, apply)
+            else:
+                apply()
+        except Exception as e:
+            logger.error(f"Error applying coalesced {label}: {e}")
+
+    def stats(self):
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: Commands received, operations applied and estimated API calls saved
+        """
+        return {
+            "commands": self.commands,
+            "operations": self.operations_applied,
+            "api_calls_saved": (self.commands - self.operations_applied) * API_CALLS_PER_COMMAND,
+        }
@@ -0,0 +1,128 @@
+# command_executor.py
+import threading
+import time
+from collections import deque
+from logger import logger
+from command_scheduler import CommandScheduler, NORMAL, BACKGROUND
+
+# Worker threads per domain. One worker keeps a domain's commands in order.
+DOMAIN_WORKERS = {
+    "spotify": 1,
+    "llm": 1,
+    "system": 1,
+    "tts": 1,  # playback of spoken answers (CommandProcessor.speech_dispatch), one at a time
+}
+WAIT_HISTORY = 200  # per-domain queue wait samples kept for stats
+
+
+class DomainQueue:
+    """Queue and worker threads for one command domain, with wait-time bookkeeping."""
+
+    def __init__(self, name, workers=1):
+        self.name = name
+        self.queue = CommandScheduler()
+        self.wait_ms = deque(maxlen=WAIT_HISTORY)
+        self.run_ms = deque(maxlen=WAIT_HISTORY)
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self._threads = [threading.Thread(target=self._worker, name=f"{name}-executor-{index}", daemon=True)
+                         for index in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+
+            action, label, queued_at = item
+            started = time.monotonic()
+            self.wait_ms.append((started - queued_at) * 1000)
+            self.running += 1
+            try:
+                action()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error executing {self.name} command '{label}': {e}")
+                print(f"Error processing command: {str(e)}")
+            finally:
+                self.running -= 1
+                self.run_ms.append((time.monotonic() - started) * 1000)
+                self.queue.task_done()
+
+    def stop(self, wait=True):
+        # Sentinels sort after every queued command, so those still run first
+        for _ in self._threads:
+            self.queue.put(None, BACKGROUND + 1)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self):
+        waits = sorted(self.wait_ms)
+        runs = list(self.run_ms)
+        scheduler = self.queue.stats()
+        return {
+            "preemptions": scheduler["preemptions"],
+            "superseded": scheduler["superseded"],
+            "queued": self.queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_ms_p50": waits[len(waits) // 2] if waits else 0.0,
+            "wait_ms_max": waits[-1] if waits else 0.0,
+            "run_ms_mean": sum(runs) / len(runs) if runs else 0.0,
+        }
+
+
+class CommandExecutor:
+    """
+    Runs commands on separate worker pools per domain (Spotify, LLM, system, TTS).
+
+    A slow LLM answer or a Spotify search no longer blocks commands for other domains:
+    "pause" goes straight to the Spotify worker while a question is being answered.
+    Within a domain, commands run by priority and then in the order they were submitted.
+    """
+
+    def __init__(self, domain_workers=DOMAIN_WORKERS):
+        """
+        Args:
+            domain_workers (dict): Domain name -> number of worker threads
+        """
+        self.domains = {name: DomainQueue(name, workers) for name, workers in domain_workers.items()}
+
+    def submit(self, domain, action, label="", priority=NORMAL, key=None):
+        """
+        Queue a command on its domain's workers.
+
+        Args:
+            domain (str): One of the configured domains
+            action (callable): No-argument function that executes the command
+            label (str): Command text, for logs
+            priority (int): Scheduling class (see command_scheduler)
+            key (hashable, optional): Supersede key for stale commands still queued
+        """
+        self.domains[domain].queue.put((action, label, time.monotonic()), priority, key)
+        logger.debug(f"Queued {domain} command '{label}' ({self.domains[domain].queue.qsize()} waiting)")
+
+    def queue_depth(self, domain):
+        """Return the number of commands waiting in a domain (not counting the running one)."""
+        return self.domains[domain].queue.qsize()
+
+    def shutdown(self, wait=True):
+        """Stop all workers after the commands already queued have run."""
+        for domain in self.domains.values():
+            domain.stop(wait)
+
+    def stats(self):
+        """
+        Get per-domain executor metrics.
+
+        Returns:
+            dict: Domain -> queue depth, running/completed/failed counts and wait/run times (ms)
+        """
+        return {name: domain.stats() for name, domain in self.domains.items()}
@@ -0,0 +1,66 @@
+# command_grammar.py
+import json
+
+UNKNOWN_TOKEN = "[unk]"
+
+# Commands handled outside the command tables
+EXTRA_COMMAND_PHRASES = ("stop", "exit", "quit")
+
+# Keywords followed by a free-form argument (song, playlist or artist name)
+ARGUMENT_KEYWORDS = ("play", "playlist", "artist")
+
+
+def build_command_grammar(*command_tables, extra_phrases=EXTRA_COMMAND_PHRASES, library_phrases=()):
+    """
+    Generate a Vosk grammar phrase list from command keyword tables.
+
+    Every keyword becomes a phrase of its own. Keywords that take an argument also get a
+    "<keyword> [unk]" phrase so the utterance is still accepted by the grammar and can be
+    handed to the open-vocabulary recognizer for the argument.
+
+    Args:
+        *command_tables (dict): Tables mapping command keywords to handlers
+            (e.g. SpotifyCommandHandler.SPOTIFY_COMMANDS, CommandProcessor.SYSTEM_COMMANDS)
+        extra_phrases (iterable): Additional fixed phrases to accept
+        library_phrases (iterable): Complete "<keyword> <name>" phrases from the user's
+            library (see library_vocabulary.LibraryVocabulary.phrases)
+
+    Returns:
+        list: Unique phrases, ending with the [unk] catch-all
+    """
+    phrases = []
+    for table in command_tables:
+        for keyword in table:
+            phrases.append(keyword.lower())
+            if keyword in ARGUMENT_KEYWORDS:
+                phrases.append(f"{keyword} {UNKNOWN_TOKEN}")
+    phrases.extend(phrase.lower() for phrase in extra_phrases)
+    phrases.extend(library_phrases)
+    phrases.append(UNKNOWN_TOKEN)
+
+    # Keep the first occurrence of each phrase, preserving order
+    return list(dict.fromkeys(phrases))
+
+
+def grammar_json(phrases):
+    """Serialize a phrase list in the form KaldiRecognizer expects."""
+    return json.dumps(phrases)
+
+
+def needs_open_vocabulary(text, known_phrases=()):
+    """
+    Check whether a grammar-pass transcript must be re-decoded with the full model.
+
+    Args:
+        text (str): Transcript from the grammar-constrained recognizer
+        known_phrases (set): Complete phrases whose argument is already known (library names)
+
+    Returns:
+        bool: True if the grammar rejected the input or the command's argument is unknown
+    """
+    words = text.split()
+    if not words or UNKNOWN_TOKEN in words:
+        return True
+    if text in known_phrases:
+        return False
+    return words[0] in ARGUMENT_KEYWORDS
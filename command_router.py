@@ -0,0 +1,189 @@
+# command_router.py
+import re
+import time
+from collections import namedtuple
+from command_grammar import ARGUMENT_KEYWORDS
+
+# Intent priorities (higher wins when several keywords occur in one command)
+EXIT_PRIORITY = 100
+STOP_PRIORITY = 90
+SYSTEM_PRIORITY = 50
+SPOTIFY_ARGUMENT_PRIORITY = 32  # "playlist"/"artist" outrank "play" in "play the playlist x"
+SPOTIFY_PRIORITY = 30
+SPOTIFY_MARKER_PRIORITY = 15  # bare "spotify"/"music" with no known command
+LLM_PRIORITY = 10
+
+EXIT_PHRASES = ("exit", "quit")
+STOP_PHRASES = ("stop",)
+SPOTIFY_MARKERS = ("spotify", "music")
+LLM_PHRASES = ("what is", "tell me about")
+ARGUMENT_SUFFIXES = (" on spotify",)  # trailing words that are not part of the argument
+
+_WORD = re.compile(r"[\w']+")
+
+RouteMatch = namedtuple("RouteMatch", "intent keyword argument span priority")
+RouteMatch.__doc__ = """
+Result of routing one command.
+
+intent: Handler domain ("exit", "stop", "spotify", a system command, "llm" or "unrecognized")
+keyword: The matched keyword phrase (None when unrecognized)
+argument: Text after the keyword for commands that take one, else None
+span: (start, end) character offsets of the argument in the normalized command, or None
+priority: Priority of the matched keyword
+"""
+
+UNRECOGNIZED = RouteMatch("unrecognized", None, None, None, 0)
+
+
+class CommandRouter:
+    """
+    Word-level trie over every command keyword, matched in one scan of the command.
+
+    Keywords only match whole words, so "play" does not fire inside "playlist" and "stop"
+    does not fire inside "stopwatch". When several keywords occur, the highest priority
+    wins, then the longest phrase, then the earliest one.
+
+    A keyword that takes an argument claims every word after it: "play exit music" plays
+    "exit music" and "tell me about stop motion" is a question, even though "exit" and
+    "stop" outrank them. Inside an argument only a higher-priority argument keyword of the
+    same intent can take over ("play the playlist rap caviar" is a playlist request).
+    """
+
+    def __init__(self):
+        self._root = {}
+        self.max_depth = 0
+
+    def add(self, phrase, intent, priority, takes_argument=False):
+        """
+        Register a keyword phrase.
+
+        Args:
+            phrase (str): One or more words, e.g. "volume up"
+            intent (str): Intent returned when the phrase matches
+            priority (int): Higher priorities win over lower ones
+            takes_argument (bool): Whether the words after the phrase are its argument
+        """
+        words = phrase.lower().split()
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[None] = (intent, phrase.lower(), priority, takes_argument)
+        self.max_depth = max(self.max_depth, len(words))
+
+    def _longest_at(self, tokens, start):
+        """Get the best keyword starting at a token as (priority, length, entry, end index), or None."""
+        found = None
+        node = self._root
+        for index in range(start, min(start + self.max_depth, len(tokens))):
+            node = node.get(tokens[index][0])
+            if node is None:
+                break
+            entry = node.get(None)
+            if entry is not None and (found is None or (entry[2], index - start) > found[:2]):
+                found = (entry[2], index - start, entry, index)
+        return found
+
+    def match(self, command):
+        """
+        Route a command.
+
+        Args:
+            command (str): The user's voice command as text
+
+        Returns:
+            RouteMatch: The winning match, or UNRECOGNIZED
+        """
+        text = command.lower().strip()
+        tokens = [(m.group(), m.start(), m.end()) for m in _WORD.finditer(text)]
+
+        best = None  # (priority, length, -start, entry, end)
+        owner = None  # argument keyword whose argument the scan is inside
+        start = 0
+        while start < len(tokens):
+            found = self._longest_at(tokens, start)
+            if found is None:
+                start += 1
+                continue
+            priority, length, entry, last = found
+            if owner is not None:
+                # Inside an argument: only a more specific keyword of the same intent counts
+                if not (entry[3] and entry[0] == owner[0] and priority > owner[2]):
+                    start += 1
+                    continue
+            candidate = (priority, length, -start)
+            refines = owner is not None and best[3] is owner
+            if best is None or candidate > best[:3] or refines:
+                best = candidate + (entry, tokens[last][2])
+            if entry[3]:
+                owner = entry
+                start = last + 1
+            else:
+                start += 1
+
+        if best is None:
+            return UNRECOGNIZED
+
+        (intent, keyword, priority, takes_argument), end = best[3], best[4]
+        argument = span = None
+        if takes_argument:
+            arg_end = len(text)
+            for suffix in ARGUMENT_SUFFIXES:
+                if text.endswith(suffix):
+                    arg_end -= len(suffix)
+            arg_start = end
+            while arg_start < arg_end and text[arg_start].isspace():
+                arg_start += 1
+            if arg_start < arg_end:
+                argument, span = text[arg_start:arg_end].strip(), (arg_start, arg_end)
+        return RouteMatch(intent, keyword, argument, span, priority)
+
+
+def build_command_router(system_commands, spotify_commands):
+    """
+    Compile the assistant's command tables into one router.
+
+    Args:
+        system_commands (dict): CommandProcessor.SYSTEM_COMMANDS
+        spotify_commands (dict): SpotifyCommandHandler.SPOTIFY_COMMANDS
+
+    Returns:
+        CommandRouter: Router returning "exit", "stop", "spotify", a system command
+            name or "llm" as the intent
+    """
+    router = CommandRouter()
+    for phrase in EXIT_PHRASES:
+        router.add(phrase, "exit", EXIT_PRIORITY)
+    for phrase in STOP_PHRASES:
+        router.add(phrase, "stop", STOP_PRIORITY)
+    for phrase in system_commands:
+        router.add(phrase, phrase, SYSTEM_PRIORITY)
+    for phrase in spotify_commands:
+        if phrase in ARGUMENT_KEYWORDS:
+            priority = SPOTIFY_PRIORITY if phrase == "play" else SPOTIFY_ARGUMENT_PRIORITY
+            router.add(phrase, "spotify", priority, takes_argument=True)
+        else:
+            router.add(phrase, "spotify", SPOTIFY_PRIORITY)
+    for phrase in SPOTIFY_MARKERS:
+        router.add(phrase, "spotify", SPOTIFY_MARKER_PRIORITY)
+    for phrase in LLM_PHRASES:
+        router.add(phrase, "llm", LLM_PRIORITY, takes_argument=True)
+    return router
+
+
+def benchmark(route, commands, repeat=10000):
+    """
+    Measure the per-command cost of a routing function.
+
+    Args:
+        route (callable): Takes a command string
+        commands (list): Commands to route
+        repeat (int): Passes over the command list
+
+    Returns:
+        float: Mean microseconds per routed command
+    """
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            route(command)
+    return (time.perf_counter() - started) * 1e6 / (repeat * len(commands))
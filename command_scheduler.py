@@ -0,0 +1,143 @@
+# command_scheduler.py
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from logger import logger
+
+# Priority classes (lower runs first)
+CONTROL = 0  # stop, pause, volume: must feel instant
+NORMAL = 1  # other Spotify and system commands
+BACKGROUND = 2  # LLM questions
+PRIORITY_NAMES = {CONTROL: "control", NORMAL: "normal", BACKGROUND: "background"}
+
+DELAY_HISTORY = 200  # queueing delay samples kept per class
+
+
+class _Entry:
+    __slots__ = ("priority", "seq", "item", "key", "queued_at", "alive")
+
+    def __init__(self, priority, seq, item, key, queued_at):
+        self.priority = priority
+        self.seq = seq
+        self.item = item
+        self.key = key
+        self.queued_at = queued_at
+        self.alive = True
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class CommandScheduler:
+    """
+    Priority queue for commands with supersession of stale entries.
+
+    A drop-in replacement for queue.Queue (put/get/task_done/qsize/empty). Items run in
+    priority order and FIFO within a class. An item put with a supersede key replaces
+    any item with the same key that is still queued, so three queued "next" commands
+    collapse into one. Preemptions (items served ahead of older ones) and queueing
+    delay per priority class are counted.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._keyed = {}  # supersede key -> live entry
+        self._seq = itertools.count()
+        self._live = 0
+        self._not_empty = threading.Condition()
+        self._listeners = []
+
+        # Counters
+        self.preemptions = 0
+        self.superseded = 0
+        self.delays_ms = {priority: deque(maxlen=DELAY_HISTORY) for priority in PRIORITY_NAMES}
+
+    def put(self, item, priority=NORMAL, key=None):
+        """
+        Queue an item.
+
+        Args:
+            item: The queued object (e.g. a command string)
+            priority (int): CONTROL, NORMAL or BACKGROUND
+            key (hashable, optional): Supersede key; a queued item with the same key is dropped
+        """
+        with self._not_empty:
+            if key is not None:
+                stale = self._keyed.get(key)
+                if stale is not None and stale.alive:
+                    stale.alive = False
+                    self._live -= 1
+                    self.superseded += 1
+                    logger.debug(f"Superseded queued command: {stale.item!r}")
+
+            entry = _Entry(priority, next(self._seq), item, key, time.monotonic())
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._keyed[key] = entry
+            self._live += 1
+            self._not_empty.notify()
+
+        for callback in self._listeners:
+            callback()
+
+    def subscribe(self, callback):
+        """Register a callback() to run after each put (e.g. to wake an event loop)."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def get(self, block=True, timeout=None):
+        """
+        Take the most urgent item.
+
+        Raises:
+            queue.Empty: If no item became available in time
+        """
+        with self._not_empty:
+            if not block:
+                timeout = 0
+            if not self._not_empty.wait_for(lambda: self._live > 0, timeout):
+                raise queue.Empty
+
+            entry = heapq.heappop(self._heap)
+            while not entry.alive:
+                entry = heapq.heappop(self._heap)
+            self._live -= 1
+            if entry.key is not None and self._keyed.get(entry.key) is entry:
+                del self._keyed[entry.key]
+
+            if any(other.alive and other.seq < entry.seq for other in self._heap):
+                self.preemptions += 1
+            self.delays_ms.setdefault(entry.priority, deque(maxlen=DELAY_HISTORY)).append(
+                (time.monotonic() - entry.queued_at) * 1000)
+            return entry.item
+
+    def task_done(self):
+        """Accepted for queue.Queue compatibility."""
+
+    def qsize(self):
+        """Return the number of live queued items."""
+        return self._live
+
+    def empty(self):
+        return self._live == 0
+
+    def stats(self):
+        """
+        Get scheduler counters.
+
+        Returns:
+            dict: Queued count, preemptions, superseded count and per-class delay (ms)
+        """
+        stats = {"queued": self._live, "preemptions": self.preemptions, "superseded": self.superseded}
+        for priority, delays in self.delays_ms.items():
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            values = list(delays)
+            stats[f"{name}_delay_ms_mean"] = sum(values) / len(values) if values else 0.0
+            stats[f"{name}_delay_ms_max"] = max(values) if values else 0.0
+        return stats
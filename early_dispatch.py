@@ -0,0 +1,99 @@
+# early_dispatch.py
+from logger import logger
+from plan_cache import normalize_transcript
+
+STABLE_PARTIAL_FRAMES = 2  # consecutive identical partials needed before dispatching
+
+
+class PartialCommandDispatcher:
+    """
+    Dispatches short argument-free commands from stable partial ASR hypotheses.
+
+    Transport commands like "next" or "pause" are complete as soon as they are heard,
+    so there is no need to wait for the recognizer's final result. A command is
+    dispatched once the partial hypothesis matches it exactly and has stayed the same
+    for a number of frames; the final result for the same utterance is then dropped.
+    """
+
+    def __init__(self, commands, stable_frames=STABLE_PARTIAL_FRAMES, key=normalize_transcript):
+        """
+        Args:
+            commands (iterable): Commands that take no arguments (e.g. "pause", "volume up")
+            stable_frames (int): Frames the partial must stay unchanged before dispatch
+            key (callable): Maps a transcript to what identifies its command; a final
+                result is dropped only if its key equals the early command's (default:
+                the normalized text)
+        """
+        self.commands = {normalize_transcript(command) for command in commands}
+        self.stable_frames = stable_frames
+        self.key = key
+        self.reset()
+
+        # Counters
+        self.early_dispatches = 0
+        self.deduplicated = 0
+
+    def reset(self):
+        """Start a new utterance."""
+        self._last_partial = ""
+        self._stable_count = 0
+        self.dispatched = None
+
+    def feed(self, partial):
+        """
+        Feed the latest partial hypothesis for the current utterance.
+
+        Args:
+            partial (str): Partial transcript from the recognizer
+
+        Returns:
+            str | None: The command to dispatch now, or None
+        """
+        partial = normalize_transcript(partial)
+        if self.dispatched or not partial:
+            return None
+
+        if partial == self._last_partial:
+            self._stable_count += 1
+        else:
+            self._last_partial = partial
+            self._stable_count = 1
+
+        if partial in self.commands and self._stable_count >= self.stable_frames:
+            self.dispatched = partial
+            self.early_dispatches += 1
+            logger.info(f"Early dispatch of '{partial}' from stable partial result")
+            return partial
+        return None
+
+    def confirm(self, final):
+        """
+        Check the final transcript of the utterance against an early dispatch.
+
+        Args:
+            final (str): Final transcript from the recognizer
+
+        Returns:
+            bool: True if the final result is the command already dispatched (same key,
+                or empty) and should be dropped, False if it still needs to be processed;
+                a final that only contains the command ("play next to me") is processed
+        """
+        dispatched = self.dispatched
+        self.reset()
+        if not dispatched:
+            return False
+
+        final = normalize_transcript(final)
+        if not final or self.key(final) == self.key(dispatched):
+            self.deduplicated += 1
+            return True
+
+        logger.warning(f"Final result '{final}' differs from early dispatch '{dispatched}'")
+        return False
+
+    def stats(self):
+        """Return early dispatch counters."""
+        return {
+            "early_dispatches": self.early_dispatches,
+            "deduplicated": self.deduplicated,
+        }
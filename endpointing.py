@@ -0,0 +1,96 @@
+# endpointing.py
+from collections import deque
+from logger import logger
+
+# Trailing-silence windows (seconds)
+COMPLETE_COMMAND_SILENCE = 0.25  # partial is already a full command such as "pause"
+DEFAULT_SILENCE = 0.6  # anything else, e.g. "play" still waiting for its song name
+OPEN_ENDED_SILENCE = 1.2  # questions, where users pause mid-sentence
+
+OPEN_ENDED_PREFIXES = ("what is", "what's", "tell me about", "who is", "how do", "why")
+DELAY_HISTORY = 200  # per-utterance endpoint delays kept for stats
+
+
+class AdaptiveEndpointer:
+    """
+    Chooses how much trailing silence ends an utterance, based on what was heard.
+
+    A fixed pause threshold makes "pause" wait as long as a rambling question. Instead,
+    the silence window is short when the partial transcript is already a complete
+    command, and long for open-ended questions.
+    """
+
+    def __init__(self, complete_commands, short=COMPLETE_COMMAND_SILENCE, default=DEFAULT_SILENCE,
+                 long=OPEN_ENDED_SILENCE, open_ended_prefixes=OPEN_ENDED_PREFIXES):
+        """
+        Args:
+            complete_commands (iterable): Commands that need nothing after them
+            short (float): Silence window for complete commands
+            default (float): Silence window when nothing more specific applies
+            long (float): Silence window for open-ended questions
+            open_ended_prefixes (tuple): Phrases that start an open-ended question
+        """
+        self.complete_commands = {command.lower().strip() for command in complete_commands}
+        self.short = short
+        self.default = default
+        self.long = long
+        self.open_ended_prefixes = open_ended_prefixes
+        self.delays = deque(maxlen=DELAY_HISTORY)
+
+    @property
+    def max_silence(self):
+        """Longest window this endpointer may wait (upstream VAD hangover must cover it)."""
+        return max(self.short, self.default, self.long)
+
+    def silence_window(self, partial):
+        """
+        Get the trailing silence needed to end an utterance with this partial transcript.
+
+        Args:
+            partial (str): Partial transcript so far
+
+        Returns:
+            float: Seconds of silence
+        """
+        partial = partial.lower().strip()
+        if partial.startswith(self.open_ended_prefixes):
+            return self.long
+        if partial in self.complete_commands:
+            return self.short
+        return self.default
+
+    def should_end(self, trailing_silence, partial):
+        """
+        Decide whether the utterance is over.
+
+        Args:
+            trailing_silence (float): Seconds of silence since the last speech frame
+            partial (str): Partial transcript so far
+
+        Returns:
+            bool: True if the caller should finalize the utterance now
+        """
+        if not partial:
+            return False
+        window = self.silence_window(partial)
+        if trailing_silence < window:
+            return False
+
+        self.delays.append(trailing_silence)
+        logger.info(f"Endpoint after {trailing_silence * 1000:.0f} ms of silence "
+                    f"(window {window * 1000:.0f} ms) for '{partial}'")
+        return True
+
+    def stats(self):
+        """
+        Get endpoint delay stats.
+
+        Returns:
+            dict: Utterance count and mean/max endpoint delay in ms
+        """
+        delays = list(self.delays)
+        return {
+            "utterances": len(delays),
+            "endpoint_delay_ms_mean": sum(delays) / len(delays) * 1000 if delays else 0.0,
+            "endpoint_delay_ms_max": max(delays) * 1000 if delays else 0.0,
+        }
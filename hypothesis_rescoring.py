@@ -0,0 +1,168 @@
+# hypothesis_rescoring.py
+from fuzzywuzzy import fuzz
+from logger import logger
+from command_grammar import ARGUMENT_KEYWORDS
+
+PARSE_BONUS = 0.3  # added when a hypothesis routes to a known command
+LIBRARY_BONUS = 0.3  # scaled by how well the argument matches a library name
+LIBRARY_MATCH_THRESHOLD = 80  # fuzzy score below which a library match earns nothing
+MISSING_CONFIDENCE_DECAY = 0.9  # confidence given to unscored alternatives, per rank
+MAX_LIBRARY_CANDIDATES = 200  # library names fuzzy-matched per argument (runs on the capture thread)
+
+
+def normalize_alternatives(alternatives):
+    """
+    Fill in missing confidences and drop empty or duplicate transcripts.
+
+    Google only scores the top alternative, so lower-ranked ones get the top confidence
+    decayed by rank.
+
+    Args:
+        alternatives (list): (text, confidence or None) pairs, best first
+
+    Returns:
+        list: (text, confidence) pairs, best first
+    """
+    normalized = []
+    seen = set()
+    top_confidence = next((conf for _, conf in alternatives if conf is not None), 1.0)
+    for rank, (text, confidence) in enumerate(alternatives):
+        text = text.lower().strip()
+        if not text or text in seen:
+            continue
+        seen.add(text)
+        if confidence is None:
+            confidence = top_confidence * MISSING_CONFIDENCE_DECAY ** rank
+        normalized.append((text, confidence))
+    return normalized
+
+
+def command_argument(text):
+    """Return the free-form argument after the first argument keyword, or None."""
+    words = text.split()
+    for index, word in enumerate(words):
+        if word in ARGUMENT_KEYWORDS:
+            return " ".join(words[index + 1:]) or None
+    return None
+
+
+def library_candidates(argument, names, limit=MAX_LIBRARY_CANDIDATES):
+    """
+    Narrow the library names worth fuzzy-matching against an argument.
+
+    fuzz.ratio can only reach LIBRARY_MATCH_THRESHOLD (80) when the shorter string is
+    about 2/3 the length of the longer one or more (0.65 allows for rounding), so other
+    names are skipped without scoring.
+    If more than `limit` remain, names sharing a word with the argument come first.
+
+    Returns:
+        list: At most `limit` names
+    """
+    size = len(argument)
+    candidates = [name for name in names if 20 * min(size, len(name)) >= 13 * max(size, len(name))]
+    if len(candidates) > limit:
+        words = set(argument.split())
+        candidates.sort(key=lambda name: words.isdisjoint(name.split()))
+        candidates = candidates[:limit]
+    return candidates
+
+
+class HypothesisRescorer:
+    """
+    Picks the best of several ASR hypotheses using what the assistant can act on.
+
+    Each alternative starts from its recognizer confidence. Alternatives that route to a
+    known command get a bonus, and so do those whose argument matches a name from the
+    user's library. This recovers from a slightly wrong top transcript without asking
+    the user to repeat the command.
+
+    Rescoring runs on the listener thread, so library matching is limited to
+    alternatives with an argument, each distinct argument is matched once, and only
+    against a bounded set of plausible names (see library_candidates).
+    """
+
+    def __init__(self, route, library_names=None, known=None, argument=command_argument):
+        """
+        Args:
+            route (callable): Returns (intent, action) for a transcript, e.g.
+                CommandProcessor.route; "unrecognized" means it does not parse
+            library_names (callable, optional): Returns spoken library names to match
+                arguments against (e.g. LibraryVocabulary.names)
+            known (callable, optional): Returns True for transcripts that already have a
+                cached plan (e.g. PlanCache.contains); such a top hypothesis is accepted
+                without scoring
+            argument (callable, optional): Returns a transcript's free-form argument or
+                None, e.g. from the command router; only those are matched to the library
+        """
+        self.route = route
+        self.library_names = library_names
+        self.known = known
+        self.argument = argument
+
+        # Counters
+        self.rescored = 0
+        self.changed = 0
+        self.known_hits = 0
+
+    def library_score(self, argument, names):
+        """Best fuzzy match of an argument against the plausible library names (0-100)."""
+        return max((fuzz.ratio(argument, name) for name in library_candidates(argument, names)), default=0)
+
+    def score(self, text, confidence, names=(), matches=None):
+        """
+        Score one hypothesis (higher is better).
+
+        Args:
+            matches (dict, optional): Argument -> library score already computed for
+                another alternative of the same utterance
+        """
+        score = confidence
+        intent, _ = self.route(text)
+        if intent != "unrecognized":
+            score += PARSE_BONUS
+
+        argument = self.argument(text)
+        if argument and names:
+            if matches is None:
+                matches = {}
+            if argument not in matches:
+                matches[argument] = self.library_score(argument, names)
+            best = matches[argument]
+            if best >= LIBRARY_MATCH_THRESHOLD:
+                score += LIBRARY_BONUS * best / 100
+        return score
+
+    def best(self, alternatives):
+        """
+        Choose the best hypothesis.
+
+        Args:
+            alternatives (list): (text, confidence or None) pairs, best first
+
+        Returns:
+            str: The chosen transcript (empty if there were no usable alternatives)
+        """
+        alternatives = normalize_alternatives(alternatives)
+        if not alternatives:
+            return ""
+        if len(alternatives) == 1:
+            return alternatives[0][0]
+        if self.known and self.known(alternatives[0][0]):
+            self.known_hits += 1
+            return alternatives[0][0]
+
+        names = self.library_names() if self.library_names else ()
+        matches = {}
+        scored = [(self.score(text, confidence, names, matches), -rank, text)
+                  for rank, (text, confidence) in enumerate(alternatives)]
+        _, _, chosen = max(scored)
+
+        self.rescored += 1
+        if chosen != alternatives[0][0]:
+            self.changed += 1
+            logger.info(f"Rescoring picked '{chosen}' over top hypothesis '{alternatives[0][0]}'")
+        return chosen
+
+    def stats(self):
+        """Return how often rescoring ran, changed the transcript or was skipped for a known phrase."""
+        return {"rescored": self.rescored, "changed": self.changed, "known_hits": self.known_hits}
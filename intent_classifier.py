@@ -0,0 +1,628 @@
+# intent_classifier.py
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+from pathlib import Path
+import numpy as np
+from logger import logger
+from plan_cache import normalize_transcript
+
+NGRAM_RANGE = (2, 4)  # character n-gram lengths (word boundaries included); whole words are features too
+CONFIDENCE_THRESHOLD = 0.25  # cosine similarity to the nearest centroid needed to skip the LLM
+CONFIDENCE_MARGIN = 0.1  # lead over the next best label needed to skip the LLM
+INTENT_LOG = Path("logs/intent_examples.jsonl")  # utterances resolved by the LLM, used as training data
+
+# Action name for each intent (matches llm_intents.INTENT_SYSTEM_PROMPT)
+INTENT_ACTIONS = {
+    "music_control": "spotify_command",
+    "play_music": "play_song",
+    "play_artist": "play_artist",
+    "open_website": "navigate",
+    "search": "search_google",
+    "get_weather": "fetch_weather",
+    "get_news": "fetch_news",
+    "launch_app": "open_application",
+    "send_message": "send_text",
+    "question": "answer",
+}
+
+# Parameters that are part of the label rather than read from the text
+FIXED_PARAMETERS = {"music_control": ("command",)}
+
+# Parameters an intent cannot run without
+REQUIRED_SLOTS = {
+    "play_music": ("song",),
+    "play_artist": ("artist",),
+    "open_website": ("url",),
+    "search": ("query",),
+    "get_weather": ("location",),
+    "launch_app": ("app_name",),
+    "send_message": ("recipient", "message"),
+}
+
+# Applications that may be launched by voice: spoken name -> application name
+KNOWN_APPLICATIONS = {
+    "calculator": "Calculator",
+    "calendar": "Calendar",
+    "notes": "Notes",
+    "reminders": "Reminders",
+    "mail": "Mail",
+    "messages": "Messages",
+    "maps": "Maps",
+    "photos": "Photos",
+    "facetime": "FaceTime",
+    "safari": "Safari",
+    "chrome": "Google Chrome",
+    "google chrome": "Google Chrome",
+    "spotify": "Spotify",
+    "slack": "Slack",
+    "terminal": "Terminal",
+    "finder": "Finder",
+    "settings": "System Settings",
+    "system settings": "System Settings",
+    "vs code": "Visual Studio Code",
+    "visual studio code": "Visual Studio Code",
+}
+
+# Words that must appear before a side-effecting music command runs without the LLM
+# ("shut down the computer" is close to "turn it down" but names nothing playing)
+_SOUND_WORDS = r"\b(?:it|this|that|music|volume|sound|song|track|tunes|louder|quieter|softer)\b"
+COMMAND_EVIDENCE = {
+    "volume up": (_SOUND_WORDS, r"\b(?:up|louder|raise|increase|higher|too quiet|too soft|(?:barely|can't) hear)\b"),
+    "volume down": (_SOUND_WORDS, r"\b(?:down|quieter|softer|lower|decrease|too loud)\b"),
+}
+
+# Words that must appear before an intent is answered without the LLM
+# ("delete all my files" is nearest to the questions but asks nothing)
+INTENT_EVIDENCE = {
+    "question": (r"^(?:what|what's|who|who's|when|where|why|how|which|is|are|can|could|do|does|did|will|would|"
+                 r"should|explain|describe|define|tell me|give me)\b",),
+}
+
+# Slot patterns per intent, tried in order on the normalized utterance
+SLOT_PATTERNS = {
+    "play_music": [
+        r"^(?:can you |please )?(?:put on|queue up|throw on|(?:i want|i'd like|i'd love) to hear|let's hear|"
+        r"(?:let's )?listen to) (?:the song )?(?P<song>.+?)(?: by (?P<artist>.+))?$",
+    ],
+    "play_artist": [
+        r"(?:some(?:thing)? by|some|songs by|music by|tracks by|anything by) (?P<artist>.+?)"
+        r"(?: music| songs)?(?: going| on| please)?$",
+        r"^(?:put on|throw on|i want to hear) (?P<artist>.+?) (?:music|songs)$",
+    ],
+    "open_website": [
+        r"^(?:go to|open|visit|take me to|pull up|bring up|load|navigate to|head (?:over )?to) (?:the )?"
+        r"(?P<url>.+?)(?: website| site| page| homepage| home page)?$",
+    ],
+    "search": [
+        r"(?:search|google|look up|find(?: me)?|look for)(?: the web| online| google)?"
+        r"(?: for| about| on)?(?: info| information)?(?: about| on)? (?P<query>.+?)(?: online| on the web)?$",
+    ],
+    "get_weather": [
+        r"(?:in|for|at|around) (?P<location>.+?)(?: today| tomorrow| right now| this week)?$",
+    ],
+    "get_news": [
+        r"(?:news|headlines|stories)(?: about| on| in| for)? (?P<topic>.+?)(?: today| right now)?$",
+        r"^(?:the |latest |today's )?(?P<topic>.+?) (?:news|headlines)(?: today| right now)?$",
+    ],
+    "launch_app": [
+        r"^(?:open|launch|start|run|fire up|bring up) (?:the |my )?(?P<app_name>.+?)(?: app| application)?$",
+        # Any allowlisted application named in the utterance ("get the calendar going")
+        r"\b(?P<app_name>" + "|".join(sorted(KNOWN_APPLICATIONS, key=len, reverse=True)) + r")\b",
+    ],
+    "send_message": [
+        r"(?:message|text|tell|ping|send a message to|send a text to|write to) (?P<recipient>\w+) "
+        r"(?:saying|that|to say|and say) (?P<message>.+)$",
+        r"^let (?P<recipient>\w+) know (?:that )?(?P<message>.+)$",
+        r"^(?:send|text) (?P<message>.+) to (?P<recipient>\w+)$",
+    ],
+}
+
+# Seed examples: the phrasings in the LLM_Template prompt plus common variants
+TRAINING_EXAMPLES = [
+    ("turn it up", "music_control", {"command": "volume up"}),
+    ("crank it up", "music_control", {"command": "volume up"}),
+    ("make it louder", "music_control", {"command": "volume up"}),
+    ("louder please", "music_control", {"command": "volume up"}),
+    ("turn up the music", "music_control", {"command": "volume up"}),
+    ("raise the volume", "music_control", {"command": "volume up"}),
+    ("pump up the volume", "music_control", {"command": "volume up"}),
+    ("turn the sound up a bit", "music_control", {"command": "volume up"}),
+    ("it's too quiet", "music_control", {"command": "volume up"}),
+    ("volume up please", "music_control", {"command": "volume up"}),
+    ("a little louder", "music_control", {"command": "volume up"}),
+    ("i can't hear it", "music_control", {"command": "volume up"}),
+    ("the volume is too low", "music_control", {"command": "volume up"}),
+    ("turn it down", "music_control", {"command": "volume down"}),
+    ("make it quieter", "music_control", {"command": "volume down"}),
+    ("quieter please", "music_control", {"command": "volume down"}),
+    ("turn down the music", "music_control", {"command": "volume down"}),
+    ("lower the volume", "music_control", {"command": "volume down"}),
+    ("it's too loud", "music_control", {"command": "volume down"}),
+    ("turn the sound down", "music_control", {"command": "volume down"}),
+    ("take the volume down", "music_control", {"command": "volume down"}),
+    ("volume down a bit", "music_control", {"command": "volume down"}),
+    ("a little softer", "music_control", {"command": "volume down"}),
+    ("way too loud", "music_control", {"command": "volume down"}),
+    ("the volume is too high", "music_control", {"command": "volume down"}),
+    ("can you lower the sound", "music_control", {"command": "volume down"}),
+    ("hold the music", "music_control", {"command": "pause"}),
+    ("hold on a second", "music_control", {"command": "pause"}),
+    ("shut it off for a sec", "music_control", {"command": "pause"}),
+    ("pause the music", "music_control", {"command": "pause"}),
+    ("hold it right there", "music_control", {"command": "pause"}),
+    ("stop the song for a moment", "music_control", {"command": "pause"}),
+    ("put the music on hold", "music_control", {"command": "pause"}),
+    ("pause the track", "music_control", {"command": "pause"}),
+    ("give the music a rest", "music_control", {"command": "pause"}),
+    ("keep playing", "music_control", {"command": "resume"}),
+    ("unpause", "music_control", {"command": "resume"}),
+    ("continue the song", "music_control", {"command": "resume"}),
+    ("start it again", "music_control", {"command": "resume"}),
+    ("resume the music", "music_control", {"command": "resume"}),
+    ("go on with the music", "music_control", {"command": "resume"}),
+    ("pick the music back up", "music_control", {"command": "resume"}),
+    ("back to the music", "music_control", {"command": "resume"}),
+    ("continue playing", "music_control", {"command": "resume"}),
+    ("unpause the song", "music_control", {"command": "resume"}),
+    ("skip this song", "music_control", {"command": "next"}),
+    ("skip this track", "music_control", {"command": "next"}),
+    ("i don't like this song", "music_control", {"command": "next"}),
+    ("change the song", "music_control", {"command": "next"}),
+    ("next one please", "music_control", {"command": "next"}),
+    ("move on to the next song", "music_control", {"command": "next"}),
+    ("not this song", "music_control", {"command": "next"}),
+    ("play something else", "music_control", {"command": "next"}),
+    ("get rid of this track", "music_control", {"command": "next"}),
+    ("next track", "music_control", {"command": "next"}),
+    ("play the next one", "music_control", {"command": "next"}),
+    ("i hate this song", "music_control", {"command": "next"}),
+    ("go back a song", "music_control", {"command": "previous"}),
+    ("play the last song again", "music_control", {"command": "previous"}),
+    ("last track", "music_control", {"command": "previous"}),
+    ("back to the previous song", "music_control", {"command": "previous"}),
+    ("play the one before", "music_control", {"command": "previous"}),
+    ("go back one track", "music_control", {"command": "previous"}),
+    ("previous track please", "music_control", {"command": "previous"}),
+    ("mix it up", "music_control", {"command": "shuffle"}),
+    ("randomize the songs", "music_control", {"command": "shuffle"}),
+    ("shuffle my music", "music_control", {"command": "shuffle"}),
+    ("play the songs in random order", "music_control", {"command": "shuffle"}),
+    ("turn on shuffle", "music_control", {"command": "shuffle"}),
+    ("shuffle the songs", "music_control", {"command": "shuffle"}),
+    ("random order please", "music_control", {"command": "shuffle"}),
+    ("put this on loop", "music_control", {"command": "repeat"}),
+    ("loop this song", "music_control", {"command": "repeat"}),
+    ("play this on repeat", "music_control", {"command": "repeat"}),
+    ("repeat this track", "music_control", {"command": "repeat"}),
+    ("play this one over and over", "music_control", {"command": "repeat"}),
+    ("fast forward a bit", "music_control", {"command": "skip"}),
+    ("jump ahead", "music_control", {"command": "skip"}),
+    ("skip forward thirty seconds", "music_control", {"command": "skip"}),
+    ("move forward a little in the song", "music_control", {"command": "skip"}),
+    ("go back a few seconds", "music_control", {"command": "rewind"}),
+    ("run that back", "music_control", {"command": "rewind"}),
+    ("rewind a little", "music_control", {"command": "rewind"}),
+    ("back up a few seconds in the track", "music_control", {"command": "rewind"}),
+    ("what song is this", "music_control", {"command": "current"}),
+    ("who sings this", "music_control", {"command": "current"}),
+    ("what's playing right now", "music_control", {"command": "current"}),
+    ("name of this track", "music_control", {"command": "current"}),
+    ("what's this song called", "music_control", {"command": "current"}),
+    ("who is singing this", "music_control", {"command": "current"}),
+    ("tell me the name of this song", "music_control", {"command": "current"}),
+    ("identify this song", "music_control", {"command": "current"}),
+    ("what track is playing", "music_control", {"command": "current"}),
+    ("what is this song", "music_control", {"command": "current"}),
+    ("put on despacito", "play_music", {}),
+    ("put on bohemian rhapsody by queen", "play_music", {}),
+    ("queue up blinding lights", "play_music", {}),
+    ("throw on hotel california", "play_music", {}),
+    ("i want to hear shape of you", "play_music", {}),
+    ("listen to yesterday by the beatles", "play_music", {}),
+    ("can you queue up wonderwall", "play_music", {}),
+    ("can you put on let it be", "play_music", {}),
+    ("let's listen to thriller by michael jackson", "play_music", {}),
+    ("queue up bad guy by billie eilish", "play_music", {}),
+    ("put on some drake", "play_artist", {}),
+    ("something by taylor swift", "play_artist", {}),
+    ("i want to hear some queen", "play_artist", {}),
+    ("play some songs by coldplay", "play_artist", {}),
+    ("throw on kendrick lamar music", "play_artist", {}),
+    ("i'm in the mood for some adele", "play_artist", {}),
+    ("put something by the weeknd on", "play_artist", {}),
+    ("some beyonce please", "play_artist", {}),
+    ("let's have some songs by radiohead", "play_artist", {}),
+    ("open youtube", "open_website", {}),
+    ("go to reddit", "open_website", {}),
+    ("open github dot com", "open_website", {}),
+    ("take me to wikipedia", "open_website", {}),
+    ("pull up amazon website", "open_website", {}),
+    ("visit netflix", "open_website", {}),
+    ("show me the imdb site", "open_website", {}),
+    ("load the guardian website", "open_website", {}),
+    ("navigate to twitter", "open_website", {}),
+    ("go to the bbc site", "open_website", {}),
+    ("open the cnn homepage", "open_website", {}),
+    ("go to google dot com", "open_website", {}),
+    ("take me to the amazon site", "open_website", {}),
+    ("search for dogs", "search", {}),
+    ("google best pizza near me", "search", {}),
+    ("look up how to tie a tie", "search", {}),
+    ("search the web for cheap flights", "search", {}),
+    ("find recipes for lasagna", "search", {}),
+    ("look up movie times", "search", {}),
+    ("search online for hiking boots", "search", {}),
+    ("look for cheap hotels in rome", "search", {}),
+    ("search for electric cars", "search", {}),
+    ("google how to fix a flat tire", "search", {}),
+    ("search google for used cars", "search", {}),
+    ("find me a good sushi place", "search", {}),
+    ("look up information on mars", "search", {}),
+    ("weather in paris", "get_weather", {}),
+    ("what's the weather like in new york", "get_weather", {}),
+    ("is it going to rain in seattle", "get_weather", {}),
+    ("forecast for boston tomorrow", "get_weather", {}),
+    ("how hot is it in phoenix", "get_weather", {}),
+    ("temperature in london", "get_weather", {}),
+    ("will it snow in denver", "get_weather", {}),
+    ("what's the forecast for chicago this week", "get_weather", {}),
+    ("is it sunny in miami", "get_weather", {}),
+    ("how windy is it in chicago today", "get_weather", {}),
+    ("news about technology", "get_news", {}),
+    ("latest headlines", "get_news", {}),
+    ("what's in the news today", "get_news", {}),
+    ("sports news", "get_news", {}),
+    ("give me the top stories", "get_news", {}),
+    ("tell me the latest news", "get_news", {}),
+    ("headlines about the economy", "get_news", {}),
+    ("updates about the world cup", "get_news", {}),
+    ("what's new in politics", "get_news", {}),
+    ("catch me up on the news", "get_news", {}),
+    ("what's happening today", "get_news", {}),
+    ("what's the latest on the economy", "get_news", {}),
+    ("read me the headlines", "get_news", {}),
+    ("any breaking news", "get_news", {}),
+    ("top stories in business", "get_news", {}),
+    ("open spotify", "launch_app", {}),
+    ("launch the calculator", "launch_app", {}),
+    ("start notes app", "launch_app", {}),
+    ("open calendar", "launch_app", {}),
+    ("fire up visual studio code", "launch_app", {}),
+    ("open my mail application", "launch_app", {}),
+    ("can you open finder", "launch_app", {}),
+    ("bring up the terminal", "launch_app", {}),
+    ("get slack open", "launch_app", {}),
+    ("can you start the calendar", "launch_app", {}),
+    ("message john saying hi", "send_message", {}),
+    ("text mom that i'm on my way", "send_message", {}),
+    ("send a message to alex saying running late", "send_message", {}),
+    ("tell sarah that dinner is ready", "send_message", {}),
+    ("send a text to dad saying i'll be late", "send_message", {}),
+    ("message sam saying call me back", "send_message", {}),
+    ("text lisa that the movie starts at eight", "send_message", {}),
+    ("how far away is the moon", "question", {}),
+    ("why is the sky blue", "question", {}),
+    ("who wrote hamlet", "question", {}),
+    ("how many ounces are in a cup", "question", {}),
+    ("can you help me with my homework", "question", {}),
+    ("when did world war two end", "question", {}),
+    ("give me a fun fact", "question", {}),
+    ("what is photosynthesis", "question", {}),
+    ("how does a rainbow form", "question", {}),
+    ("explain how airplanes fly", "question", {}),
+    ("what is the speed of light", "question", {}),
+    ("who painted the mona lisa", "question", {}),
+    ("tell me about the roman empire", "question", {}),
+    ("what is the capital of australia", "question", {}),
+    ("what is the tallest mountain in the world", "question", {}),
+    ("how does the stock market work", "question", {}),
+    ("why do cats purr", "question", {}),
+    ("what does dna stand for", "question", {}),
+    ("how long does it take to boil an egg", "question", {}),
+    ("who invented the telephone", "question", {}),
+    ("explain the theory of relativity", "question", {}),
+]
+
+IntentPrediction = namedtuple("IntentPrediction", "intent confidence margin slots")
+IntentPrediction.__doc__ = """
+Result of IntentClassifier.predict.
+
+intent: Intent JSON in the LLM's format ({"intent", "action", "parameters"}), or None
+confidence: Cosine similarity to the nearest intent centroid (0..1)
+margin: Lead of that similarity over the next best centroid (volume up vs volume down counts)
+slots: Parameters extracted from the utterance (already merged into intent["parameters"])
+"""
+
+
+def _label(intent, parameters):
+    """Centroid label: the intent plus any parameters that are part of it."""
+    fixed = tuple((name, str(parameters.get(name, "")).lower()) for name in FIXED_PARAMETERS.get(intent, ()))
+    return (intent,) + fixed
+
+
+def extract_slots(intent, text):
+    """
+    Pull an intent's parameters out of an utterance with its SLOT_PATTERNS.
+
+    Args:
+        intent (str): Intent name
+        text (str): Normalized utterance
+
+    Returns:
+        dict: Slot name -> value (empty if no pattern matched)
+    """
+    for pattern in SLOT_PATTERNS.get(intent, ()):
+        found = re.search(pattern, text)
+        if found:
+            slots = {name: value.strip() for name, value in found.groupdict().items() if value}
+            break
+    else:
+        slots = {}
+
+    if intent == "open_website" and "url" in slots:
+        site = re.sub(r" (?:dot )?com$", "", slots["url"]).replace(" dot ", ".").replace(" ", "")
+        slots["url"] = f"https://{site}" if "." in site else f"https://{site}.com"
+    elif intent == "launch_app" and "app_name" in slots:
+        # Only allowlisted applications are launched; anything else is left to the LLM
+        application = KNOWN_APPLICATIONS.get(slots["app_name"])
+        if application is None:
+            del slots["app_name"]
+        else:
+            slots["app_name"] = application
+    elif intent == "question":
+        slots["question"] = text
+    return slots
+
+
+def has_evidence(intent, text):
+    """
+    Check that an utterance literally supports a predicted intent.
+
+    Args:
+        intent (dict): Predicted intent JSON ({"intent", "action", "parameters"})
+        text (str): Normalized utterance
+
+    Returns:
+        bool: False if an INTENT_EVIDENCE pattern for the intent or a COMMAND_EVIDENCE
+            pattern for its command is missing
+    """
+    patterns = INTENT_EVIDENCE.get(intent["intent"], ()) + COMMAND_EVIDENCE.get(intent["parameters"].get("command"), ())
+    return all(re.search(pattern, text) for pattern in patterns)
+
+
+class IntentClassifier:
+    """
+    Nearest-centroid intent classifier over TF-IDF weighted character n-grams and words.
+
+    Trained from the LLM prompt's examples plus utterances the LLM resolved before
+    (INTENT_LOG). Predicting is one sparse n-gram count and one small matrix product,
+    tens of microseconds instead of an LLM round trip. Low-confidence predictions are
+    left to the LLM (see is_confident).
+    """
+
+    def __init__(self, examples=TRAINING_EXAMPLES, log_path=INTENT_LOG, threshold=CONFIDENCE_THRESHOLD,
+                 margin=CONFIDENCE_MARGIN):
+        """
+        Args:
+            examples (list): (utterance, intent, parameters) seed examples
+            log_path (Path, optional): JSON-lines file of learned examples (None disables it)
+            threshold (float): Minimum confidence to trust a prediction
+            margin (float): Minimum lead over the best other intent to trust a prediction
+        """
+        self.threshold = threshold
+        self.margin = margin
+        self.log_path = Path(log_path) if log_path else None
+        self._examples = list(examples) + self._load_log()
+        self._lock = threading.Lock()
+        self._vocabulary = {}
+        self._idf = None
+        self._centroids = None
+        self._labels = []
+
+        # Counters
+        self.predictions = 0
+        self.confident = 0
+        self.learned = 0
+        self.predict_seconds = 0.0
+
+        self.fit()
+
+    def _load_log(self):
+        if self.log_path is None or not self.log_path.exists():
+            return []
+        examples = []
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    examples.append((record["text"], record["intent"], record.get("parameters") or {}))
+                except (json.JSONDecodeError, KeyError) as e:
+                    logger.warning(f"Skipping bad line in {self.log_path}: {e}")
+        logger.info(f"Loaded {len(examples)} logged intent examples from {self.log_path}")
+        return examples
+
+    @staticmethod
+    def _ngrams(text):
+        normalized = normalize_transcript(text)
+        padded = f" {normalized} "
+        low, high = NGRAM_RANGE
+        grams = Counter(padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1))
+        # Whole words as well, so "weather" or "news" counts for more than its shared n-grams
+        grams.update(f"<{word}>" for word in normalized.split())
+        return grams
+
+    def _vectorize(self, text):
+        vector = np.zeros(len(self._vocabulary))
+        for gram, count in self._ngrams(text).items():
+            index = self._vocabulary.get(gram)
+            if index is not None:
+                vector[index] = 1.0 + math.log(count)
+        vector *= self._idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def fit(self):
+        """(Re)build the vocabulary, IDF weights and one centroid per label."""
+        with self._lock:
+            grams = [self._ngrams(text) for text, _, _ in self._examples]
+            vocabulary = {}
+            document_frequency = Counter()
+            for counts in grams:
+                document_frequency.update(counts.keys())
+                for gram in counts:
+                    vocabulary.setdefault(gram, len(vocabulary))
+            idf = np.ones(len(vocabulary))
+            for gram, index in vocabulary.items():
+                idf[index] = math.log((1 + len(grams)) / (1 + document_frequency[gram])) + 1.0
+            self._vocabulary, self._idf = vocabulary, idf
+
+            members = defaultdict(list)
+            for (text, intent, parameters) in self._examples:
+                members[_label(intent, parameters)].append(self._vectorize(text))
+            self._labels = list(members)
+            centroids = np.array([np.mean(vectors, axis=0) for vectors in members.values()])
+            self._centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    def predict(self, text):
+        """
+        Classify an utterance and extract its slots.
+
+        Args:
+            text (str): The user's utterance
+
+        Returns:
+            IntentPrediction: Intent JSON, confidence, margin and slots; confidence is 0
+                when a required slot could not be extracted (including applications not in
+                KNOWN_APPLICATIONS) or the words lack evidence for it (INTENT_EVIDENCE,
+                COMMAND_EVIDENCE)
+        """
+        started = time.perf_counter()
+        normalized = normalize_transcript(text)
+        with self._lock:
+            scores = self._centroids @ self._vectorize(normalized)
+            labels = self._labels
+        order = np.argsort(scores)[::-1]
+        best = labels[order[0]]
+        runner_up = scores[order[1]] if len(order) > 1 else 0.0
+        confidence, margin = float(scores[order[0]]), float(scores[order[0]] - runner_up)
+
+        name = best[0]
+        slots = extract_slots(name, normalized)
+        parameters = dict(best[1:])
+        parameters.update(slots)
+        intent = {"intent": name, "action": INTENT_ACTIONS.get(name, name), "parameters": parameters}
+        if any(slot not in slots for slot in REQUIRED_SLOTS.get(name, ())) or not has_evidence(intent, normalized):
+            confidence = 0.0
+
+        self.predictions += 1
+        self.predict_seconds += time.perf_counter() - started
+        return IntentPrediction(intent, confidence, margin, slots)
+
+    def is_confident(self, prediction):
+        """True if the prediction can be used without asking the LLM."""
+        confident = prediction.confidence >= self.threshold and prediction.margin >= self.margin
+        if confident:
+            self.confident += 1
+        return confident
+
+    def learn(self, text, intent):
+        """
+        Add an utterance the LLM resolved as a training example, persist it and refit.
+
+        Args:
+            text (str): The user's utterance
+            intent (dict): Intent JSON from the LLM
+
+        Returns:
+            bool: True if the example was new and the model was refit
+        """
+        name = (intent or {}).get("intent")
+        if name not in INTENT_ACTIONS:
+            return False
+        text = normalize_transcript(text)
+        parameters = {key: str(value).lower() for key, value in (intent.get("parameters") or {}).items()
+                      if key in FIXED_PARAMETERS.get(name, ())}
+        if any(known == text and _label(known_intent, known_parameters) == _label(name, parameters)
+               for known, known_intent, known_parameters in self._examples):
+            return False
+        self._examples.append((text, name, parameters))
+        self.learned += 1
+        if self.log_path is not None:
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps({"text": text, "intent": name, "parameters": parameters}) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not log intent example: {e}")
+        self.fit()
+        return True
+
+    def stats(self):
+        """
+        Get classifier counters.
+
+        Returns:
+            dict: Examples, labels, predictions, confident share, learned count and
+                mean prediction time (µs)
+        """
+        return {
+            "examples": len(self._examples),
+            "labels": len(self._labels),
+            "predictions": self.predictions,
+            "confident_rate": self.confident / self.predictions if self.predictions else 0.0,
+            "learned": self.learned,
+            "predict_us_mean": self.predict_seconds * 1e6 / self.predictions if self.predictions else 0.0,
+        }
+
+
+def evaluate(predict, samples):
+    """
+    Measure intent accuracy and latency of a predictor.
+
+    Args:
+        predict (callable): predict(text) -> intent dict, or None to defer (to the LLM)
+        samples (list): (utterance, expected intent name, expected parameters) tuples;
+            an expected intent of None means the utterance should be deferred, and only
+            the parameters given are compared
+
+    Returns:
+        dict: Accuracy (intent name, deferrals count when expected), exact (intent plus
+            expected parameters), answered share, wrong share (answered with the wrong
+            intent or parameters, e.g. "previous" for a pause) and latency mean/p50/p95 (ms)
+    """
+    correct = exact = answered = wrong = 0
+    latencies = []
+    for text, expected, parameters in samples:
+        started = time.perf_counter()
+        intent = predict(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if intent is None:
+            if expected is None:
+                correct += 1
+                exact += 1
+            continue
+        answered += 1
+        if intent.get("intent") != expected:
+            wrong += 1
+            continue
+        correct += 1
+        got = intent.get("parameters") or {}
+        if all(str(got.get(key, "")).lower() == str(value).lower() for key, value in parameters.items()):
+            exact += 1
+        else:
+            wrong += 1
+    latencies.sort()
+    return {
+        "samples": len(samples),
+        "accuracy": correct / len(samples),
+        "exact": exact / len(samples),
+        "answered": answered / len(samples),
+        "wrong": wrong / len(samples),
+        "latency_ms_mean": sum(latencies) / len(latencies),
+        "latency_ms_p50": latencies[len(latencies) // 2],
+        "latency_ms_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
@@ -0,0 +1,171 @@
+# library_vocabulary.py
+import re
+import threading
+from logger import logger
+from spotify_utils import sp, get_artists, get_playlists
+
+SAVED_TRACKS_PAGE = 50  # maximum page size for current_user_saved_tracks
+MAX_SAVED_TRACKS = 500  # cap on titles pulled into the vocabulary
+TOP_ARTIST_LIMIT = 50
+REFRESH_INTERVAL = 600  # seconds between background library checks
+
+
+def normalize_name(name):
+    """
+    Reduce a track, artist or playlist name to the words a user would actually say.
+
+    "Die For You (with Ariana Grande) - Remix" -> "die for you"
+
+    Args:
+        name (str): Name as returned by the Spotify API
+
+    Returns:
+        str: Lowercase spoken form (may be empty)
+    """
+    name = name.lower()
+    name = re.sub(r"[\(\[].*?[\)\]]", " ", name)  # drop "(feat. x)", "[remastered]"
+    name = name.split(" - ")[0]  # drop " - remix", " - live" suffixes
+    name = re.sub(r"[^a-z0-9' ]+", " ", name)
+    return " ".join(name.split())
+
+
+class LibraryVocabulary:
+    """
+    Spoken names from the user's Spotify library, used to bias argument recognition.
+
+    Collects saved track titles, top artists and playlist names, and refreshes them
+    incrementally: saved tracks are fetched newest first only until an already known
+    track is reached, and playlists are compared by snapshot id. Subscribers are
+    notified whenever the vocabulary actually changes.
+    """
+
+    def __init__(self):
+        self.tracks = {}  # track id -> spoken title
+        self.artists = {}  # artist id -> spoken name
+        self.playlists = {}  # playlist id -> (snapshot id, spoken name)
+        self.version = 0
+        self._saved_total = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop_refresh = threading.Event()
+
+    def subscribe(self, callback):
+        """Register a callback(vocabulary) to run after each change."""
+        self._listeners.append(callback)
+
+    def _refresh_saved_tracks(self):
+        """Pull newly saved tracks; returns True if the set of titles changed."""
+        first_page = sp.current_user_saved_tracks(limit=SAVED_TRACKS_PAGE, offset=0)
+        total = first_page['total']
+
+        # Fewer saved tracks than we know about means something was removed: rebuild
+        if self._saved_total is not None and total < self._saved_total:
+            logger.debug("Saved tracks were removed, rebuilding track vocabulary")
+            self.tracks = {}
+
+        new_tracks = {}
+        page, offset = first_page, 0
+        while page['items'] and offset < MAX_SAVED_TRACKS:
+            known = False
+            for item in page['items']:
+                track = item['track']
+                if track['id'] in self.tracks:
+                    known = True  # everything older is already in the vocabulary
+                    break
+                new_tracks[track['id']] = normalize_name(track['name'])
+            if known or not page['next']:
+                break
+            offset += SAVED_TRACKS_PAGE
+            page = sp.current_user_saved_tracks(limit=SAVED_TRACKS_PAGE, offset=offset)
+
+        self._saved_total = total
+        self.tracks.update(new_tracks)
+        return bool(new_tracks)
+
+    def _refresh_artists(self):
+        """Pull top artists; returns True if they changed."""
+        artists = {artist['id']: normalize_name(artist['name'])
+                   for artist in get_artists(limit=TOP_ARTIST_LIMIT, print_results=False)}
+        if artists and artists != self.artists:
+            self.artists = artists
+            return True
+        return False
+
+    def _refresh_playlists(self):
+        """Pull playlists; returns True if any were added, removed or modified."""
+        playlists = {playlist['id']: (playlist.get('snapshot_id'), normalize_name(playlist['name']))
+                     for playlist in get_playlists(print_results=False)}
+        if playlists != self.playlists:
+            self.playlists = playlists
+            return True
+        return False
+
+    def refresh(self):
+        """
+        Bring the vocabulary up to date with the library.
+
+        Returns:
+            bool: True if anything changed (subscribers have been notified)
+        """
+        with self._lock:
+            try:
+                changed = self._refresh_saved_tracks()
+                changed = self._refresh_artists() or changed
+                changed = self._refresh_playlists() or changed
+            except Exception as e:
+                logger.error(f"Error refreshing library vocabulary: {e}")
+                return False
+
+            if changed:
+                self.version += 1
+                logger.info(f"Library vocabulary v{self.version}: {len(self.tracks)} tracks, "
+                            f"{len(self.artists)} artists, {len(self.playlists)} playlists")
+
+        if changed:
+            for callback in self._listeners:
+                try:
+                    callback(self)
+                except Exception as e:
+                    logger.error(f"Error in library vocabulary listener: {e}")
+        return changed
+
+    def names(self):
+        """Return every distinct spoken name in the library."""
+        names = set(self.tracks.values()) | set(self.artists.values())
+        names |= {name for _, name in self.playlists.values()}
+        names.discard("")
+        return sorted(names)
+
+    def phrases(self):
+        """
+        Build recognizer phrases pairing command keywords with library names.
+
+        Returns:
+            list: Phrases such as "play die for you", "artist the weeknd", "playlist chill"
+        """
+        phrases = set()
+        for title in self.tracks.values():
+            phrases.add(f"play {title}")
+        for artist in self.artists.values():
+            phrases.add(f"play {artist}")
+            phrases.add(f"artist {artist}")
+        for _, playlist in self.playlists.values():
+            phrases.add(f"playlist {playlist}")
+        return sorted(phrase for phrase in phrases if len(phrase.split()) > 1)
+
+    def start_auto_refresh(self, interval=REFRESH_INTERVAL):
+        """Re-check the library every `interval` seconds on a background thread."""
+        if self._refresher is not None:
+            return
+
+        def refresh_loop():
+            while not self._stop_refresh.wait(interval):
+                self.refresh()
+
+        self._refresher = threading.Thread(target=refresh_loop, name="library-vocabulary", daemon=True)
+        self._refresher.start()
+
+    def stop_auto_refresh(self):
+        """Stop the background refresh thread."""
+        self._stop_refresh.set()
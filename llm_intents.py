@@ -0,0 +1,308 @@
+# llm_intents.py
+import json
+import platform
+import subprocess
+import threading
+import time
+import webbrowser
+from collections import OrderedDict
+import ollama
+import requests
+from logger import logger
+from plan_cache import normalize_transcript
+from intent_classifier import KNOWN_APPLICATIONS
+from tracing import tracer
+
+INTENT_MODEL = "llama3.2"
+INTENT_CACHE_SIZE = 256
+INTENT_TTL = 24 * 3600  # seconds a resolved phrasing is reused
+FAILED_INTENT_TTL = 60  # seconds a phrasing the LLM could not parse is not retried
+WEATHER_API_KEY = "your_openweathermap_api_key"  # Replace with your key; without one weather opens a search
+
+INTENT_SYSTEM_PROMPT = (
+    "You are an assistant that converts user commands into JSON for system execution.\n"
+    "Respond ONLY with a JSON object. Use the following format:\n\n"
+    "{\n"
+    "  \"intent\": \"string\",         # general intent (e.g. open_website, get_weather)\n"
+    "  \"action\": \"string\",         # specific action the system can run\n"
+    "  \"parameters\": {              # any relevant parameters for the action\n"
+    "    ...                         # key-value pairs like \"url\", \"query\", etc.\n"
+    "  }\n"
+    "}\n\n"
+    "Supported intents and actions:\n"
+    "- music_control → spotify_command → { \"command\": one of \"pause\", \"resume\", \"next\", \"previous\", "
+    "\"shuffle\", \"repeat\", \"volume up\", \"volume down\", \"skip\", \"rewind\", \"current\" }\n"
+    "- play_music → play_song → { \"song\": \"Bohemian Rhapsody\" } (optional: \"artist\")\n"
+    "- play_artist → play_artist → { \"artist\": \"Queen\" }\n"
+    "- open_website → navigate → { \"url\": \"https://example.com\" }\n"
+    "- search → search_google → { \"query\": \"dogs\" }\n"
+    "- get_weather → fetch_weather → { \"location\": \"New York\" }\n"
+    "- get_news → fetch_news → { \"topic\": \"technology\" } (optional)\n"
+    "- launch_app → open_application → { \"app_name\": \"calculator\" }\n"
+    "- send_message → send_text → { \"recipient\": \"John\", \"message\": \"Hi there!\" }\n"
+    "- question → answer → { \"question\": \"the user's question\" } (anything else)\n\n"
+    "Examples:\n"
+    "- turn it up -> { \"intent\": \"music_control\", \"action\": \"spotify_command\", \"parameters\": { \"command\": \"volume up\" } }\n"
+    "- open youtube -> { \"intent\": \"open_website\", \"action\": \"navigate\", \"parameters\": { \"url\": \"https://youtube.com\" } }\n"
+    "- search for dogs -> { \"intent\": \"search\", \"action\": \"search_google\", \"parameters\": { \"query\": \"dogs\" } }\n"
+    "- weather in Paris -> { \"intent\": \"get_weather\", \"action\": \"fetch_weather\", \"parameters\": { \"location\": \"Paris\" } }\n"
+    "- put on despacito -> { \"intent\": \"play_music\", \"action\": \"play_song\", \"parameters\": { \"song\": \"Despacito\" } }\n"
+    "- open spotify -> { \"intent\": \"launch_app\", \"action\": \"open_application\", \"parameters\": { \"app_name\": \"spotify\" } }\n"
+    "- message John saying hi -> { \"intent\": \"send_message\", \"action\": \"send_text\", \"parameters\": { \"recipient\": \"John\", \"message\": \"hi\" } }\n"
+    "- how far away is the moon -> { \"intent\": \"question\", \"action\": \"answer\", \"parameters\": { \"question\": \"how far away is the moon\" } }\n\n"
+    "Do NOT provide any reasoning, do NOT explain. Just output the JSON object."
+)
+
+
+def extract_intent(text, model=INTENT_MODEL):
+    """
+    Ask the LLM to turn an utterance into an intent JSON object.
+
+    Args:
+        text (str): The user's utterance
+        model (str): Ollama model name
+
+    Returns:
+        dict | None: {"intent", "action", "parameters"}, or None if the reply was unusable
+    """
+    with tracer.span("llm.intent"):
+        response = ollama.chat(model=model, format="json", messages=[
+            {"role": "system", "content": INTENT_SYSTEM_PROMPT},
+            {"role": "user", "content": text},
+        ])
+    try:
+        intent = json.loads(response["message"]["content"].strip())
+    except json.JSONDecodeError as e:
+        logger.warning(f"LLM returned invalid intent JSON for '{text}': {e}")
+        return None
+    if not isinstance(intent, dict) or "action" not in intent:
+        logger.warning(f"LLM intent for '{text}' has no action: {intent}")
+        return None
+    intent.setdefault("parameters", {})
+    return intent
+
+
+class LLMIntentRouter:
+    """
+    LLM intent extraction for utterances the rule router does not match, memoized by
+    normalized utterance with a TTL.
+
+    A phrasing the rules miss ("crank it up", "put on despacito") costs one LLM call;
+    repeats within the TTL reuse the stored intent. Unparseable replies are cached for
+    a short time so the same utterance does not hammer the model.
+    """
+
+    def __init__(self, extract=extract_intent, ttl=INTENT_TTL, failed_ttl=FAILED_INTENT_TTL,
+                 capacity=INTENT_CACHE_SIZE):
+        """
+        Args:
+            extract (callable): extract(text) -> intent dict or None
+            ttl (float): Seconds a resolved intent stays valid
+            failed_ttl (float): Seconds an unresolved utterance is not retried
+            capacity (int): Maximum number of memoized utterances
+        """
+        self.extract = extract
+        self.ttl = ttl
+        self.failed_ttl = failed_ttl
+        self.capacity = capacity
+        self._cache = OrderedDict()  # key -> (intent or None, expires at)
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.llm_seconds = 0.0
+
+    def resolve(self, text):
+        """
+        Get the intent for an utterance, calling the LLM only on a cache miss.
+
+        Returns:
+            dict | None: Intent JSON, or None if the LLM could not produce one
+        """
+        key = normalize_transcript(text)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return cached[0]
+                del self._cache[key]
+                self.expired += 1
+            self.misses += 1
+
+        started = time.monotonic()
+        try:
+            intent = self.extract(text)
+        except Exception as e:
+            logger.error(f"LLM intent extraction failed for '{text}': {e}")
+            intent = None
+        self.llm_seconds += time.monotonic() - started
+
+        ttl = self.ttl if intent is not None else self.failed_ttl
+        with self._lock:
+            self._cache[key] = (intent, time.monotonic() + ttl)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        logger.info(f"LLM intent for '{text}': {intent} ({(time.monotonic() - started) * 1000:.0f} ms)")
+        return intent
+
+    def invalidate(self, text=None):
+        """Forget one utterance, or everything when text is None."""
+        with self._lock:
+            if text is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(normalize_transcript(text), None)
+
+    def stats(self):
+        """
+        Get memoization counters.
+
+        Returns:
+            dict: Size, hits, misses, hit rate, expirations and total LLM seconds
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "llm_seconds": self.llm_seconds,
+        }
+
+
+def rule_command(intent):
+    """
+    Translate an LLM intent into the equivalent rule-router phrase, if there is one.
+
+    {"action": "spotify_command", "parameters": {"command": "volume up"}} -> "volume up"
+
+    Returns:
+        str | None: A phrase CommandProcessor can route, or None
+    """
+    action = intent.get("action")
+    params = intent.get("parameters") or {}
+    if action == "spotify_command" and params.get("command"):
+        return str(params["command"]).lower()
+    if action == "play_song" and params.get("song"):
+        return f"play {params['song']} {params.get('artist', '')}".strip().lower()
+    if action == "play_artist" and params.get("artist"):
+        return f"artist {params['artist']}".lower()
+    return None
+
+
+def answer_question(question, model=INTENT_MODEL):
+    """Ask the LLM a free-form question and print the answer."""
+    response = ollama.chat(model=model, messages=[{"role": "user", "content": question}])
+    print(f"Assistant: {response['message']['content']}")
+
+
+def fetch_weather(location):
+    """Print current conditions from OpenWeatherMap, or open a weather search without an API key."""
+    if WEATHER_API_KEY.startswith("your_"):
+        webbrowser.open(f"https://www.google.com/search?q=weather+in+{location}")
+        print(f"Weather for {location}")
+        return
+    url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={WEATHER_API_KEY}&units=metric"
+    try:
+        res = requests.get(url, timeout=5)
+        data = res.json()
+        if res.status_code == 200:
+            print(f"{location.title()}: {data['main']['temp']}°C, {data['weather'][0]['description']}")
+        else:
+            print(f"Weather error: {data.get('message', 'Unknown error')}")
+    except Exception as e:
+        print(f"Weather fetch failed: {e}")
+
+
+def launch_application(app_name):
+    """
+    Open an application from the KNOWN_APPLICATIONS allowlist.
+
+    Names come from the LLM or the local classifier on the always-on microphone path,
+    so anything not on the list is refused rather than passed to the shell.
+
+    Returns:
+        bool: True if the application was launched
+    """
+    name = str(app_name).strip()
+    application = KNOWN_APPLICATIONS.get(name.lower())
+    if application is None and name in KNOWN_APPLICATIONS.values():
+        application = name
+    if application is None:
+        logger.warning(f"Refusing to launch unknown application: {name!r}")
+        print(f"'{name}' is not an application I can open")
+        return False
+    try:
+        if platform.system() == "Darwin":
+            subprocess.Popen(["open", "-a", application])
+        else:
+            subprocess.Popen([application])
+        print(f"Launching application: {application}")
+        return True
+    except Exception as e:
+        print(f"Failed to launch application: {e}")
+        return False
+
+
+def execute_intent(intent):
+    """
+    Run an LLM intent outside the assistant's own handlers.
+
+    main.py sends Spotify intents through the rule router and questions to its streaming
+    chat, so play_song, play_artist, spotify_command and answer only arrive here from
+    the LLM_Template REPL, which has no Spotify session.
+
+    Returns:
+        bool: True if the action was recognized and run
+    """
+    if not intent or "action" not in intent:
+        print("Invalid or missing action or parameters.")
+        return False
+
+    action = intent["action"]
+    params = intent.get("parameters") or {}
+
+    if action == "navigate" and "url" in params:
+        webbrowser.open(params["url"])
+        print(f"Opening {params['url']}")
+
+    elif action == "search_google" and "query" in params:
+        webbrowser.open(f"https://www.google.com/search?q={params['query']}")
+        print(f"Searching Google: {params['query']}")
+
+    elif action == "fetch_weather" and "location" in params:
+        fetch_weather(params["location"])
+
+    elif action == "fetch_news":
+        topic = params.get("topic", "world")
+        webbrowser.open(f"https://news.google.com/search?q={topic}")
+        print(f"Opening news for topic: {topic}")
+
+    elif action == "open_application" and "app_name" in params:
+        return launch_application(params["app_name"])
+
+    elif action in ("play_song", "play_artist") and ("song" in params or "artist" in params):
+        query = f"{params.get('song', '')} {params.get('artist', '')}".strip()
+        webbrowser.open(f"https://www.youtube.com/results?search_query={query}")
+        print(f"Playing: {query}")
+
+    elif action == "spotify_command" and "command" in params:
+        print(f"Music command '{params['command']}' needs the voice assistant's Spotify session")
+
+    elif action == "answer":
+        answer_question(params.get("question", ""))
+
+    elif action == "send_text" and "recipient" in params and "message" in params:
+        # Stub for sending a message; integrate a messaging API here
+        print(f"Sending message to {params['recipient']}: {params['message']}")
+
+    else:
+        print("Unknown action or missing data.")
+        return False
+    return True
@@ -1,5 +1,6 @@
 import speech_recognition as sr
 import ollama
+import asyncio
 import threading
 import itertools
 import sys
@@ -11,15 +12,71 @@ import pyautogui
 import pygame
 import logging
 import re
+import functools
 from logger import logger
 
 # Custom Built Functions 
 from playBusyWaitAudio import play_busy_wait_audioMusic
-from spotify_command_handler import SpotifyCommandHandler
+from spotify_command_handler import SpotifyCommandHandler, COALESCED_OPERATIONS
+from speech_backends import create_backend, SAMPLE_RATE, MAX_ALTERNATIVES
+from vosk_model_manager import model_manager
+from command_grammar import build_command_grammar
+from library_vocabulary import LibraryVocabulary
+from asr_worker import ASRWorker
+from hypothesis_rescoring import HypothesisRescorer
+from voice_activity import VoiceActivityDetector, VAD_FRAME_MS, VAD_HANGOVER_FRAMES
+from capture_frontend import Resampler
+from endpointing import AdaptiveEndpointer
+from early_dispatch import PartialCommandDispatcher
+from command_router import build_command_router
+from plan_cache import PlanCache, ExecutionPlan, normalize_transcript
+from command_executor import CommandExecutor
+from command_scheduler import CommandScheduler, CONTROL, NORMAL, BACKGROUND
+from command_coalescer import CommandCoalescer, COALESCE_GROUPS, repetitions
+from cancellation import active_requests, CancellationToken
+from async_runtime import AssistantRuntime
+from llm_intents import LLMIntentRouter, rule_command, execute_intent
+from intent_classifier import IntentClassifier
+from tracing import tracer
+
+try:
+    from newSpeachAI import SpeechStream
+except ImportError:  # Spoken answers need the murf package and Murf_API_key in config
+    SpeechStream = None
 
 # Global flags and queues
-stop_speaking = False  # Still used for stopping busy wait audio
-command_queue = queue.Queue()
+command_queue = CommandScheduler()  # Priority queue: control commands jump ahead, stale ones are superseded
+listener_stop = threading.Event()  # Set at shutdown so listener loops exit
+library_vocabulary = LibraryVocabulary()  # Spoken names from the user's Spotify library
+plan_cache = PlanCache()  # Transcript -> resolved execution plan for repeated phrases
+library_vocabulary.subscribe(plan_cache.on_library_change)
+command_coalescer = CommandCoalescer(COALESCED_OPERATIONS)  # Merges bursts of volume/seek/skip commands
+llm_intent_router = LLMIntentRouter()  # Fallback for utterances the rule router does not match
+intent_classifier = IntentClassifier()  # Local n-gram intent model tried before the LLM
+
+# Listener settings
+PERSISTENT_MICROPHONE = True  # Keep one input stream open instead of reopening per command
+CALIBRATION_DURATION = 1.0  # seconds of ambient noise sampled once at startup
+NOISE_FLOOR_DAMPING = 0.15  # lower values track changes in the noise floor faster
+ASR_BACKEND = "google"  # "google" (online), "vosk" or "vosk-grammar" (offline, streaming)
+STREAM_CHUNK = 1600  # samples per frame read in streaming mode (100 ms at 16 kHz)
+USE_VAD = True  # Gate the raw stream so only speech segments reach the recognizer
+PAUSE_THRESHOLD = 0.8  # silence ending a phrase when no endpointer decides (speech_recognition's default)
+EARLY_DISPATCH = True  # Dispatch argument-free commands from stable partial results
+ADAPTIVE_ENDPOINTING = True  # Pick the end-of-speech silence window from the partial transcript
+NBEST_RESCORING = True  # Request n-best hypotheses and pick the one that parses best
+ASR_WORKER_PROCESS = False  # Capture and decode in separate processes (offline backends only)
+WORKER_STATS_INTERVAL = 30  # seconds between ASR worker health log lines
+CONCURRENT_EXECUTION = True  # Run commands on per-domain workers so slow ones don't block others
+COALESCE_RELATIVE_COMMANDS = True  # Merge bursts of volume/seek/skip into one Spotify operation
+ASYNC_RUNTIME = True  # Event-driven asyncio core instead of the polling command thread
+HYBRID_ROUTING = True  # Send utterances the rules miss to the LLM intent extractor (memoized with a TTL)
+LOCAL_INTENTS = True  # Classify unmatched utterances locally first; only low-confidence ones reach the LLM
+LOCAL_INTENT_MEMO = 64  # recent phrases whose local intent is kept, so scheduling and planning classify once
+TRACING = True  # Per-utterance latency spans; stage percentiles logged and Chrome trace written at exit
+SPEAK_RESPONSES = True  # Speak LLM answers sentence by sentence while they are still streaming
+BUSY_WAIT_AUDIO = True  # Play a short music clip while waiting for the LLM's first token
+tracer.enabled = TRACING
 
 class CommandProcessor:
     """Handles processing and execution of voice commands."""
@@ -30,60 +87,256 @@ class CommandProcessor:
         "open finder": lambda _: os.system("open /System/Library/CoreServices/Finder.app"),
     }
     
+    # Every keyword compiled into one word-boundary router with explicit priorities
+    ROUTER = build_command_router(SYSTEM_COMMANDS, SpotifyCommandHandler.SPOTIFY_COMMANDS)
+    
+    # speech_dispatch(label, action) plays spoken answers on the TTS worker (set when an executor runs)
+    speech_dispatch = None
+    
+    # Spotify commands that jump ahead of queued work
+    CONTROL_KEYWORDS = ("pause", "resume", "volume up", "volume down")
+    
+    # Relative Spotify commands where every repetition counts (they are coalesced, not superseded)
+    CUMULATIVE_KEYWORDS = tuple(COALESCE_GROUPS)
+    
+    @staticmethod
+    def route(command):
+        """
+        Decide how a voice command should be handled without executing it.
+        
+        Args:
+            command (str): The user's voice command as text
+        
+        Returns:
+            tuple: (str, callable) - Intent name and a no-argument function that runs it
+                (None for "exit" and unrecognized commands)
+        """
+        match = CommandProcessor.ROUTER.match(command)
+        
+        if match.intent == "stop":
+            return "stop", CommandProcessor._stop_audio
+            
+        if match.intent == "spotify":
+            return "spotify", lambda: SpotifyCommandHandler.handle_command(command, match)
+            
+        if match.intent in CommandProcessor.SYSTEM_COMMANDS:
+            func = CommandProcessor.SYSTEM_COMMANDS[match.intent]
+            return match.intent, lambda: CommandProcessor._run_system_command(match.intent, func)
+            
+        if match.intent == "llm":
+            return "llm", lambda: CommandProcessor._chat_with_llm(command)
+            
+        # "exit" and unrecognized commands have no action
+        return match.intent, None
+    
+    @staticmethod
+    def plan(command):
+        """
+        Get the execution plan for a command, from the plan cache when possible.
+        
+        Args:
+            command (str): The user's voice command as text
+        
+        Returns:
+            ExecutionPlan: Intent, action and whether the plan depends on the library
+        """
+        plan = plan_cache.get(command)
+        if plan is not None:
+            return plan
+        
+        match = CommandProcessor.ROUTER.match(command)
+        if match.intent == "spotify" and COALESCE_RELATIVE_COMMANDS and match.keyword in COALESCE_GROUPS:
+            count = repetitions(command, match.keyword)
+            plan = ExecutionPlan("spotify", lambda: command_coalescer.add(match.keyword, count), False)
+        elif match.intent == "spotify":
+            action, library_dependent = SpotifyCommandHandler.plan(command, match)
+            plan = ExecutionPlan("spotify", action, library_dependent)
+        else:
+            intent, action = CommandProcessor.route(command)
+            if intent == "unrecognized" and HYBRID_ROUTING:
+                local = CommandProcessor._local_intent(command)
+                phrase = CommandProcessor._rule_phrase(local)
+                if phrase:
+                    # Confident local intent the rules can handle ("crank it up" -> "volume up")
+                    logger.info(f"Understood '{command}' as '{phrase}'")
+                    plan = CommandProcessor.plan(phrase)
+                elif local and local["action"] == "answer":
+                    question = local["parameters"]["question"]
+                    intent, action = "llm", lambda: CommandProcessor._chat_with_llm(question)
+                elif local:
+                    intent, action = "system", lambda: execute_intent(local)
+                else:
+                    # Rules and the local classifier missed: ask the LLM on the LLM worker
+                    intent, action = "llm", lambda: CommandProcessor._run_llm_intent(command)
+            if plan is None:
+                plan = ExecutionPlan(intent, action, False)
+        
+        if plan.action is not None:
+            plan_cache.put(command, plan)
+        return plan
+    
+    @staticmethod
+    def schedule(command):
+        """
+        Get the scheduling class of a command.
+        
+        Args:
+            command (str): The user's voice command as text
+        
+        Returns:
+            tuple: (int, hashable) - CONTROL/NORMAL/BACKGROUND priority and a supersede key
+                (None if the command must not replace an earlier one still queued)
+        """
+        match = CommandProcessor.ROUTER.match(command)
+        if match.intent in ("stop", "exit"):
+            return CONTROL, None
+        if match.intent == "unrecognized" and HYBRID_ROUTING:
+            phrase = CommandProcessor._rule_phrase(CommandProcessor._local_intent(command))
+            if phrase:
+                return CommandProcessor.schedule(phrase)
+        if match.intent in ("llm", "unrecognized"):
+            return BACKGROUND, None
+        if match.intent == "spotify":
+            priority = CONTROL if match.keyword in CommandProcessor.CONTROL_KEYWORDS else NORMAL
+            if match.keyword in CommandProcessor.CUMULATIVE_KEYWORDS:
+                return priority, None
+            return priority, ("spotify", match.keyword)
+        return NORMAL, (match.intent, match.keyword)
+    
+    @staticmethod
+    def domain(intent):
+        """
+        Get the executor domain for an intent.
+        
+        Returns:
+            str: "spotify", "llm" or "system", or None for intents that run inline ("stop")
+        """
+        if intent in ("spotify", "llm"):
+            return intent
+        if intent == "system" or intent in CommandProcessor.SYSTEM_COMMANDS:
+            return "system"
+        return None
+    
     @staticmethod
-    def process_command(command):
+    def process_command(command, executor=None):
         """
         Process and execute a voice command.
         
         Args:
             command (str): The user's voice command as text
+            executor (CommandExecutor, optional): Per-domain workers to run the command on;
+                without one the command runs to completion here
         
         Returns:
             bool: True if program should exit, False otherwise
         """
         try:
+            trace = tracer.resume(command)
             command = command.lower().strip()
-            logger.info(f"Processing command: {command}")
+            logger.info(f"Processing command: {command}" + (f" (utterance {trace.id})" if trace else ""))
+            
+            with tracer.activate(trace), tracer.span("route"):
+                intent, action, _ = CommandProcessor.plan(command)
+            logger.debug(f"Plan cache: {plan_cache.stats()}")
             
-            # Handle exit command
-            if "exit" in command or "quit" in command:
+            if intent == "exit":
                 print("Exiting program")
                 return True
                 
-            # Handle stop command
-            if "stop" in command:
-                global stop_speaking
-                stop_speaking = True
-                print("Stopping audio")
+            if action is None:
+                print(f"Unrecognized command: '{command}'")
                 return False
-                
-            # Handle Spotify commands
-            if SpotifyCommandHandler.is_spotify_command(command):
-                SpotifyCommandHandler.handle_command(command)
-                return False
-                
-            # Handle system commands
-            for cmd, func in CommandProcessor.SYSTEM_COMMANDS.items():
-                if cmd in command:
-                    print(f"Executing: {cmd}")
-                    func(None)
-                    return False
-                    
-            # Handle LLM queries
-            if "what is" in command or "tell me about" in command:
-                CommandProcessor._chat_with_llm(command)
-                return False
-                
-            # Unrecognized command
-            print(f"Unrecognized command: '{command}'")
+            
+            domain = CommandProcessor.domain(intent)
+            action = tracer.bind(action, f"execute.{domain or intent}", trace)
+            if executor is not None and domain is not None:
+                priority, key = CommandProcessor.schedule(command)
+                executor.submit(domain, action, command, priority, key)
+            else:
+                action()
             return False
             
         except Exception as e:
             logger.error(f"Error processing command '{command}': {e}")
             print(f"Error processing command: {str(e)}")
             return False
+    
+    @staticmethod
+    def _stop_audio():
+        """Cancel every in-flight request (LLM generation, speech and busy-wait audio)."""
+        active_requests.cancel_all("stop command")
+        print("Stopping audio")
+    
+    @staticmethod
+    def _run_system_command(cmd, func):
+        """Run one of the SYSTEM_COMMANDS."""
+        print(f"Executing: {cmd}")
+        func(None)
 
     
+    @staticmethod
+    def _local_intent(command):
+        """
+        Classify an unmatched command with the local intent model.
+        
+        The listener (schedule), plan and process_command's schedule all ask about the
+        same command, so the model runs once per phrase and its counters count each
+        phrase once (see _classify).
+        
+        Returns:
+            dict: Intent JSON in the LLM's format, or None if the model is not confident
+        """
+        if not LOCAL_INTENTS:
+            return None
+        return CommandProcessor._classify(normalize_transcript(command))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=LOCAL_INTENT_MEMO)
+    def _classify(command):
+        """Run the local intent model on a normalized command (memoized until it learns)."""
+        prediction = intent_classifier.predict(command)
+        if not intent_classifier.is_confident(prediction):
+            logger.debug(f"Local intent for '{command}' not confident: {prediction}")
+            return None
+        return prediction.intent
+    
+    @staticmethod
+    def _rule_phrase(intent):
+        """Get the rule-router phrase for an intent, or None if the rules cannot run it."""
+        phrase = rule_command(intent) if intent else None
+        if phrase and CommandProcessor.ROUTER.match(phrase).intent != "unrecognized":
+            return phrase
+        return None
+    
+    @staticmethod
+    def _run_llm_intent(command):
+        """Resolve an unmatched command with the LLM intent extractor and carry it out."""
+        intent = llm_intent_router.resolve(command)
+        logger.debug(f"LLM intent cache: {llm_intent_router.stats()}")
+        if intent is None:
+            print(f"Unrecognized command: '{command}'")
+            return
+        
+        # Keep the LLM's answer as a training example so the phrasing is handled locally next time
+        if LOCAL_INTENTS and intent_classifier.learn(command, intent):
+            plan_cache.invalidate(command)
+            CommandProcessor._classify.cache_clear()  # Refit: earlier predictions may change
+            logger.debug(f"Intent classifier: {intent_classifier.stats()}")
+        
+        # Intents the rules can handle go back through the queue to their own domain
+        phrase = CommandProcessor._rule_phrase(intent)
+        if phrase:
+            print(f"Understood '{command}' as '{phrase}'")
+            priority, key = CommandProcessor.schedule(phrase)
+            command_queue.put(tracer.handoff(phrase), priority, key)
+            return
+        
+        if intent.get("action") == "answer":
+            CommandProcessor._chat_with_llm((intent.get("parameters") or {}).get("question") or command)
+            return
+        
+        execute_intent(intent)
+    
     @staticmethod
     def _spinning_cursor(stop_event):
         """Display a spinning cursor while the LLM is thinking."""
@@ -96,68 +349,404 @@ class CommandProcessor:
     
     @staticmethod
     def _chat_with_llm(text):
-        """Send a query to the LLM and display the response."""
-        try:
+        """
+        Send a query to the LLM and stream the response, stopping early if cancelled.
+        
+        With SPEAK_RESPONSES, every sentence is handed to text-to-speech as soon as it is
+        complete, so the answer starts playing after the first sentence instead of after
+        the whole response. With BUSY_WAIT_AUDIO, a clip plays until the first token
+        arrives, the request ends or it is cancelled.
+        """
+        with active_requests.track(text) as token:
             stop_event = threading.Event()
             spinner_thread = threading.Thread(target=CommandProcessor._spinning_cursor, args=(stop_event,))
             spinner_thread.start()
-            
-            response = ollama.chat(model="llama3.2", messages=[{"role": "user", "content": text}])
-            
-            stop_event.set()
-            spinner_thread.join()
-            
-            response_text = response["message"]["content"]
-            print("\nAssistant:", response_text)
-            
-        except Exception as e:
-            logger.error(f"Error communicating with LLM: {e}")
-            print(f"Error getting response: {str(e)}")
+            busy_wait = CancellationToken("busy wait audio")
+            token.on_cancel(lambda: busy_wait.cancel(token.reason))  # "stop" silences the clip too
+            if BUSY_WAIT_AUDIO:
+                threading.Thread(target=play_busy_wait_audioMusic, args=(busy_wait,), daemon=True).start()
+            stream = None
+            speech = None
+            started = time.perf_counter()
+            try:
+                if SPEAK_RESPONSES and SpeechStream is not None:
+                    speech = SpeechStream(token=token, started=started, dispatch=CommandProcessor.speech_dispatch)
+                stream = ollama.chat(model="llama3.2", messages=[{"role": "user", "content": text}], stream=True)
+                
+                response_text = ""
+                for chunk in stream:
+                    if token.cancelled:
+                        break
+                    if not stop_event.is_set():
+                        tracer.record("llm.first_token", started)
+                        busy_wait.cancel("first token")
+                        stop_event.set()
+                        spinner_thread.join()
+                        print("\nAssistant: ", end="", flush=True)
+                    piece = chunk["message"]["content"]
+                    response_text += piece
+                    print(piece, end="", flush=True)
+                    if speech is not None:
+                        speech.feed(piece)
+                print()
+                
+                if token.cancelled:
+                    print("Response stopped")
+                
+            except Exception as e:
+                logger.error(f"Error communicating with LLM: {e}")
+                print(f"Error getting response: {str(e)}")
+            finally:
+                tracer.record("llm", started)
+                # Closing the stream drops the HTTP connection so generation stops server-side
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+                busy_wait.cancel("request finished")
+                stop_event.set()
+                spinner_thread.join()
+                if speech is not None:
+                    # Returns once the last sentence is queued when playback runs on the TTS worker
+                    speech.close()
+
+
+def _command_key(text):
+    """Return what the router runs for a transcript ("next song" and "next" are the same command)."""
+    match = CommandProcessor.ROUTER.match(text)
+    return match.intent, match.keyword, match.argument
+
+
+def _library_argument(text):
+    """Return the song/playlist/artist argument the router finds in a transcript, or None."""
+    match = CommandProcessor.ROUTER.match(text)
+    return match.argument if match.intent == "spotify" else None
+
+
+# Rescores n-best ASR hypotheses against the command router and library names
+hypothesis_rescorer = HypothesisRescorer(CommandProcessor.route, library_vocabulary.names,
+                                         known=plan_cache.contains, argument=_library_argument)
+
+
+def _begin_utterance(speech_started=None):
+    """Start the utterance's trace, recording capture from its first speech frame to now."""
+    tracer.start_trace(started=speech_started)
+    if speech_started is not None:
+        tracer.record("capture", speech_started)
+
+
+def _transcribe(backend, audio=None, speech_started=None):
+    """
+    Get the transcript for a finished utterance, rescoring n-best hypotheses if enabled.
+    
+    Args:
+        backend (SpeechBackend): Backend that captured the utterance
+        audio (sr.AudioData, optional): Complete capture for utterance-level backends;
+            streaming backends finish the audio they were already fed
+        speech_started (float, optional): perf_counter time of the first speech frame
+            (derived from the audio length when omitted)
+    
+    Returns:
+        str: The chosen transcript
+    """
+    if speech_started is None and audio is not None:
+        speech_started = time.perf_counter() - len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    _begin_utterance(speech_started)
+    
+    with tracer.span("asr", backend=backend.name):
+        if not NBEST_RESCORING:
+            return backend.transcribe(audio) if audio is not None else backend.final_text()
+        
+        if audio is not None:
+            alternatives = backend.transcribe_alternatives(audio)
+        else:
+            alternatives = backend.final_alternatives()
+        return hypothesis_rescorer.best(alternatives)
+
+
+def _queue_command(command):
+    """Put a recognized command on the queue, flagging stop requests immediately."""
+    if not command:
+        return
+    
+    print(f"\nDetected: {command}")
+    
+    if CommandProcessor.ROUTER.match(command).intent == "stop":
+        # Cancel right away instead of waiting for the command to be scheduled
+        active_requests.cancel_all("stop command")
+        print("Stop command detected!")
+    
+    priority, key = CommandProcessor.schedule(command)
+    command_queue.put(tracer.handoff(command), priority, key)
 
 
 def background_listener():
     """Listen for voice commands in the background and add them to the command queue."""
+    if ASR_WORKER_PROCESS:
+        worker_listener()
+        return
+    
+    if PERSISTENT_MICROPHONE:
+        persistent_listener()
+        return
+    
     recognizer = sr.Recognizer()
+    backend = create_backend("google", recognizer=recognizer)
     
-    while True:
+    while not listener_stop.is_set():
         try:
             with sr.Microphone() as source:
                 print("Listening in background...")
                 recognizer.adjust_for_ambient_noise(source)
                 audio = recognizer.listen(source)
 
-            try:
-                command = recognizer.recognize_google(audio).lower()
-                print(f"\nDetected: {command}")
-                
-                if "stop" in command:
-                    global stop_speaking
-                    stop_speaking = True
-                    print("Stop command detected!")
-                
-                command_queue.put(command)
-                
-            except sr.UnknownValueError:
-                pass
-            except sr.RequestError as e:
-                logger.error(f"Google Speech Recognition service error: {e}")
-                print(f"Could not request results; {e}")
+            _queue_command(_transcribe(backend, audio))
                 
+        except sr.RequestError as e:
+            logger.error(f"Google Speech Recognition service error: {e}")
+            print(f"Could not request results; {e}")
         except Exception as e:
             logger.error(f"Error in background listener: {e}")
             print(f"Listener error: {str(e)}")
             time.sleep(1)  # Prevent rapid error loops
 
+
+def persistent_listener(backend_name=None):
+    """
+    Listen for voice commands over a single microphone stream for the whole session.
+    
+    The ambient noise level is calibrated once when the stream opens. After that the
+    noise floor follows the room using the non-speech frames already read while waiting
+    for a phrase, so no per-command calibration or stream setup is needed. With USE_VAD
+    (the default) or a streaming backend, the VAD holds the floor (see _stream_to_backend);
+    otherwise the recognizer's dynamic energy threshold does.
+    
+    Args:
+        backend_name (str, optional): Speech backend to use (defaults to ASR_BACKEND)
+    """
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = True
+    recognizer.dynamic_energy_adjustment_damping = NOISE_FLOOR_DAMPING
+    
+    backend = _create_listener_backend(backend_name or ASR_BACKEND, recognizer)
+    
+    while not listener_stop.is_set():
+        try:
+            if backend.streaming or USE_VAD:
+                vad, endpointer = _create_vad(backend, recognizer.pause_threshold) if USE_VAD else (None, None)
+                _stream_to_backend(backend, vad, endpointer)
+                continue
+            
+            with sr.Microphone() as source:
+                print("Calibrating microphone...")
+                recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_DURATION)
+                logger.info(f"Microphone calibrated, energy threshold: {recognizer.energy_threshold:.1f}")
+                print("Listening in background...")
+                
+                while not listener_stop.is_set():
+                    audio = recognizer.listen(source)
+                    logger.debug(f"Noise floor threshold now {recognizer.energy_threshold:.1f}")
+                    try:
+                        _queue_command(_transcribe(backend, audio))
+                    except sr.RequestError as e:
+                        logger.error(f"Google Speech Recognition service error: {e}")
+                        print(f"Could not request results; {e}")
+                    
+        except Exception as e:
+            # Only reopen (and recalibrate) the stream when it actually failed
+            logger.error(f"Error in persistent listener: {e}")
+            print(f"Listener error: {str(e)}")
+            time.sleep(1)  # Prevent rapid error loops
+
+
+def worker_listener(backend_name=None):
+    """
+    Queue commands transcribed by an ASR worker process.
+    
+    Capture and decoding run in their own processes (see asr_worker.ASRWorker), so slow
+    commands, LLM calls or TTS in this process cannot delay the audio path.
+    
+    Args:
+        backend_name (str, optional): Offline speech backend to run (defaults to ASR_BACKEND)
+    """
+    backend_name = backend_name or ASR_BACKEND
+    backend_kwargs = {}
+    if backend_name == "vosk-grammar":
+        # The worker gets a snapshot of the grammar; library changes apply on restart
+        library_vocabulary.refresh()
+        library_phrases = library_vocabulary.phrases()
+        backend_kwargs = {
+            "phrases": build_command_grammar(SpotifyCommandHandler.SPOTIFY_COMMANDS,
+                                             CommandProcessor.SYSTEM_COMMANDS,
+                                             library_phrases=library_phrases),
+            "known_phrases": library_phrases,
+        }
+    
+    worker = ASRWorker(backend_name, backend_kwargs)
+    worker.start()
+    print(f"Listening in background ({backend_name} worker process)...")
+    
+    last_stats = time.monotonic()
+    try:
+        while not listener_stop.is_set():
+            _queue_command(worker.get_transcript(timeout=WORKER_STATS_INTERVAL))
+            
+            if time.monotonic() - last_stats >= WORKER_STATS_INTERVAL:
+                last_stats = time.monotonic()
+                logger.info(f"ASR worker stats: {worker.stats()}")
+    except Exception as e:
+        logger.error(f"Error in worker listener: {e}")
+        print(f"Listener error: {str(e)}")
+    finally:
+        worker.stop()
+
+
+def _create_listener_backend(backend_name, recognizer):
+    """Create the speech backend for the listener, wiring in what each one needs."""
+    if NBEST_RESCORING or backend_name == "vosk-grammar":
+        # Library names are used for rescoring and for the command grammar
+        library_vocabulary.refresh()
+        library_vocabulary.start_auto_refresh()
+    
+    if backend_name == "google":
+        # Share the calibrated recognizer so its noise floor tracking is kept
+        return create_backend(backend_name, recognizer=recognizer)
+    if backend_name == "vosk-grammar":
+        # Grammar generated from the same tables the command processor routes with,
+        # plus the names in the user's library so song and artist arguments are known
+        def library_grammar(vocabulary):
+            library_phrases = vocabulary.phrases()
+            phrases = build_command_grammar(SpotifyCommandHandler.SPOTIFY_COMMANDS,
+                                            CommandProcessor.SYSTEM_COMMANDS,
+                                            library_phrases=library_phrases)
+            return phrases, library_phrases
+        
+        phrases, library_phrases = library_grammar(library_vocabulary)
+        backend = create_backend(backend_name, phrases=phrases, known_phrases=library_phrases)
+        library_vocabulary.subscribe(lambda vocabulary: backend.update_grammar(*library_grammar(vocabulary)))
+        return backend
+    if backend_name == "vosk" and NBEST_RESCORING:
+        return create_backend(backend_name, max_alternatives=MAX_ALTERNATIVES)
+    return create_backend(backend_name)
+
+
+def _create_vad(backend, pause_threshold=PAUSE_THRESHOLD):
+    """
+    Create the VAD gate for a backend, plus an adaptive endpointer when it can use one.
+    
+    The endpointer needs partial transcripts, so it is only used with streaming backends.
+    The VAD hangover and the backend's own endpoint detection (Kaldi's trailing-silence
+    rule for Vosk) are then stretched past the longest endpoint window, leaving the
+    end-of-speech decision to the endpointer. Without one, the end of a VAD segment ends
+    the utterance, so the hangover is kept at least as long as the pause listen() would
+    wait; a shorter one splits sentences at every breath.
+    
+    Args:
+        backend (SpeechBackend): Recognizer the gated audio is fed to
+        pause_threshold (float, optional): Seconds of silence that end a phrase without an endpointer
+    
+    Returns:
+        tuple: (VoiceActivityDetector, AdaptiveEndpointer or None)
+    """
+    if not (ADAPTIVE_ENDPOINTING and backend.streaming):
+        hangover_frames = max(VAD_HANGOVER_FRAMES, int(pause_threshold * 1000 / VAD_FRAME_MS))
+        return VoiceActivityDetector(sample_rate=SAMPLE_RATE, hangover_frames=hangover_frames), None
+    
+    endpointer = AdaptiveEndpointer(SpotifyCommandHandler.STANDALONE_COMMANDS + ("stop", "exit", "quit"))
+    if not backend.defer_endpoint(endpointer.max_silence):
+        logger.warning(f"'{backend.name}' cannot delay its own endpoint detection; "
+                       f"utterances may end before the adaptive endpointer decides")
+    hangover_frames = int(endpointer.max_silence * 1000 / VAD_FRAME_MS) + 1
+    return VoiceActivityDetector(sample_rate=SAMPLE_RATE, hangover_frames=hangover_frames), endpointer
+
+
+def _stream_to_backend(backend, vad=None, endpointer=None):
+    """
+    Feed raw microphone frames to a backend, queueing each finished utterance.
+    
+    Args:
+        backend (SpeechBackend): Recognizer to feed
+        vad (VoiceActivityDetector, optional): Gate that drops non-speech frames; the end
+            of a VAD segment also ends the utterance for backends without an endpointer
+        endpointer (AdaptiveEndpointer, optional): Ends the utterance after a silence window
+            chosen from the partial transcript (requires vad)
+    
+    With EARLY_DISPATCH enabled, streaming backends also queue argument-free commands
+    as soon as their partial hypothesis is stable, and the matching final is dropped.
+    """
+    dispatcher = None
+    if EARLY_DISPATCH and backend.streaming:
+        dispatcher = PartialCommandDispatcher(SpotifyCommandHandler.STANDALONE_COMMANDS + ("stop",), key=_command_key)
+    
+    # Open the device at its native rate and convert to 16 kHz here, instead of relying
+    # on the audio driver's resampler (which may alias or not support 16 kHz at all)
+    microphone = sr.Microphone()
+    microphone.CHUNK = int(microphone.SAMPLE_RATE * STREAM_CHUNK / SAMPLE_RATE)
+    resampler = Resampler(microphone.SAMPLE_RATE, 1, SAMPLE_RATE, block_frames=microphone.CHUNK)
+    with microphone as source:
+        logger.info(f"Microphone opened at {source.SAMPLE_RATE} Hz"
+                    + ("" if resampler.passthrough else f", resampling to {SAMPLE_RATE} Hz"))
+        if vad:
+            # Calibrate once per stream; the VAD then tracks the noise floor on its own
+            print("Calibrating microphone...")
+            blocks = max(1, round(CALIBRATION_DURATION * SAMPLE_RATE / STREAM_CHUNK))
+            ambient = b"".join(resampler.process(source.stream.read(source.CHUNK)).tobytes() for _ in range(blocks))
+            logger.info(f"Microphone calibrated, VAD noise floor: {vad.calibrate(ambient):.1f} RMS")
+        print(f"Listening in background ({backend.name} streaming)...")
+        
+        speech_started = None
+        while not listener_stop.is_set():
+            frame = resampler.process(source.stream.read(source.CHUNK))
+            speech = vad.process(frame) if vad else frame.tobytes()
+            if speech and speech_started is None:
+                speech_started = time.perf_counter()
+            
+            finished = bool(speech) and backend.accept_frame(speech)
+            if dispatcher and speech and not finished:
+                command = dispatcher.feed(backend.partial_text())
+                if command:
+                    _begin_utterance(speech_started)
+                    _queue_command(command)
+            
+            if endpointer and not finished and vad.in_speech and vad.trailing_silence > 0:
+                if endpointer.should_end(vad.trailing_silence, backend.partial_text()):
+                    vad.end_segment()
+                    finished = True
+            
+            if finished or (vad and vad.segment_ended):
+                try:
+                    command = _transcribe(backend, speech_started=speech_started)
+                    if dispatcher and dispatcher.confirm(command):
+                        logger.debug(f"Dropping final '{command}', already dispatched early")
+                    else:
+                        _queue_command(command)
+                except sr.RequestError as e:
+                    logger.error(f"Google Speech Recognition service error: {e}")
+                    print(f"Could not request results; {e}")
+                speech_started = None
+                if vad:
+                    logger.debug(f"VAD stats: {vad.stats()}")
+
+
 def command_processor():
-    """Process commands from the queue."""
+    """Process commands from the queue, dispatching them to per-domain workers."""
+    executor = CommandExecutor() if CONCURRENT_EXECUTION else None
+    if executor is not None:
+        # Merged volume/seek/skip operations run on the Spotify worker like any other command
+        command_coalescer.dispatch = lambda label, operation: executor.submit("spotify", operation, label, CONTROL)
+        # Spoken answers play on the TTS worker, so the LLM worker is free once the text is done
+        CommandProcessor.speech_dispatch = lambda label, action: executor.submit("tts", action, label)
     while True:
         try:
             command = command_queue.get(timeout=0.5)
-            should_exit = CommandProcessor.process_command(command)
+            should_exit = CommandProcessor.process_command(command, executor)
             command_queue.task_done()
+            logger.debug(f"Scheduler stats: {command_queue.stats()} | Coalescer: {command_coalescer.stats()}")
+            if executor is not None:
+                logger.debug(f"Executor stats: {executor.stats()}")
             
             if should_exit:
                 print("Exiting from command processor...")
+                if executor is not None:
+                    executor.shutdown(wait=False)
                 sys.exit(0)
                 
         except queue.Empty:
@@ -166,11 +755,33 @@ def command_processor():
             logger.error(f"Error in command processor: {e}")
             print(f"Processor error: {str(e)}")
 
+def _on_runtime_start(runtime):
+    """Wire the asyncio runtime's executor and event bus into the command pipeline."""
+    # Merged volume/seek/skip operations run on the Spotify worker like any other command
+    command_coalescer.dispatch = lambda label, operation: runtime.executor.submit("spotify", operation, label, CONTROL)
+    # Spoken answers play on the TTS worker, so the LLM worker is free once the text is done
+    CommandProcessor.speech_dispatch = lambda label, action: runtime.executor.submit("tts", action, label)
+    runtime.bus.subscribe("command.done", lambda _: logger.debug(
+        f"Runtime stats: {runtime.stats()} | Scheduler: {command_queue.stats()} | Coalescer: {command_coalescer.stats()}"))
+    print("Assistant ready! Say 'what is [topic]' to ask a question.")
+
+
+def run_async():
+    """Run the assistant on the asyncio runtime until exit or Ctrl+C."""
+    runtime = AssistantRuntime(command_queue, CommandProcessor.process_command,
+                               listener=background_listener, on_start=_on_runtime_start)
+    asyncio.run(runtime.run(stop_listener=listener_stop))
+
+
 def main():
     """Main entry point for the application."""
     try:
         print("Starting voice assistant...")
         
+        # Load the offline speech model in the background while the rest starts up
+        if ASR_BACKEND.startswith("vosk"):
+            model_manager.preload()
+        
         # Just some test cases without capturing audio
         # SpotifyCommandHandler.handle_command("Play Die for You")
         # time.sleep(5)
@@ -178,6 +789,10 @@ def main():
         # time.sleep(5)
         # SpotifyCommandHandler.handle_command("Previous")
         
+        if ASYNC_RUNTIME:
+            run_async()
+            return
+        
         # Start background threads
         listener_thread = threading.Thread(target=background_listener, daemon=True)
         listener_thread.start()
@@ -197,6 +812,10 @@ def main():
         logger.error(f"Critical error in main: {e}")
         print(f"Fatal error: {str(e)}")
     finally:
+        active_requests.cancel_all("shutdown")
+        if TRACING:
+            logger.info(f"Latency by stage (ms): {tracer.stats()}")
+            tracer.export_chrome_trace()
         sys.exit(0)
 
 if __name__ == "__main__":
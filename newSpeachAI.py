@@ -10,18 +10,26 @@ import platform
 import subprocess
 import os
 import re
+import time
+from cancellation import CANCEL_POLL_INTERVAL, CancellationToken, active_requests
+from logger import logger
+from tracing import tracer
 
 # Create a global Murf client
 client = Murf(api_key=Murf_API_key)
 
-# Audio queue for continuous playback
+# Audio queue for continuous playback:
+# (audio file, cancellation token or None, trace or None, on_start callback or None)
 audio_queue = queue.Queue()
 playing = threading.Event()
 
+# Sentence endings (., !, ? followed by whitespace) and line breaks
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
 def split_into_natural_chunks(text, max_chunk_size=100):
     """Split text into natural chunks at sentence boundaries"""
     # Split by sentence endings (., !, ?)
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = [s for s in SENTENCE_END.split(text) if s.strip()]
     
     chunks = []
     current_chunk = ""
@@ -39,6 +47,34 @@ def split_into_natural_chunks(text, max_chunk_size=100):
     
     return chunks
 
+class SentenceBuffer:
+    """Collects streamed text and releases speakable chunks as soon as sentences complete."""
+    
+    def __init__(self, max_chunk_size=100):
+        self.max_chunk_size = max_chunk_size
+        self.text = ""
+    
+    def feed(self, piece):
+        """
+        Add streamed text.
+        
+        Returns:
+            list: Chunks of the sentences completed so far (empty while mid-sentence)
+        """
+        self.text += piece
+        last = None
+        for last in SENTENCE_END.finditer(self.text):
+            pass
+        if last is None:
+            return []
+        complete, self.text = self.text[:last.start()], self.text[last.end():]
+        return split_into_natural_chunks(complete, self.max_chunk_size)
+    
+    def flush(self):
+        """Release whatever is left (the final sentence may lack punctuation)."""
+        rest, self.text = self.text, ""
+        return split_into_natural_chunks(rest, self.max_chunk_size) if rest.strip() else []
+
 async def download_audio(url):
     """Download audio data asynchronously"""
     async with aiohttp.ClientSession() as session:
@@ -47,14 +83,15 @@ async def download_audio(url):
 
 async def generate_speech_chunk(text, voice_id="en-US-amara"):
     """Generate speech for a text chunk"""
-    response = client.text_to_speech.generate(
-        text=text,
-        voice_id=voice_id,
-        style="Conversational",
-        pitch=0,
-        rate=0
-    )
-    audio_data = await download_audio(response.audio_file)
+    with tracer.span("tts.synthesize", chars=len(text)):
+        response = client.text_to_speech.generate(
+            text=text,
+            voice_id=voice_id,
+            style="Conversational",
+            pitch=0,
+            rate=0
+        )
+        audio_data = await download_audio(response.audio_file)
     
     # Create a temporary file
     fd, temp_path = tempfile.mkstemp(suffix='.wav')
@@ -66,60 +103,231 @@ async def generate_speech_chunk(text, voice_id="en-US-amara"):
     
     return temp_path
 
+def _discard(audio_file):
+    """Delete a temporary audio file, ignoring errors."""
+    try:
+        os.unlink(audio_file)
+    except:
+        pass
+
+def _play_until_done(command, token, shell=False):
+    """
+    Run a player process, terminating it as soon as the token is cancelled.
+    
+    Returns:
+        bool: True if the player finished successfully
+    """
+    process = subprocess.Popen(command, shell=shell)
+    while process.poll() is None:
+        if token is not None and token.wait(CANCEL_POLL_INTERVAL):
+            process.terminate()
+            process.wait()
+            return False
+        if token is None:
+            try:
+                process.wait(CANCEL_POLL_INTERVAL)
+            except subprocess.TimeoutExpired:
+                pass
+    return process.returncode == 0
+
+def drain_audio_queue():
+    """Drop every chunk still waiting to be played."""
+    while True:
+        try:
+            item = audio_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not None:
+            _discard(item[0])
+        audio_queue.task_done()
+
+def play_chunk(audio_file, token=None, trace=None, on_start=None):
+    """Play one synthesized chunk and delete it (skipped if the token was cancelled)."""
+    if token is not None and token.cancelled:
+        _discard(audio_file)
+        return
+        
+    playing.set()
+    if on_start is not None:
+        on_start()
+    system = platform.system()
+    started = time.perf_counter()
+    try:
+        if system == "Darwin":  # macOS
+            _play_until_done(["afplay", audio_file], token)
+        elif system == "Windows":
+            # Terminating the shell does not always close the default player
+            _play_until_done(f'start /wait {audio_file}', token, shell=True)
+        elif system == "Linux":
+            players = ["aplay", "paplay", "mplayer", "mpg123"]
+            for player in players:
+                try:
+                    if _play_until_done([player, audio_file], token) or (token and token.cancelled):
+                        break
+                except (subprocess.SubprocessError, FileNotFoundError):
+                    continue
+    finally:
+        tracer.record("tts.playback", started, trace=trace)
+        # Clean up temporary file after playing
+        _discard(audio_file)
+        playing.clear()
+
 def player_thread():
     """Thread function to continuously play audio from the queue"""
     while True:
-        audio_file = audio_queue.get()
-        if audio_file is None:  # Sentinel to stop the thread
+        item = audio_queue.get()
+        if item is None:  # Sentinel to stop the thread
             break
-            
-        playing.set()
-        system = platform.system()
         try:
-            if system == "Darwin":  # macOS
-                subprocess.run(["afplay", audio_file], check=True)
-            elif system == "Windows":
-                os.system(f'start /wait {audio_file}')
-            elif system == "Linux":
-                players = ["aplay", "paplay", "mplayer", "mpg123"]
-                for player in players:
-                    try:
-                        subprocess.run([player, audio_file], check=True)
-                        break
-                    except (subprocess.SubprocessError, FileNotFoundError):
-                        continue
+            play_chunk(*item)
         finally:
-            # Clean up temporary file after playing
-            try:
-                os.unlink(audio_file)
-            except:
-                pass
-            playing.clear()
             audio_queue.task_done()
 
-async def speak(text, voice_id="en-US-amara"):
-    """Generate and queue speech in chunks to create illusion of live speech"""
-    # Start player thread if not already started
-    if not hasattr(speak, "player_started"):
-        speak.player_started = True
+def _start_player():
+    """Start the player thread on first use."""
+    if not hasattr(_start_player, "started"):
+        _start_player.started = True
         threading.Thread(target=player_thread, daemon=True).start()
+
+class SpeechStream:
+    """
+    Speak text while it is still being generated.
+    
+    Streamed text (e.g. LLM tokens) is cut into sentences, which a background thread
+    synthesizes in order and queues for playback. The first sentence starts playing
+    while the rest of the answer is still being written, so time to first audio is
+    bounded by the first sentence rather than the whole response.
+    
+    With a dispatch function, the stream's playback runs as one action on the caller's
+    TTS worker (e.g. the "tts" executor domain) and close() returns as soon as the last
+    sentence is queued, so the thread producing the text is free for the next request.
+    Without one, chunks go to the shared player thread and close() waits for playback.
+    """
+    
+    def __init__(self, voice_id="en-US-amara", token=None, started=None, dispatch=None):
+        """
+        Args:
+            voice_id (str): Murf voice
+            token (CancellationToken, optional): Cancelling it stops synthesis and playback
+            started (float, optional): perf_counter time the request began, for time to
+                first audio (defaults to now)
+            dispatch (callable, optional): dispatch(label, action) runs the playback action
+                on a TTS worker
+        """
+        self.voice_id = voice_id
+        self.token = token if token is not None else CancellationToken("speech")
+        self.started = started if started is not None else time.perf_counter()
+        self.first_audio = None  # seconds from started to the first chunk playing
+        self._buffer = SentenceBuffer()
+        self._chunks = queue.Queue()
+        self._audio = queue.Queue() if dispatch is not None else None  # this stream's chunks, in order
+        self._trace = tracer.current()
+        
+        if dispatch is not None:
+            dispatch("speech", self._play)
+        else:
+            _start_player()
+            self.token.on_cancel(drain_audio_queue)
+        self._thread = threading.Thread(target=self._synthesize, daemon=True)
+        self._thread.start()
+    
+    def feed(self, piece):
+        """Add streamed text; every completed sentence goes to synthesis immediately."""
+        for chunk in self._buffer.feed(piece):
+            self._chunks.put(chunk)
+    
+    def close(self):
+        """
+        Queue the remaining text for speech.
+        
+        Returns once it is queued when playback runs on a TTS worker; otherwise blocks
+        until everything queued has played (or was cancelled).
+        """
+        for chunk in self._buffer.flush():
+            self._chunks.put(chunk)
+        self._chunks.put(None)
+        if self._audio is None:
+            self._thread.join()
+            audio_queue.join()
+    
+    def _play(self):
+        """Play this stream's chunks as they are synthesized (runs on the TTS worker)."""
+        # Tracked while playing, so "stop" still cuts the answer off after the text request ended
+        with active_requests.track("speech") as playback:
+            playback.on_cancel(lambda: self.token.cancel(playback.reason))
+            while True:
+                item = self._audio.get()
+                if item is None:
+                    break
+                play_chunk(*item)
+    
+    def _synthesize(self):
+        loop = asyncio.new_event_loop()
+        try:
+            with tracer.activate(self._trace):
+                while True:
+                    chunk = self._chunks.get()
+                    if chunk is None or (self.token is not None and self.token.cancelled):
+                        break
+                    audio_file = loop.run_until_complete(generate_speech_chunk(chunk, self.voice_id))
+                    if self.token is not None and self.token.cancelled:
+                        _discard(audio_file)
+                        break
+                    target = self._audio if self._audio is not None else audio_queue
+                    target.put((audio_file, self.token, self._trace, self._on_start))
+        except Exception as e:
+            print(f"Speech error: {e}")
+        finally:
+            loop.close()
+            if self._audio is not None:
+                self._audio.put(None)
+    
+    def _on_start(self):
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter() - self.started
+            tracer.record("tts.first_audio", self.started, trace=self._trace)
+            logger.info(f"Time to first audio: {self.first_audio * 1000:.0f} ms")
+
+async def speak(text, voice_id="en-US-amara", token=None):
+    """
+    Generate and queue speech in chunks to create illusion of live speech
+    
+    Args:
+        text (str): Text to speak
+        voice_id (str): Murf voice
+        token (CancellationToken, optional): Cancelling it stops generation, stops the
+            chunk being played and drops the queued ones
+    """
+    # Start player thread if not already started
+    _start_player()
+    
+    if token is not None:
+        token.on_cancel(drain_audio_queue)
     
     # Split text into natural chunks
     chunks = split_into_natural_chunks(text)
     
     # Generate speech for each chunk
     for i, chunk in enumerate(chunks):
+        if token is not None and token.cancelled:
+            break
+        
         # Generate audio for current chunk
         audio_file = await generate_speech_chunk(chunk, voice_id)
+        if token is not None and token.cancelled:
+            _discard(audio_file)
+            break
         
         # Add to queue for playback
-        audio_queue.put(audio_file)
+        audio_queue.put((audio_file, token, tracer.current(), None))
         
         # If this is not the last chunk, start generating the next chunk in parallel
         # but wait for current chunk to start playing before proceeding
         if i < len(chunks) - 1:
             # Wait for player to start on current chunk before processing next
-            playing.wait()
+            while not playing.wait(CANCEL_POLL_INTERVAL):
+                if token is not None and token.cancelled:
+                    break
 
 async def main():
     """Main function to demonstrate usage"""
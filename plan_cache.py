@@ -0,0 +1,130 @@
+# plan_cache.py
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from logger import logger
+
+PLAN_CACHE_SIZE = 128  # distinct phrases kept; daily use is a few dozen
+
+ExecutionPlan = namedtuple("ExecutionPlan", "intent action library_dependent")
+ExecutionPlan.__doc__ = """
+A routed command ready to run again.
+
+intent: Intent returned by CommandProcessor.route
+action: No-argument callable that executes the command (may memoize resolved URIs)
+library_dependent: True if the plan resolved names from the user's library and must
+    be dropped when the library changes
+"""
+
+
+def normalize_transcript(text):
+    """Reduce a transcript to the cache key form: lowercase words, single spaces."""
+    return " ".join(re.findall(r"[\w']+", text.lower()))
+
+
+class PlanCache:
+    """
+    Bounded LRU cache from normalized transcript to execution plan.
+
+    Repeated phrases ("next", "pause", "play my liked songs") skip routing, and plans
+    that resolve Spotify search results keep them, so searching and fuzzy matching
+    happen only the first time. Plans that depend on the library are invalidated when
+    it changes (see on_library_change).
+    """
+
+    def __init__(self, capacity=PLAN_CACHE_SIZE):
+        """
+        Args:
+            capacity (int): Maximum number of cached plans
+        """
+        self.capacity = capacity
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, text):
+        """
+        Look up the plan for a transcript.
+
+        Args:
+            text (str): Transcript (normalized here)
+
+        Returns:
+            ExecutionPlan | None: The cached plan, or None on a miss
+        """
+        key = normalize_transcript(text)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def contains(self, text):
+        """Check for a cached plan without touching recency or hit counters."""
+        return normalize_transcript(text) in self._plans
+
+    def put(self, text, plan):
+        """Store the plan for a transcript, evicting the least recently used one if full."""
+        key = normalize_transcript(text)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.capacity:
+                self._plans.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, text=None, predicate=None):
+        """
+        Drop cached plans.
+
+        Args:
+            text (str, optional): Drop only the plan for this transcript
+            predicate (callable, optional): Drop every plan for which predicate(plan) is True
+
+        With neither argument, the whole cache is cleared.
+
+        Returns:
+            int: Number of plans dropped
+        """
+        with self._lock:
+            if text is not None:
+                keys = [key for key in (normalize_transcript(text),) if key in self._plans]
+            elif predicate is not None:
+                keys = [key for key, plan in self._plans.items() if predicate(plan)]
+            else:
+                keys = list(self._plans)
+            for key in keys:
+                del self._plans[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def on_library_change(self, vocabulary=None):
+        """Library listener: drop plans that resolved names from the library."""
+        dropped = self.invalidate(predicate=lambda plan: plan.library_dependent)
+        if dropped:
+            logger.info(f"Library changed, dropped {dropped} cached plan(s)")
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Size, hits, misses, hit rate, evictions and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._plans),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
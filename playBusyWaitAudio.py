@@ -1,13 +1,31 @@
 import random
-from playsound import playsound  # For playing audio files
+import pygame
+from cancellation import CANCEL_POLL_INTERVAL, active_requests
 
-def play_busy_wait_audioMusic():
-    """Play a single random busy wait audio clip."""
-    audio_files = [f"BusyWaitAudio/MusicBuffer/Music_buffer_audio_{i}.wav" for i in range(1, 7)]
+def play_busy_wait_audioMusic(token=None):
+    """
+    Play a single random busy wait audio clip.
+    
+    Args:
+        token (CancellationToken, optional): Cancelling it stops the clip immediately;
+            without one the clip is tracked in active_requests so "stop" cancels it
+    """
+    if token is None:
+        with active_requests.track("busy wait audio") as token:
+            return play_busy_wait_audioMusic(token)
+    
+    audio_files = [f"BusyWaitAudio/MusicBuffer/Music_Buffer_audio_{i}.wav" for i in range(1, 7)]
     selected_audio = random.choice(audio_files)
     print(f"Playing busy wait audio: {selected_audio}")
     try:
-        playsound(selected_audio)  # Play the audio once
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        channel = pygame.mixer.Sound(selected_audio).play()  # Play the audio once
+        while channel.get_busy():
+            if token.wait(CANCEL_POLL_INTERVAL):
+                channel.stop()
+                print("Busy wait audio stopped")
+                return
         print("Busy wait audio finished")
     except Exception as e:
-        print(f"Error playing busy wait audio: {e}")
\ No newline at end of file
+        print(f"Error playing busy wait audio: {e}")
@@ -0,0 +1,149 @@
+# ring_buffer.py
+import threading
+import time
+import numpy as np
+
+# Header layout (int64 slots) stored in front of the sample data
+WRITE_CURSOR = 0
+READ_CURSOR = 1
+OVERFLOW_SAMPLES = 2
+HEADER_SLOTS = 3
+HEADER_BYTES = HEADER_SLOTS * np.dtype(np.int64).itemsize
+
+READ_POLL_INTERVAL = 0.005  # seconds between checks when no wake-up event is available
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity, single-producer/single-consumer ring buffer of int16 samples.
+
+    All storage is allocated up front, so the audio callback only copies samples into
+    place. Cursors are monotonically increasing sample counts kept in an int64 header in
+    the same buffer as the data; this lets the ring be placed in shared memory later.
+    When the consumer falls behind, new samples are dropped and counted instead of
+    growing memory.
+    """
+
+    def __init__(self, capacity, buffer=None):
+        """
+        Args:
+            capacity (int): Number of samples the ring can hold
+            buffer (writable buffer, optional): Backing memory of at least
+                required_bytes(capacity) bytes; allocated privately when omitted
+        """
+        if buffer is None:
+            buffer = bytearray(AudioRingBuffer.required_bytes(capacity))
+
+        self.capacity = capacity
+        self._header = np.frombuffer(buffer, dtype=np.int64, count=HEADER_SLOTS)
+        self._data = np.frombuffer(buffer, dtype=np.int16, count=capacity, offset=HEADER_BYTES)
+        self._scratch = np.empty(capacity, dtype=np.int16)  # used only for reads that wrap
+        self._pending = 0  # samples handed out by the last read() and not yet released
+        self._data_ready = threading.Event()
+
+    @staticmethod
+    def required_bytes(capacity):
+        """Return the number of bytes of backing memory needed for a ring of this capacity."""
+        return HEADER_BYTES + capacity * np.dtype(np.int16).itemsize
+
+    def write(self, block):
+        """
+        Copy a block of samples into the ring (safe to call from the audio callback).
+
+        Args:
+            block (buffer | np.ndarray): 16-bit mono PCM
+
+        Returns:
+            int: Number of samples stored; the rest were dropped as overflow
+        """
+        samples = block if isinstance(block, np.ndarray) else np.frombuffer(block, dtype=np.int16)
+        write_pos = int(self._header[WRITE_CURSOR])
+        free = self.capacity - (write_pos - int(self._header[READ_CURSOR]))
+
+        count = min(samples.size, free)
+        if count < samples.size:
+            self._header[OVERFLOW_SAMPLES] += samples.size - count
+
+        if count:
+            start = write_pos % self.capacity
+            first = min(count, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            if first < count:
+                self._data[:count - first] = samples[first:count]
+            # Publish the samples only after they are in place
+            self._header[WRITE_CURSOR] = write_pos + count
+            self._data_ready.set()
+
+        return count
+
+    def available(self):
+        """Return the number of samples waiting to be read."""
+        return int(self._header[WRITE_CURSOR] - self._header[READ_CURSOR]) - self._pending
+
+    def read(self, count, timeout=None):
+        """
+        Read exactly `count` samples, waiting for them if necessary.
+
+        The returned memoryview points straight into the ring when the samples are
+        contiguous, and into a preallocated scratch buffer when they wrap. It stays
+        valid until the next call to read() or release().
+
+        Args:
+            count (int): Number of samples to read (at most the ring capacity)
+            timeout (float, optional): Seconds to wait for enough samples
+
+        Returns:
+            memoryview | None: int16 samples, or None if the timeout expired
+        """
+        self.release()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self.available() < count:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._data_ready.clear()
+            if self.available() >= count:
+                break
+            self._data_ready.wait(READ_POLL_INTERVAL if remaining is None else min(remaining, READ_POLL_INTERVAL))
+
+        start = int(self._header[READ_CURSOR]) % self.capacity
+        self._pending = count
+        first = min(count, self.capacity - start)
+        if first == count:
+            return memoryview(self._data[start:start + count])
+
+        self._scratch[:first] = self._data[start:]
+        self._scratch[first:count] = self._data[:count - first]
+        return memoryview(self._scratch[:count])
+
+    def release(self):
+        """Hand the samples from the last read() back to the producer."""
+        if self._pending:
+            self._header[READ_CURSOR] += self._pending
+            self._pending = 0
+
+    def clear(self):
+        """Zero the cursors and counters (only while no producer or consumer is running)."""
+        self._header[:] = 0
+        self._pending = 0
+
+    @property
+    def overflow_samples(self):
+        """Total number of samples dropped because the ring was full."""
+        return int(self._header[OVERFLOW_SAMPLES])
+
+    def stats(self):
+        """
+        Get ring buffer usage counters.
+
+        Returns:
+            dict: Capacity, samples written/read/queued and overflow count
+        """
+        return {
+            "capacity": self.capacity,
+            "written": int(self._header[WRITE_CURSOR]),
+            "read": int(self._header[READ_CURSOR]),
+            "queued": self.available(),
+            "overflow_samples": self.overflow_samples,
+        }
@@ -1,34 +1,35 @@
-import queue
-import sounddevice as sd
-import json
-from vosk import Model, KaldiRecognizer
+from vosk_model_manager import model_manager
+from voice_activity import VoiceActivityDetector
+from ring_buffer import AudioRingBuffer
+from capture_frontend import CaptureFrontend
+from wake_word import WakeWordCascade, WAKE_WORDS
 
-WAKE_WORDS = ["hey nova", "hey atlas", "yo nova"]
+BLOCK_SIZE = 8000  # samples per read (0.5 s at 16 kHz)
+RING_SECONDS = 10  # audio kept while recognition catches up; older backlog is dropped
 
-# Load the Vosk model
-model = Model("vosk-model-small-en-us-0.15")
-recognizer = KaldiRecognizer(model, 16000)
+# Start loading the shared Vosk model while the rest of the pipeline is set up
+model_manager.preload()
 
-# Setup the queue to store audio data
-q = queue.Queue()
+# Only speech segments (with pre-roll) are passed on to the recognizer
+vad = VoiceActivityDetector(sample_rate=16000)
 
-def audio_callback(indata, frames, time, status):
-    if status:
-        print(status)
-    q.put(bytes(indata))
+# Preallocated ring for captured audio, so the callback never allocates
+ring = AudioRingBuffer(16000 * RING_SECONDS)
 
 def listen():
+    # Grammar-restricted wake stage; the full recognizer only runs after a wake hit
+    cascade = WakeWordCascade(WAKE_WORDS, sample_rate=16000, on_wake=respond_to_wake_word)
+    print(f"Model: {model_manager.stats()}")
+    
     print("Listening for wake words... (say 'hey nova', 'hey atlas', or 'yo nova')")
-    with sd.RawInputStream(samplerate=16000, blocksize=8000, dtype='int16',
-                           channels=1, callback=audio_callback):
+    # The device is opened at its native rate/channels and converted to 16 kHz mono into the ring
+    with CaptureFrontend(ring, target_rate=16000):
         while True:
-            data = q.get()
-            if recognizer.AcceptWaveform(data):
-                result = json.loads(recognizer.Result())
-                text = result.get("text", "").lower()
-                if any(phrase in text for phrase in WAKE_WORDS):
-                    print(f"Wake word detected: \"{text}\"")
-                    respond_to_wake_word(text)
+            data = vad.process(ring.read(BLOCK_SIZE))
+            command = cascade.process(data, segment_ended=vad.segment_ended)
+            if command:
+                print(f"Command: \"{command}\"")
+                print(f"Wake: {cascade.stats()} | VAD: {vad.stats()} | Ring: {ring.stats()}")
 
 def respond_to_wake_word(trigger):
     print(f"🔊 Activated by '{trigger}' - Ready to process command...")
@@ -0,0 +1,410 @@
+# speech_backends.py
+import json
+import speech_recognition as sr
+from logger import logger
+from vosk_model_manager import model_manager
+from command_grammar import grammar_json, needs_open_vocabulary
+
+# Audio format shared by every backend (16 kHz, 16-bit mono PCM)
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+GRAMMAR_MIN_CONFIDENCE = 0.6  # mean word confidence below this rejects a grammar match
+MAX_ALTERNATIVES = 5  # n-best hypotheses requested when rescoring is enabled
+KALDI_ENDPOINT_DELAYS = (5.0, 0.5, 20.0)  # Vosk defaults: start timeout, trailing silence, max utterance
+ENDPOINT_DEFER_MARGIN = 0.3  # Kaldi waits this much longer than an external endpointer would
+
+
+class SpeechBackend:
+    """
+    Common interface for speech recognizers used by the listener.
+
+    A backend can be used in two ways:
+        - Utterance mode: transcribe() takes a complete sr.AudioData capture.
+        - Streaming mode: accept_frame() is fed raw 16 kHz int16 frames as they are
+          captured, and final_text() returns the transcript once the utterance ends.
+    """
+
+    name = "base"
+    streaming = False  # True if the backend decodes while audio is still arriving
+
+    def transcribe(self, audio):
+        """
+        Transcribe a complete utterance.
+
+        Args:
+            audio (sr.AudioData): Captured audio
+
+        Returns:
+            str: Lowercase transcript, or an empty string if nothing was understood
+        """
+        raise NotImplementedError
+
+    def accept_frame(self, frame):
+        """
+        Feed one frame of raw audio.
+
+        Args:
+            frame (bytes): 16 kHz, 16-bit mono PCM
+
+        Returns:
+            bool: True if the backend detected the end of the utterance
+        """
+        raise NotImplementedError
+
+    def transcribe_alternatives(self, audio):
+        """
+        Transcribe a complete utterance, returning n-best hypotheses when available.
+
+        Returns:
+            list: (text, confidence or None) pairs, best first
+        """
+        text = self.transcribe(audio)
+        return [(text, None)] if text else []
+
+    def defer_endpoint(self, max_silence):
+        """
+        Leave the end of the utterance to an external endpointer.
+
+        Args:
+            max_silence (float): Longest trailing silence the endpointer may wait for;
+                the backend's own endpoint detection must not fire before it
+
+        Returns:
+            bool: True if the backend will not end utterances on its own first
+        """
+        return not self.streaming
+
+    def partial_text(self):
+        """Return the current partial hypothesis (empty if unsupported)."""
+        return ""
+
+    def final_text(self):
+        """Finish the current utterance, return its transcript and reset for the next one."""
+        raise NotImplementedError
+
+    def final_alternatives(self):
+        """
+        Like final_text(), but returning n-best hypotheses when the backend has them.
+
+        Returns:
+            list: (text, confidence or None) pairs, best first
+        """
+        text = self.final_text()
+        return [(text, None)] if text else []
+
+    def reset(self):
+        """Discard any audio buffered for the current utterance."""
+        pass
+
+    def close(self):
+        """Release any shared resources held by the backend."""
+        pass
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API via speech_recognition (needs network, utterance level)."""
+
+    name = "google"
+    streaming = False
+
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer or sr.Recognizer()
+        self._frames = []
+
+    def transcribe(self, audio):
+        try:
+            return self.recognizer.recognize_google(audio).lower()
+        except sr.UnknownValueError:
+            return ""
+
+    def transcribe_alternatives(self, audio):
+        # show_all returns the raw response: {"alternative": [{"transcript", "confidence"}, ...]}
+        response = self.recognizer.recognize_google(audio, show_all=True)
+        if not response:
+            return []
+        return [(alternative["transcript"].lower(), alternative.get("confidence"))
+                for alternative in response.get("alternative", [])]
+
+    def accept_frame(self, frame):
+        # Google has no streaming endpoint detection; the caller decides when to stop
+        self._frames.append(frame)
+        return False
+
+    def _buffered_audio(self):
+        """Take the buffered frames as one AudioData (None if nothing was buffered)."""
+        if not self._frames:
+            return None
+        audio = sr.AudioData(b"".join(self._frames), SAMPLE_RATE, SAMPLE_WIDTH)
+        self.reset()
+        return audio
+
+    def final_text(self):
+        audio = self._buffered_audio()
+        return self.transcribe(audio) if audio else ""
+
+    def final_alternatives(self):
+        audio = self._buffered_audio()
+        return self.transcribe_alternatives(audio) if audio else []
+
+    def reset(self):
+        self._frames = []
+
+
+def _set_endpoint_delays(recognizer, trailing_silence):
+    """
+    Set how much trailing silence makes Kaldi end an utterance (AcceptWaveform returning True).
+
+    Returns:
+        bool: False if this Vosk version cannot change the endpointer delays
+    """
+    if not hasattr(recognizer, "SetEndpointerDelays"):
+        return False
+    start_max, _, utterance_max = KALDI_ENDPOINT_DELAYS
+    recognizer.SetEndpointerDelays(start_max, trailing_silence, utterance_max)
+    return True
+
+
+class VoskBackend(SpeechBackend):
+    """
+    Offline streaming recognizer built on the bundled Vosk model.
+
+    Frames are decoded as they arrive, so the transcript is ready as soon as Kaldi's
+    endpointer sees the end of speech and no network round trip is needed.
+    """
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, manager=model_manager, sample_rate=SAMPLE_RATE, max_alternatives=0):
+        """
+        Args:
+            manager (VoskModelManager): Source of the shared model and pooled recognizers
+            sample_rate (int): Sample rate of the frames that will be fed in
+            max_alternatives (int): Number of n-best hypotheses to produce (0 for one-best)
+        """
+        self.manager = manager
+        self.sample_rate = sample_rate
+        self.max_alternatives = max_alternatives
+        self.recognizer = manager.acquire(sample_rate)
+        if max_alternatives:
+            self.recognizer.SetMaxAlternatives(max_alternatives)
+        self._result = None
+        self._endpoint_delay = None  # trailing silence Kaldi waits for when deferring to an endpointer
+
+    def transcribe(self, audio):
+        self.reset()
+        self.recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate,
+                                                          convert_width=SAMPLE_WIDTH))
+        return self.final_text()
+
+    def transcribe_alternatives(self, audio):
+        self.reset()
+        self.recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate,
+                                                          convert_width=SAMPLE_WIDTH))
+        return self.final_alternatives()
+
+    def _take_result(self):
+        """Return the finished result for this utterance and clear it."""
+        result = self._result
+        if result is None:
+            result = json.loads(self.recognizer.FinalResult())
+        self._result = None
+        return result
+
+    def accept_frame(self, frame):
+        if self.recognizer.AcceptWaveform(frame):
+            self._result = json.loads(self.recognizer.Result())
+            return True
+        return False
+
+    def defer_endpoint(self, max_silence):
+        self._endpoint_delay = max_silence + ENDPOINT_DEFER_MARGIN
+        return _set_endpoint_delays(self.recognizer, self._endpoint_delay)
+
+    def partial_text(self):
+        return json.loads(self.recognizer.PartialResult()).get("partial", "").lower()
+
+    def final_text(self):
+        result = self._take_result()
+        if "alternatives" in result:
+            # With n-best enabled the one-best transcript is the first alternative
+            alternatives = result["alternatives"]
+            return alternatives[0].get("text", "").lower().strip() if alternatives else ""
+        return result.get("text", "").lower().strip()
+
+    def final_alternatives(self):
+        result = self._take_result()
+        if "alternatives" not in result:
+            text = result.get("text", "").lower().strip()
+            return [(text, None)] if text else []
+
+        # n-best confidences are unnormalized decoder scores; scale them to the best one
+        alternatives = result["alternatives"]
+        top = max((alternative.get("confidence", 0.0) for alternative in alternatives), default=0.0)
+        return [(alternative.get("text", "").lower().strip(),
+                 alternative.get("confidence", 0.0) / top if top > 0 else None)
+                for alternative in alternatives]
+
+    def reset(self):
+        self._result = None
+        self.recognizer.Reset()
+
+    def close(self):
+        """Return the recognizer to the shared pool."""
+        if self.max_alternatives:
+            self.recognizer.SetMaxAlternatives(0)  # pooled recognizers are shared one-best
+        if self._endpoint_delay is not None:
+            _set_endpoint_delays(self.recognizer, KALDI_ENDPOINT_DELAYS[1])
+        self.manager.release(self.recognizer)
+
+
+class GrammarCommandBackend(SpeechBackend):
+    """
+    Two-pass Vosk recognizer: a fast command grammar first, the full model on rejection.
+
+    The grammar-constrained recognizer only has to choose between the known command
+    phrases, which makes it faster and more accurate for transport commands. The
+    utterance audio is kept, and the open-vocabulary model decodes it only when the
+    grammar pass rejects the input or the command needs a free-form argument.
+    """
+
+    name = "vosk-grammar"
+    streaming = True
+
+    def __init__(self, phrases, known_phrases=(), manager=model_manager, sample_rate=SAMPLE_RATE,
+                 min_confidence=GRAMMAR_MIN_CONFIDENCE):
+        """
+        Args:
+            phrases (list): Grammar phrases, e.g. from command_grammar.build_command_grammar
+            known_phrases (iterable): Phrases with a complete argument (library names) that
+                are accepted without the open-vocabulary pass
+            manager (VoskModelManager): Source of the shared model and pooled recognizers
+            sample_rate (int): Sample rate of the frames that will be fed in
+            min_confidence (float): Mean word confidence needed to accept a grammar match
+        """
+        self.manager = manager
+        self.sample_rate = sample_rate
+        self.min_confidence = min_confidence
+        self.known_phrases = set(known_phrases)
+        self.recognizer = manager.acquire(sample_rate, grammar_json(phrases))
+        self.recognizer.SetWords(True)
+        self._endpoint_delay = None  # trailing silence Kaldi waits for when deferring to an endpointer
+        self._pending_grammar = None
+        self._frames = []
+        self._result = None
+
+        # Counters
+        self.grammar_hits = 0
+        self.open_vocabulary_passes = 0
+
+    def transcribe(self, audio):
+        self.reset()
+        self.accept_frame(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=SAMPLE_WIDTH))
+        return self.final_text()
+
+    def accept_frame(self, frame):
+        self._frames.append(frame)
+        if self.recognizer.AcceptWaveform(frame):
+            self._result = json.loads(self.recognizer.Result())
+            return True
+        return False
+
+    def defer_endpoint(self, max_silence):
+        self._endpoint_delay = max_silence + ENDPOINT_DEFER_MARGIN
+        return _set_endpoint_delays(self.recognizer, self._endpoint_delay)
+
+    def partial_text(self):
+        return json.loads(self.recognizer.PartialResult()).get("partial", "").lower()
+
+    def _accepted(self, result):
+        """Return True if the grammar result is a confident, complete command."""
+        text = result.get("text", "")
+        if needs_open_vocabulary(text, self.known_phrases):
+            return False
+        words = result.get("result", [])
+        if not words:
+            return True
+        confidence = sum(word.get("conf", 1.0) for word in words) / len(words)
+        return confidence >= self.min_confidence
+
+    def final_text(self):
+        result = self._result
+        if result is None:
+            result = json.loads(self.recognizer.FinalResult())
+
+        if self._accepted(result):
+            self.grammar_hits += 1
+            text = result.get("text", "")
+        else:
+            # Re-decode the buffered utterance with the full vocabulary
+            self.open_vocabulary_passes += 1
+            with self.manager.recognizer(self.sample_rate) as open_recognizer:
+                open_recognizer.AcceptWaveform(b"".join(self._frames))
+                text = json.loads(open_recognizer.FinalResult()).get("text", "")
+
+        self.reset()
+        return text.lower().strip()
+
+    def update_grammar(self, phrases, known_phrases=()):
+        """
+        Replace the grammar (e.g. after the user's library changed).
+
+        Safe to call from another thread: the swap happens at the next utterance
+        boundary on the thread feeding the backend.
+        """
+        self._pending_grammar = (grammar_json(phrases), set(known_phrases))
+
+    def reset(self):
+        self._frames = []
+        self._result = None
+        pending, self._pending_grammar = self._pending_grammar, None
+        if pending:
+            grammar, self.known_phrases = pending
+            self.close()
+            self.recognizer = self.manager.acquire(self.sample_rate, grammar)
+            self.recognizer.SetWords(True)
+            if self._endpoint_delay is not None:
+                _set_endpoint_delays(self.recognizer, self._endpoint_delay)
+            logger.info("Command grammar updated")
+        else:
+            self.recognizer.Reset()
+
+    def close(self):
+        """Return the grammar recognizer to the shared pool."""
+        if self._endpoint_delay is not None:
+            _set_endpoint_delays(self.recognizer, KALDI_ENDPOINT_DELAYS[1])
+        self.manager.release(self.recognizer)
+
+    def stats(self):
+        """Return how often the grammar pass was enough versus the full model."""
+        return {
+            "grammar_hits": self.grammar_hits,
+            "open_vocabulary_passes": self.open_vocabulary_passes,
+        }
+
+
+SPEECH_BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "vosk-grammar": GrammarCommandBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """
+    Create a speech backend by name.
+
+    Args:
+        name (str): One of the keys of SPEECH_BACKENDS
+        **kwargs: Passed through to the backend constructor
+
+    Returns:
+        SpeechBackend: The new backend
+    """
+    try:
+        backend_class = SPEECH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown speech backend '{name}', expected one of {list(SPEECH_BACKENDS)}")
+
+    logger.info(f"Using '{name}' speech backend")
+    return backend_class(**kwargs)
@@ -15,8 +15,16 @@ from spotify_utils import (
     play_artist, # needs get_artists id, call get_artists first to get id)
     play_artist_by_name, # standalone
     get_current_track, #standalone
+    search_song,
+    start_playback,
+    find_artist,
+    wait,
+    change_volume,
+    seek_relative,
+    skip_tracks,
 )
 from spotifyHelperFuncs import pre_check_spotify_environment
+from command_router import build_command_router
 
 class SpotifyCommandHandler:
     """Handles processing and execution of Spotify voice commands."""
@@ -40,6 +48,12 @@ class SpotifyCommandHandler:
         "current": lambda _: get_current_track(),
     }
     
+    # Commands that are complete without an argument (safe to dispatch from a partial result)
+    STANDALONE_COMMANDS = (
+        "resume", "pause", "next", "previous", "back", "shuffle", "repeat",
+        "volume up", "volume down", "skip", "rewind", "current",
+    )
+    
     @staticmethod
     def is_spotify_command(command):
         """
@@ -51,18 +65,17 @@ class SpotifyCommandHandler:
         Returns:
             bool: True if this is a Spotify command, False otherwise
         """
-        command = command.lower()
-        return ("spotify" in command or 
-                "music" in command or 
-                any(cmd in command for cmd in SpotifyCommandHandler.SPOTIFY_COMMANDS.keys()))
+        return SPOTIFY_ROUTER.match(command).intent == "spotify"
     
     @staticmethod
-    def handle_command(command):
+    def handle_command(command, match=None):
         """
         Process and execute a Spotify voice command.
         
         Args:
             command (str): The user's voice command as text
+            match (RouteMatch, optional): Result of routing the command already
+                (routed again here when omitted)
         
         Returns:
             bool: True if command was successfully processed, False otherwise
@@ -72,46 +85,137 @@ class SpotifyCommandHandler:
             pre_check_spotify_environment()
             
             command = command.lower().strip()
-            command = command.replace("on spotify", "").strip()
             logger.info(f"Processing Spotify command: {command}")
             
-            # Handle play command with argument
-            if "play " in command:
-                cmd = "play"
-                args = command.split("play ", 1)[1].strip()
-                print(f"Playing: {args}")
-                SpotifyCommandHandler.SPOTIFY_COMMANDS[cmd](args)
-                return True
-                
-            # Handle playlist command
-            elif "playlist " in command:
-                cmd = "playlist"
-                args = command.split("playlist ", 1)[1].strip()
-                print(f"Playing playlist: {args}")
-                SpotifyCommandHandler.SPOTIFY_COMMANDS[cmd](args)
-                return True
-                
-            # Handle artist command
-            elif "artist " in command:
-                cmd = "artist"
-                args = command.split("artist ", 1)[1].strip()
-                print(f"Playing artist: {args}")
-                SpotifyCommandHandler.SPOTIFY_COMMANDS[cmd](args)
-                return True
-                
-            # Handle other commands without arguments
-            else:
-                for cmd_text in SpotifyCommandHandler.SPOTIFY_COMMANDS.keys():
-                    if cmd_text in command:
-                        print(f"Executing Spotify command: {cmd_text}")
-                        SpotifyCommandHandler.SPOTIFY_COMMANDS[cmd_text](None)
-                        return True
+            if match is None:
+                match = SPOTIFY_ROUTER.match(command)
+            cmd = match.keyword
             
-            # If we get here, we couldn't find a matching command
-            print(f"Unrecognized Spotify command: '{command}'")
-            return False
+            if match.intent != "spotify" or cmd not in SpotifyCommandHandler.SPOTIFY_COMMANDS:
+                print(f"Unrecognized Spotify command: '{command}'")
+                return False
+            
+            # Commands with an argument (song, playlist or artist name)
+            if match.argument:
+                print(f"{ARGUMENT_MESSAGES[cmd]}: {match.argument}")
+            else:
+                print(f"Executing Spotify command: {cmd}")
+            SpotifyCommandHandler.SPOTIFY_COMMANDS[cmd](match.argument)
+            return True
                 
         except Exception as e:
             logger.error(f"Error processing Spotify command '{command}': {e}")
             print(f"Error with Spotify command: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def plan(command, match=None):
+        """
+        Build a reusable action for a Spotify command.
+        
+        Song and artist commands resolve their search result on the first run and reuse
+        it afterwards, so a cached plan skips searching and fuzzy matching.
+        
+        Args:
+            command (str): The user's voice command as text
+            match (RouteMatch, optional): Result of routing the command already
+        
+        Returns:
+            tuple: (callable, bool) - No-argument action and whether it depends on
+                the user's library
+        """
+        if match is None:
+            match = SPOTIFY_ROUTER.match(command)
+        if match.argument and match.keyword in RESOLVED_PLANS:
+            return RESOLVED_PLANS[match.keyword](match.argument), True
+        return (lambda: SpotifyCommandHandler.handle_command(command, match)), match.argument is not None
+
+
+class ResolvedSongPlan:
+    """Plays a song by name, searching for its URI only on the first run."""
+    
+    def __init__(self, query):
+        self.query = query
+        self.uri = None
+        self.info = None
+    
+    def _resolve(self):
+        print(f"Playing: {self.query}")
+        self.uri, self.info = search_song(self.query)
+        if not self.uri:
+            print("Couldn't find a matching song to play.")
+            return False
+        wait("play")
+        return True
+    
+    def _play(self):
+        return start_playback(self.uri, self.info)
+    
+    def __call__(self):
+        try:
+            pre_check_spotify_environment()
+            if self.uri is None and not self._resolve():
+                return False
+            if self._play():
+                return True
+            # The resolved URI may be stale; search again next time
+            self.uri = self.info = None
+            return False
+        except Exception as e:
+            logger.error(f"Error playing '{self.query}': {e}")
+            print(f"Error with Spotify command: {str(e)}")
+            return False
+
+
+class ResolvedArtistPlan(ResolvedSongPlan):
+    """Plays an artist's top tracks, matching the artist name only on the first run."""
+    
+    def _resolve(self):
+        print(f"Playing artist: {self.query}")
+        self.uri, self.info, _ = find_artist(self.query)
+        return bool(self.uri)
+    
+    def _play(self):
+        return play_artist(self.uri, self.info)
+
+
+def checked_operation(operation, name):
+    """
+    Wrap a relative Spotify operation with the same environment check and error
+    handling as handle_command, for callers that bypass it (the command coalescer).
+    """
+    def run(step):
+        try:
+            pre_check_spotify_environment()
+            return operation(step)
+        except Exception as e:
+            logger.error(f"Error with {name} change of {step:+d}: {e}")
+            print(f"Error with Spotify command: {str(e)}")
+            return False
+    return run
+
+
+# Operation group -> function applying a summed relative step in one call (see command_coalescer)
+COALESCED_OPERATIONS = {
+    "volume": checked_operation(change_volume, "volume"),
+    "seek": checked_operation(seek_relative, "seek"),
+    "track": checked_operation(skip_tracks, "track"),
+}
+
+
+# Commands whose argument is resolved once and reused by cached plans
+RESOLVED_PLANS = {
+    "play": ResolvedSongPlan,
+    "artist": ResolvedArtistPlan,
+}
+
+
+# Message printed before running a command with an argument
+ARGUMENT_MESSAGES = {
+    "play": "Playing",
+    "playlist": "Playing playlist",
+    "artist": "Playing artist",
+}
+
+# Router over the Spotify keywords alone, for callers that did not route the command yet
+SPOTIFY_ROUTER = build_command_router({}, SpotifyCommandHandler.SPOTIFY_COMMANDS)
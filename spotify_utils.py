@@ -15,6 +15,9 @@
 # volume_down() $
 # skip_5_seconds() $
 # go_back_5_seconds() $
+# change_volume(delta)
+# seek_relative(offset_ms)
+# skip_tracks(count)
 # play_playlist(playlistId)    
 # play_artist(artistID)
 # playsong(str song name)
@@ -26,6 +29,7 @@ import time
 from config import SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET
 from fuzzywuzzy import fuzz
 from logger import logger
+from tracing import tracer
 
 # Global sleep durations (in seconds)
 helperSleep = 0.3
@@ -48,24 +52,26 @@ SCOPE = (
 
 logger.info("Initializing Spotify API connection")
 try:
-    sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
+    # Every API call is timed as a "spotify.<method>" span of the current utterance
+    sp = tracer.instrument(spotipy.Spotify(auth_manager=SpotifyOAuth(
         client_id=SPOTIPY_CLIENT_ID,
         client_secret=SPOTIPY_CLIENT_SECRET,
         redirect_uri=SPOTIPY_REDIRECT_URI,
         scope=SCOPE
-    ))
+    )), "spotify")
     logger.info("Spotify API connection established successfully")
 except Exception as e:
     logger.error(f"Failed to initialize Spotify API connection: {e}")
     raise
 
 def wait(category="helper"):
-    if category == "helper":
-        time.sleep(helperSleep)
-    elif category == "high":
-        time.sleep(highLevelSleep)
-    elif category == "play":
-        time.sleep(playSongSleep)
+    with tracer.span(f"wait.{category}"):
+        if category == "helper":
+            time.sleep(helperSleep)
+        elif category == "high":
+            time.sleep(highLevelSleep)
+        elif category == "play":
+            time.sleep(playSongSleep)
 
 # --- Playback Controls ---
 def play_liked_songs(limit=100):
@@ -360,17 +366,17 @@ def toggle_repeat():
         return False, None
 
 
-def volume_up(step=10):
+def change_volume(delta):
     """
-    Increase volume by specified percentage
+    Change volume by a relative amount in a single read and write
     
     Args:
-        step (int): Percentage to increase volume (default: 10)
+        delta (int): Percentage points to add (negative to decrease)
         
     Returns:
         tuple: (bool, int) - Success status and new volume level
     """
-    logger.info(f"Increasing volume by {step}%")
+    logger.info(f"Changing volume by {delta:+d}%")
     try:
         playback = sp.current_playback()
         if not playback:
@@ -379,23 +385,36 @@ def volume_up(step=10):
             return False, None
             
         current_volume = playback['device']['volume_percent']
-        new_volume = min(100, current_volume + step)
+        new_volume = max(0, min(100, current_volume + delta))
         sp.volume(new_volume)
-        logger.debug(f"Volume increased from {current_volume}% to {new_volume}%")
+        logger.debug(f"Volume changed from {current_volume}% to {new_volume}%")
         print(f"Volume: {new_volume}%")
         
         wait("high")
         return True, new_volume
     except spotipy.exceptions.SpotifyException as e:
-        logger.error(f"Spotify API error increasing volume: {e}")
+        logger.error(f"Spotify API error changing volume: {e}")
         print(f"Spotify error: {e}")
         return False, None
     except Exception as e:
-        logger.error(f"Error increasing volume: {e}")
-        print(f"Error increasing volume: {e}")
+        logger.error(f"Error changing volume: {e}")
+        print(f"Error changing volume: {e}")
         return False, None
 
 
+def volume_up(step=10):
+    """
+    Increase volume by specified percentage
+    
+    Args:
+        step (int): Percentage to increase volume (default: 10)
+        
+    Returns:
+        tuple: (bool, int) - Success status and new volume level
+    """
+    return change_volume(step)
+
+
 def volume_down(step=10):
     """
     Decrease volume by specified percentage
@@ -406,40 +425,20 @@ def volume_down(step=10):
     Returns:
         tuple: (bool, int) - Success status and new volume level
     """
-    logger.info(f"Decreasing volume by {step}%")
-    try:
-        playback = sp.current_playback()
-        if not playback:
-            logger.warning("No active playback session found")
-            print("No active playback session found")
-            return False, None
-            
-        current_volume = playback['device']['volume_percent']
-        new_volume = max(0, current_volume - step)
-        sp.volume(new_volume)
-        logger.debug(f"Volume decreased from {current_volume}% to {new_volume}%")
-        print(f"Volume: {new_volume}%")
-        
-        wait("high")
-        return True, new_volume
-    except spotipy.exceptions.SpotifyException as e:
-        logger.error(f"Spotify API error decreasing volume: {e}")
-        print(f"Spotify error: {e}")
-        return False, None
-    except Exception as e:
-        logger.error(f"Error decreasing volume: {e}")
-        print(f"Error decreasing volume: {e}")
-        return False, None
+    return change_volume(-step)
 
 
-def skip_5_seconds():
+def seek_relative(offset_ms):
     """
-    Skip forward 5 seconds in the current track
+    Move the playback position by a relative amount in a single read and write
     
+    Args:
+        offset_ms (int): Milliseconds to move (negative to go back)
+        
     Returns:
         bool: True if successful, False otherwise
     """
-    logger.info("Skipping forward 5 seconds")
+    logger.info(f"Seeking {offset_ms / 1000:+.0f} seconds")
     try:
         playback = sp.current_playback()
         if not playback:
@@ -448,23 +447,36 @@ def skip_5_seconds():
             return False
             
         current_position = playback['progress_ms']
-        new_position = current_position + 5000
+        new_position = max(0, current_position + offset_ms)
         sp.seek_track(new_position)
         logger.debug(f"Position changed from {current_position}ms to {new_position}ms")
-        print("Skipped forward 5 seconds")
+        if offset_ms >= 0:
+            print(f"Skipped forward {offset_ms // 1000} seconds")
+        else:
+            print(f"Went back {-offset_ms // 1000} seconds")
         
         wait("high")
         return True
     except spotipy.exceptions.SpotifyException as e:
-        logger.error(f"Spotify API error skipping forward: {e}")
+        logger.error(f"Spotify API error seeking: {e}")
         print(f"Spotify error: {e}")
         return False
     except Exception as e:
-        logger.error(f"Error skipping forward: {e}")
-        print(f"Error skipping forward: {e}")
+        logger.error(f"Error seeking: {e}")
+        print(f"Error seeking: {e}")
         return False
 
 
+def skip_5_seconds():
+    """
+    Skip forward 5 seconds in the current track
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return seek_relative(5000)
+
+
 def go_back_5_seconds():
     """
     Go back 5 seconds in the current track
@@ -472,29 +484,49 @@ def go_back_5_seconds():
     Returns:
         bool: True if successful, False otherwise
     """
-    logger.info("Going back 5 seconds")
+    return seek_relative(-5000)
+
+
+def skip_tracks(count):
+    """
+    Skip several tracks forward or back with one playback check and one wait
+    
+    Args:
+        count (int): Tracks to skip (negative to go back)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    # Single skips keep the fallback to related music when the queue is empty
+    if count == 1:
+        return next_track()
+    if count == -1:
+        return previous_track()
+    if count == 0:
+        return True
+    
+    logger.info(f"Skipping {count:+d} tracks")
     try:
         playback = sp.current_playback()
         if not playback:
             logger.warning("No active playback session found")
             print("No active playback session found")
             return False
-            
-        current_position = playback['progress_ms']
-        new_position = max(0, current_position - 5000)
-        sp.seek_track(new_position)
-        logger.debug(f"Position changed from {current_position}ms to {new_position}ms")
-        print("Went back 5 seconds")
+        
+        step = sp.next_track if count > 0 else sp.previous_track
+        for _ in range(abs(count)):
+            step()
+        print(f"Skipped {abs(count)} tracks {'forward' if count > 0 else 'back'}")
         
         wait("high")
         return True
     except spotipy.exceptions.SpotifyException as e:
-        logger.error(f"Spotify API error going back: {e}")
+        logger.error(f"Spotify API error skipping tracks: {e}")
         print(f"Spotify error: {e}")
         return False
     except Exception as e:
-        logger.error(f"Error going back: {e}")
-        print(f"Error going back: {e}")
+        logger.error(f"Error skipping tracks: {e}")
+        print(f"Error skipping tracks: {e}")
         return False
 
 
@@ -649,6 +681,54 @@ def get_artists(limit=5, print_results=True):
         print(f"Error fetching top artists: {e}")
         return []
 
+def find_artist(artist_name):
+    """
+    Search for an artist by name using fuzzy matching
+    
+    Args:
+        artist_name (str): Name of the artist to search for
+        
+    Returns:
+        tuple: (artist_id, found_name, score) of the best match, or (None, None, 0) if
+            nothing matched well enough
+    """
+    results = sp.search(q=artist_name, type='artist', limit=10)
+    artists = results['artists']['items']
+    
+    if not artists:
+        logger.warning(f"No artist found with name: {artist_name}")
+        print(f"No artist found with name: {artist_name}")
+        return None, None, 0
+    
+    # Use fuzzy matching to find the best artist match
+    best_match = None
+    highest_score = 0
+    
+    for artist in artists:
+        found_name = artist['name']
+        # Calculate fuzzy matching score
+        score = fuzz.ratio(artist_name.lower(), found_name.lower())
+        
+        # Also check partial token matching for artists with longer names
+        token_score = fuzz.partial_token_set_ratio(artist_name.lower(), found_name.lower())
+        
+        # Take the higher of the two scores
+        final_score = max(score, token_score)
+        
+        if final_score > highest_score:
+            highest_score = final_score
+            best_match = artist
+    
+    # Only accept a match with at least a decent score (above 60)
+    if best_match and highest_score > 60:
+        logger.info(f"Found artist match: '{best_match['name']}' with score: {highest_score}")
+        return best_match['id'], best_match['name'], highest_score
+    
+    logger.warning(f"No good artist match found for: {artist_name}")
+    print(f"No good match found for artist: {artist_name}")
+    return None, None, 0
+
+
 def play_artist_by_name(artist_name):
     """
     Search for an artist by name using fuzzy matching and play their top tracks
@@ -661,71 +741,15 @@ def play_artist_by_name(artist_name):
     """
     logger.info(f"Searching for and playing artist: {artist_name}")
     try:
-        # Search for the artist with a more general query to get multiple results
-        results = sp.search(q=artist_name, type='artist', limit=10)
-        artists = results['artists']['items']
-        
-        if not artists:
-            logger.warning(f"No artist found with name: {artist_name}")
-            print(f"No artist found with name: {artist_name}")
+        artist_id, found_name, score = find_artist(artist_name)
+        if not artist_id:
             return False
         
-        # Use fuzzy matching to find the best artist match
-        best_match = None
-        highest_score = 0
-        
-        for artist in artists:
-            found_name = artist['name']
-            # Calculate fuzzy matching score
-            score = fuzz.ratio(artist_name.lower(), found_name.lower())
-            
-            # Also check partial token matching for artists with longer names
-            token_score = fuzz.partial_token_set_ratio(artist_name.lower(), found_name.lower())
-            
-            # Take the higher of the two scores
-            final_score = max(score, token_score)
-            
-            if final_score > highest_score:
-                highest_score = final_score
-                best_match = artist
+        if score < 85:
+            # If score is good but not great, inform the user of the match
+            print(f"Playing music by {found_name} (closest match to '{artist_name}')")
         
-        # If we have a match with at least a decent score (above 60)
-        if best_match and highest_score > 60:
-            artist_id = best_match['id']
-            found_name = best_match['name']
-            
-            # Log the match information
-            logger.info(f"Found artist match: '{found_name}' with score: {highest_score}")
-            
-            if highest_score < 85:
-                # If score is good but not great, inform the user of the match
-                print(f"Playing music by {found_name} (closest match to '{artist_name}')")
-            else:
-                print(f"Playing top tracks by {found_name}")
-            
-            # Get the artist's top tracks
-            top_tracks = sp.artist_top_tracks(artist_id)
-            track_uris = [track['uri'] for track in top_tracks['tracks']]
-            
-            if track_uris:
-                logger.debug(f"Found {len(track_uris)} tracks for artist")
-                sp.start_playback(uris=track_uris)
-                
-                try:
-                    wait("high")  # Assuming this is a helper function in your codebase
-                except NameError:
-                    # If wait() is not defined, simply continue
-                    pass
-                    
-                return True
-            else:
-                logger.warning(f"No tracks found for artist: {found_name}")
-                print(f"No tracks found for {found_name}")
-                return False
-        else:
-            logger.warning(f"No good artist match found for: {artist_name}")
-            print(f"No good match found for artist: {artist_name}")
-            return False
+        return play_artist(artist_id, found_name)
             
     except spotipy.exceptions.SpotifyException as e:
         logger.error(f"Spotify API error when playing artist: {e}")
@@ -736,12 +760,13 @@ def play_artist_by_name(artist_name):
         print(f"Error playing artist: {e}")
         return False
 
-def play_artist(artist_id):
+def play_artist(artist_id, artist_name=None):
     """
     Play top tracks from an artist
     
     Args:
         artist_id (str): Spotify artist ID
+        artist_name (str, optional): Artist name, if already known (skips the lookup)
         
     Returns:
         bool: True if playback started successfully, False otherwise
@@ -749,11 +774,12 @@ def play_artist(artist_id):
     logger.info(f"Playing top tracks for artist with ID: {artist_id}")
     try:
         # First, try to get the artist name for better user feedback
-        try:
-            artist_info = sp.artist(artist_id)
-            artist_name = artist_info['name']
-        except:
-            artist_name = "selected artist"
+        if artist_name is None:
+            try:
+                artist_info = sp.artist(artist_id)
+                artist_name = artist_info['name']
+            except:
+                artist_name = "selected artist"
             
         results = sp.artist_top_tracks(artist_id)
         track_uris = [track['uri'] for track in results['tracks']]
@@ -0,0 +1,309 @@
+# tracing.py
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from logger import logger
+
+TRACE_HISTORY = 200  # finished utterances kept for export
+STAGE_HISTORY = 500  # span durations kept per stage for percentiles
+TRACE_EXPORT_PATH = Path("logs/trace.json")  # Chrome trace written at shutdown
+
+_current = contextvars.ContextVar("trace", default=None)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list (0 if empty)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+class Trace:
+    """
+    Timeline of one utterance, from the first speech frame to the end of its response.
+
+    Spans are (stage, thread id, start, end, args) with perf_counter times; they are
+    appended from whichever thread ran the stage.
+    """
+
+    def __init__(self, trace_id, label="utterance", started=None):
+        self.id = trace_id
+        self.label = label
+        self.started = started if started is not None else time.perf_counter()
+        self.finished = None
+        self.spans = []
+
+    def __repr__(self):
+        return f"Trace({self.id}, {self.label!r})"
+
+
+class TracedCommand(str):
+    """Command text that carries the trace of the utterance it came from through a queue."""
+
+    def __new__(cls, command, trace):
+        text = super().__new__(cls, command)
+        text.trace = trace
+        return text
+
+
+class Tracer:
+    """
+    Per-utterance latency tracing with correlation ids.
+
+    Each utterance gets a Trace when capture ends. The active trace lives in a context
+    variable, so stages only call span(name). The trace follows the command across
+    threads through handoff()/resume() (the queued command carries it) and bind()
+    (executor workers). Span durations feed rolling per-stage percentiles, and recent traces can
+    be exported as Chrome trace JSON (chrome://tracing or ui.perfetto.dev).
+    """
+
+    def __init__(self, enabled=True, history=TRACE_HISTORY):
+        self.enabled = enabled
+        self._ids = itertools.count(1)
+        self._traces = deque(maxlen=history)
+        self._untraced = deque(maxlen=STAGE_HISTORY)  # spans that ran outside any utterance
+        self._durations = defaultdict(lambda: deque(maxlen=STAGE_HISTORY))  # stage -> ms
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Get the trace active in this thread or task, or None."""
+        return _current.get()
+
+    def start_trace(self, label="utterance", started=None):
+        """
+        Start a new trace and make it the active one.
+
+        Args:
+            label (str): Description, replaced by the command text at handoff
+            started (float, optional): perf_counter time the utterance began (e.g. the
+                first speech frame); defaults to now
+
+        Returns:
+            Trace: The new trace (None when tracing is disabled)
+        """
+        if not self.enabled:
+            return None
+        trace = Trace(next(self._ids), label, started)
+        with self._lock:
+            self._traces.append(trace)
+        _current.set(trace)
+        return trace
+
+    def record(self, name, start, end=None, trace=None, **args):
+        """
+        Add a span with explicit perf_counter times (for stages timed before the trace existed).
+
+        Args:
+            name (str): Stage name
+            start (float): perf_counter start time
+            end (float, optional): perf_counter end time; defaults to now
+            trace (Trace, optional): Trace to add to; defaults to the active one
+        """
+        if not self.enabled:
+            return
+        end = end if end is not None else time.perf_counter()
+        trace = trace if trace is not None else _current.get()
+        span = (name, threading.get_ident(), start, end, args)
+        if trace is not None:
+            trace.spans.append(span)
+        else:
+            self._untraced.append(span)
+        self._durations[name].append((end - start) * 1000)
+
+    @contextmanager
+    def _span(self, name, args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, **args)
+
+    def span(self, name, **args):
+        """
+        Time a stage of the active trace.
+
+        Usage:
+            with tracer.span("asr"):
+                text = backend.transcribe(audio)
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, args)
+
+    def instrument(self, client, prefix):
+        """
+        Wrap an API client so every method call is a span named "<prefix>.<method>".
+
+        Returns:
+            object: A proxy for client (calls are not timed while tracing is disabled)
+        """
+        return _InstrumentedClient(self, client, prefix)
+
+    @contextmanager
+    def activate(self, trace):
+        """Make a trace the active one for the duration of the block (no-op for None)."""
+        if trace is None:
+            yield None
+            return
+        reset = _current.set(trace)
+        try:
+            yield trace
+        finally:
+            _current.reset(reset)
+
+    def handoff(self, command):
+        """
+        Attach the active trace to a command about to be queued.
+
+        The trace is detached from the calling thread, so the next utterance captured
+        there starts a fresh one. A command queued without an active trace (e.g. from
+        a worker process) starts one here. The trace travels with the queued item, so
+        identical commands keep their own traces and a superseded command takes its
+        trace with it.
+
+        Returns:
+            str: The command to queue (a TracedCommand while tracing is enabled)
+        """
+        if not self.enabled:
+            return command
+        trace = _current.get() or self.start_trace()
+        trace.label = command
+        _current.set(None)
+        return TracedCommand(command, trace)
+
+    def resume(self, command):
+        """
+        Get the trace a queued command carries.
+
+        Returns:
+            Trace: The command's trace, or None if it has none (e.g. typed commands)
+        """
+        return getattr(command, "trace", None) if self.enabled else None
+
+    def bind(self, action, name, trace=None):
+        """
+        Wrap a callable so it runs as a span of the given (or active) trace on any thread.
+
+        When it returns, the trace is marked finished (see finish).
+        """
+        trace = trace if trace is not None else _current.get()
+        if not self.enabled or trace is None:
+            return action
+
+        @functools.wraps(action)
+        def run():
+            with self.activate(trace):
+                try:
+                    with self.span(name):
+                        return action()
+                finally:
+                    self.finish(trace)
+        return run
+
+    def finish(self, trace):
+        """
+        Mark a trace done. Work that finishes later for the same utterance (e.g. a
+        coalesced Spotify operation) moves the end forward, so the "utterance" stage
+        covers first speech frame to the last bound action.
+        """
+        if trace is None:
+            return
+        trace.finished = time.perf_counter()
+        logger.debug(f"Utterance {trace.id} '{trace.label}' took {(trace.finished - trace.started) * 1000:.0f} ms: "
+                     + ", ".join(f"{name} {(end - start) * 1000:.0f}" for name, _, start, end, _ in trace.spans))
+
+    def stats(self):
+        """
+        Get rolling latency percentiles per stage.
+
+        Returns:
+            dict: Stage -> {"count", "p50", "p95", "p99", "max"} in milliseconds, plus
+                "utterance" for end-to-end time of finished traces
+        """
+        with self._lock:
+            totals = [(trace.finished - trace.started) * 1000 for trace in self._traces if trace.finished]
+        stages = dict(self._durations)
+        stages["utterance"] = totals
+        stats = {}
+        for name, durations in stages.items():
+            values = sorted(durations)
+            stats[name] = {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else 0.0,
+            }
+        return stats
+
+    def export_chrome_trace(self, path=TRACE_EXPORT_PATH):
+        """
+        Write recent traces in Chrome trace event format.
+
+        Each utterance is drawn on its own track, and every span appears on the thread
+        that ran it, tagged with the utterance id.
+
+        Args:
+            path (Path, optional): Output file; None only returns the events
+
+        Returns:
+            dict: The trace document ({"traceEvents": [...]})
+        """
+        pid = os.getpid()
+        with self._lock:
+            traces = list(self._traces)
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread.ident,
+                   "args": {"name": thread.name}} for thread in threading.enumerate()]
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "utterances"}})
+
+        def complete(name, tid, start, end, args):
+            return {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                    "ts": start * 1e6, "dur": max(end - start, 0.0) * 1e6, "args": args}
+
+        for trace in traces:
+            tag = {"utterance": trace.id, "command": trace.label}
+            end = trace.finished or max((span[3] for span in trace.spans), default=trace.started)
+            events.append(complete(f"utterance {trace.id}: {trace.label}", 0, trace.started, end, tag))
+            for name, tid, start, stop, args in list(trace.spans):
+                events.append(complete(name, tid, start, stop, {**tag, **args}))
+        for name, tid, start, stop, args in list(self._untraced):
+            events.append(complete(name, tid, start, stop, args))
+
+        document = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(document, f)
+            logger.info(f"Wrote {len(traces)} utterance trace(s) to {path}")
+        return document
+
+
+class _InstrumentedClient:
+    """Proxy that times every method call of a client as a tracer span."""
+
+    def __init__(self, tracer, client, prefix):
+        self._tracer = tracer
+        self._client = client
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            with self._tracer.span(f"{self._prefix}.{name}"):
+                return attribute(*args, **kwargs)
+        return call
+
+
+# Shared tracer for the whole assistant
+tracer = Tracer()
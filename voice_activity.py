@@ -0,0 +1,183 @@
+# voice_activity.py
+from collections import deque
+import numpy as np
+from logger import logger
+
+# Default VAD settings
+VAD_FRAME_MS = 20  # analysis frame length; 320 samples at 16 kHz divides 1600/8000 sample blocks evenly
+VAD_ENERGY_RATIO = 3.0  # speech must be this many times louder than the tracked noise floor
+VAD_MIN_ENERGY = 200.0  # absolute RMS floor so digital silence never counts as speech
+VAD_MAX_ZCR = 0.35  # zero-crossing rate above this is treated as hiss rather than voice
+VAD_HANGOVER_FRAMES = 15  # keep forwarding 300 ms after the last speech frame
+VAD_PRE_ROLL_FRAMES = 10  # forward the 200 ms before speech onset so first phonemes aren't clipped
+VAD_NOISE_ADAPTATION = 0.05  # EMA weight used to follow the noise floor on non-speech frames
+
+
+class VoiceActivityDetector:
+    """
+    Energy plus zero-crossing voice activity detector for raw int16 audio.
+
+    Blocks of any size are split into fixed analysis frames and classified in one
+    vectorized NumPy pass. Only speech (plus pre-roll and hangover) is returned for
+    forwarding to the recognizer; everything else is dropped and counted.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=VAD_FRAME_MS, energy_ratio=VAD_ENERGY_RATIO,
+                 min_energy=VAD_MIN_ENERGY, max_zcr=VAD_MAX_ZCR, hangover_frames=VAD_HANGOVER_FRAMES,
+                 pre_roll_frames=VAD_PRE_ROLL_FRAMES, noise_adaptation=VAD_NOISE_ADAPTATION):
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.frame_seconds = frame_ms / 1000
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.max_zcr = max_zcr
+        self.hangover_frames = hangover_frames
+        self.noise_adaptation = noise_adaptation
+
+        self.noise_energy = None  # set by calibrate(), else initialised from the first block
+        self.in_speech = False
+        self.segment_ended = False  # True if the last process() call closed a speech segment
+
+        self._hangover = 0
+        self._silent_frames = 0  # consecutive non-speech frames, hangover included
+        self._pre_roll = deque(maxlen=pre_roll_frames)
+        self._remainder = np.empty(0, dtype=np.int16)
+
+        # Counters
+        self.frames_forwarded = 0
+        self.frames_dropped = 0
+        self.segments = 0
+
+    def _classify(self, frames):
+        """Return a boolean speech decision for each row of a (n, frame_length) int16 array."""
+        samples = frames.astype(np.float32)
+        energy = np.sqrt(np.mean(samples * samples, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_length - 1)
+
+        if self.noise_energy is None:
+            self.noise_energy = float(np.min(energy))
+
+        threshold = max(self.min_energy, self.noise_energy * self.energy_ratio)
+        is_speech = (energy > threshold) & (zcr <= self.max_zcr)
+
+        # Follow the noise floor using only the frames that were not speech
+        quiet = energy[~is_speech]
+        if quiet.size:
+            self.noise_energy += self.noise_adaptation * (float(np.mean(quiet)) - self.noise_energy)
+
+        return is_speech
+
+    def calibrate(self, block):
+        """
+        Set the noise floor from ambient audio, once when the stream opens.
+
+        The floor then keeps following the room on non-speech frames, so no further
+        calibration is needed for the life of the stream.
+
+        Args:
+            block (bytes | memoryview | np.ndarray): 16-bit mono PCM captured before anyone speaks
+
+        Returns:
+            float | None: The noise floor RMS (None if the block is shorter than one frame)
+        """
+        samples = np.frombuffer(block, dtype=np.int16) if not isinstance(block, np.ndarray) else block
+        frame_count = samples.size // self.frame_length
+        if frame_count == 0:
+            return self.noise_energy
+        frames = samples[:frame_count * self.frame_length].reshape(frame_count, self.frame_length)
+        frames = frames.astype(np.float32)
+        # Median frame energy, so a click or cough during calibration does not raise the floor
+        self.noise_energy = float(np.median(np.sqrt(np.mean(frames * frames, axis=1))))
+        return self.noise_energy
+
+    def process(self, block):
+        """
+        Gate one block of captured audio.
+
+        Args:
+            block (bytes | memoryview | np.ndarray): 16-bit mono PCM
+
+        Returns:
+            bytes: Audio to forward to the recognizer (empty when nothing should be sent)
+        """
+        samples = np.frombuffer(block, dtype=np.int16) if not isinstance(block, np.ndarray) else block
+        if self._remainder.size:
+            samples = np.concatenate((self._remainder, samples))
+
+        frame_count = samples.size // self.frame_length
+        usable = frame_count * self.frame_length
+        self._remainder = samples[usable:].copy()
+        self.segment_ended = False
+
+        if frame_count == 0:
+            return b""
+
+        frames = samples[:usable].reshape(frame_count, self.frame_length)
+        decisions = self._classify(frames)
+
+        forwarded = []
+        for frame, is_speech in zip(frames, decisions):
+            if is_speech:
+                if not self.in_speech:
+                    # Speech onset: flush the pre-roll ahead of the first speech frame
+                    self.in_speech = True
+                    self.segments += 1
+                    forwarded.extend(self._pre_roll)
+                    self.frames_forwarded += len(self._pre_roll)
+                    self.frames_dropped -= len(self._pre_roll)
+                    self._pre_roll.clear()
+                self._hangover = self.hangover_frames
+                self._silent_frames = 0
+                forwarded.append(frame.tobytes())
+                self.frames_forwarded += 1
+            elif self.in_speech and self._hangover > 0:
+                self._hangover -= 1
+                self._silent_frames += 1
+                forwarded.append(frame.tobytes())
+                self.frames_forwarded += 1
+            else:
+                if self.in_speech:
+                    self.in_speech = False
+                    self.segment_ended = True
+                    logger.debug(f"VAD segment ended: {self.stats()}")
+                self._pre_roll.append(frame.tobytes())
+                self.frames_dropped += 1
+
+        return b"".join(forwarded)
+
+    @property
+    def trailing_silence(self):
+        """Seconds of non-speech since the last speech frame of the current segment."""
+        return self._silent_frames * self.frame_seconds
+
+    def end_segment(self):
+        """Close the current segment early (e.g. when an endpointer decided it is over)."""
+        if self.in_speech:
+            self.in_speech = False
+            self._hangover = 0
+            self._silent_frames = 0
+
+    def reset(self):
+        """Forget the current segment state (the noise floor estimate is kept)."""
+        self.in_speech = False
+        self.segment_ended = False
+        self._hangover = 0
+        self._silent_frames = 0
+        self._pre_roll.clear()
+        self._remainder = np.empty(0, dtype=np.int16)
+
+    def stats(self):
+        """
+        Get VAD counters.
+
+        Returns:
+            dict: Frames forwarded/dropped, segment count, drop ratio and noise floor
+        """
+        total = self.frames_forwarded + self.frames_dropped
+        return {
+            "frames_forwarded": self.frames_forwarded,
+            "frames_dropped": self.frames_dropped,
+            "segments": self.segments,
+            "drop_ratio": self.frames_dropped / total if total else 0.0,
+            "noise_energy": self.noise_energy,
+        }
@@ -0,0 +1,180 @@
+# vosk_model_manager.py
+import threading
+import time
+from contextlib import contextmanager
+from logger import logger
+
+try:
+    import psutil
+except ImportError:  # Memory reporting is optional
+    psutil = None
+
+try:
+    from vosk import Model, KaldiRecognizer
+except ImportError:
+    Model = None
+    KaldiRecognizer = None
+
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+MAX_POOLED_RECOGNIZERS = 4  # idle recognizers kept per (sample rate, grammar)
+
+
+def _resident_memory_mb():
+    """Return this process's resident memory in MB, or None if psutil is unavailable."""
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+class VoskModelManager:
+    """
+    Loads the Vosk model once per process and hands out recognizers from a pool.
+
+    The model can be loaded on a background thread while the rest of startup continues;
+    listeners, wake detectors and benchmark workers then share the same instance
+    instead of each paying the load time and memory.
+    """
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+        self._load_error = None
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._loader = None
+        self._pool = {}  # (sample_rate, grammar) -> idle recognizers
+        self._keys = {}  # id(recognizer) -> pool key
+
+        # Stats
+        self.load_seconds = None
+        self.load_memory_mb = None
+        self.recognizers_created = 0
+        self.recognizers_reused = 0
+
+    def _load(self):
+        """Load the model (runs once, on the loader thread started by preload())."""
+        if KaldiRecognizer is None:
+            self._load_error = ImportError("The vosk package is required to load the model")
+            self._loaded.set()
+            return
+
+        logger.info(f"Loading Vosk model from {self.model_path}")
+        memory_before = _resident_memory_mb()
+        started = time.perf_counter()
+        try:
+            self._model = Model(self.model_path)
+            self.load_seconds = time.perf_counter() - started
+            if memory_before is not None:
+                self.load_memory_mb = _resident_memory_mb() - memory_before
+            logger.info(f"Vosk model loaded in {self.load_seconds:.2f}s")
+        except Exception as e:
+            self._load_error = e
+            logger.error(f"Failed to load Vosk model: {e}")
+        finally:
+            self._loaded.set()
+
+    def preload(self):
+        """Start loading the model in the background (no-op if already started)."""
+        with self._lock:
+            if self._loader is None:
+                self._loader = threading.Thread(target=self._load, name="vosk-model-loader", daemon=True)
+                self._loader.start()
+
+    def get_model(self, timeout=None):
+        """
+        Get the shared model, waiting for the background load if necessary.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the load to finish
+
+        Returns:
+            vosk.Model: The loaded model
+
+        Raises:
+            TimeoutError: If the model is not loaded within the timeout
+        """
+        self.preload()
+        if not self._loaded.wait(timeout):
+            raise TimeoutError(f"Vosk model not loaded after {timeout} seconds")
+        if self._load_error:
+            raise self._load_error
+        return self._model
+
+    @property
+    def is_loaded(self):
+        """True once the model is ready for use."""
+        return self._loaded.is_set() and self._model is not None
+
+    def acquire(self, sample_rate=16000, grammar=None):
+        """
+        Get a recognizer, reusing an idle one from the pool when possible.
+
+        Args:
+            sample_rate (int): Sample rate of the audio the recognizer will receive
+            grammar (str, optional): JSON list of phrases to restrict recognition to
+
+        Returns:
+            vosk.KaldiRecognizer: A reset recognizer
+        """
+        key = (sample_rate, grammar)
+        with self._lock:
+            idle = self._pool.get(key)
+            if idle:
+                self.recognizers_reused += 1
+                return idle.pop()
+
+        model = self.get_model()
+        if grammar is None:
+            recognizer = KaldiRecognizer(model, sample_rate)
+        else:
+            recognizer = KaldiRecognizer(model, sample_rate, grammar)
+
+        with self._lock:
+            self._keys[id(recognizer)] = key
+            self.recognizers_created += 1
+        return recognizer
+
+    def release(self, recognizer):
+        """Return a recognizer to the pool once its owner is finished with it."""
+        with self._lock:
+            key = self._keys.get(id(recognizer))
+            if key is None:
+                return
+            idle = self._pool.setdefault(key, [])
+            if len(idle) < MAX_POOLED_RECOGNIZERS:
+                recognizer.Reset()
+                idle.append(recognizer)
+            else:
+                del self._keys[id(recognizer)]
+
+    @contextmanager
+    def recognizer(self, sample_rate=16000, grammar=None):
+        """Context manager that acquires a recognizer and releases it afterwards."""
+        recognizer = self.acquire(sample_rate, grammar)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer)
+
+    def stats(self):
+        """
+        Get model manager stats.
+
+        Returns:
+            dict: Load time, memory used by the model, process RSS and pool usage
+        """
+        with self._lock:
+            pooled = sum(len(idle) for idle in self._pool.values())
+        return {
+            "loaded": self.is_loaded,
+            "load_seconds": self.load_seconds,
+            "load_memory_mb": self.load_memory_mb,
+            "resident_memory_mb": _resident_memory_mb(),
+            "recognizers_created": self.recognizers_created,
+            "recognizers_reused": self.recognizers_reused,
+            "recognizers_pooled": pooled,
+        }
+
+
+# Shared manager for this process
+model_manager = VoskModelManager()
@@ -0,0 +1,195 @@
+# wake_word.py
+import json
+import time
+from collections import deque
+from logger import logger
+from vosk_model_manager import model_manager
+
+WAKE_WORDS = ["hey nova", "hey atlas", "yo nova"]
+COMMAND_WINDOW_SECONDS = 5.0  # how long the full recognizer stays active after a wake hit
+LATENCY_HISTORY = 200  # wake-to-ready samples kept for stats
+
+
+class WakeWordCascade:
+    """
+    Two-stage wake word detector.
+
+    Stage one is a KaldiRecognizer restricted to the wake phrases (plus [unk]), which is
+    cheap enough to run on every frame. Only after it fires is audio sent to the
+    full-vocabulary recognizer, and only for a bounded command window.
+    """
+
+    def __init__(self, wake_words=WAKE_WORDS, sample_rate=16000,
+                 command_window=COMMAND_WINDOW_SECONDS, on_wake=None, manager=model_manager):
+        """
+        Args:
+            wake_words (list): Wake phrases to listen for
+            sample_rate (int): Sample rate of the audio fed to process()
+            command_window (float): Seconds the full recognizer stays active after a wake hit
+            on_wake (callable, optional): Called with the wake phrase when stage one fires
+            manager (VoskModelManager): Source of the shared model and pooled recognizers
+        """
+        self.wake_words = [phrase.lower() for phrase in wake_words]
+        self.command_window = command_window
+        self.on_wake = on_wake
+
+        self.sample_rate = sample_rate
+        grammar = json.dumps(self.wake_words + ["[unk]"])
+        self.wake_recognizer = manager.acquire(sample_rate, grammar)
+        self.command_recognizer = manager.acquire(sample_rate)
+        # Word end times locate the wake phrase inside a block, so the audio after it
+        # can go to the command stage
+        self.wake_recognizer.SetWords(True)
+        if hasattr(self.wake_recognizer, "SetPartialWords"):
+            self.wake_recognizer.SetPartialWords(True)
+
+        self.awake = False
+        self._window_deadline = 0.0
+        self._wake_samples = 0  # samples fed to the wake recognizer since its last reset
+
+        # Counters
+        self.wakes = 0
+        self.false_wakes = 0
+        self.commands = 0
+        self.wake_to_ready_ms = deque(maxlen=LATENCY_HISTORY)
+
+    def _match_wake_word(self, text):
+        """Return the wake phrase contained in text, or None."""
+        for phrase in self.wake_words:
+            if phrase in text:
+                return phrase
+        return None
+
+    def _strip_wake_word(self, text):
+        """Remove a wake phrase heard again at the start of a command ("hey nova pause" -> "pause")."""
+        for phrase in self.wake_words:
+            if text == phrase or text.startswith(phrase + " "):
+                return text[len(phrase):].strip()
+        return text
+
+    def _wake_end_offset(self, words, phrase, block_start, block_samples):
+        """
+        Locate the end of the wake phrase inside the current block.
+
+        Args:
+            words (list): Word results with "word" and "end" (seconds since reset)
+            phrase (str): Wake phrase that matched
+            block_start (int): Samples fed to the wake recognizer before this block
+            block_samples (int): Samples in this block
+
+        Returns:
+            int: Samples of this block up to the end of the wake phrase (0 when the
+                recognizer gave no word times, so the whole block is kept)
+        """
+        last_word = phrase.split()[-1]
+        ends = [word["end"] for word in words if word.get("word") == last_word and "end" in word]
+        if not ends:
+            return 0
+        offset = int(ends[-1] * self.sample_rate) - block_start
+        return max(0, min(block_samples, offset))
+
+    def _wake(self, phrase, woke_at):
+        """
+        Switch to the command stage after a wake hit.
+
+        Args:
+            phrase (str): Wake phrase that matched
+            woke_at (float): perf_counter time the wake phrase ended
+        """
+        self.wakes += 1
+        self.wake_recognizer.Reset()
+        self._wake_samples = 0
+        self.command_recognizer.Reset()
+        self.awake = True
+        self._window_deadline = time.monotonic() + self.command_window
+
+        # Wake phrase end -> command recognizer armed (detection delay plus the switch),
+        # not counting any pause before the user goes on speaking
+        ready_ms = (time.perf_counter() - woke_at) * 1000
+        self.wake_to_ready_ms.append(ready_ms)
+        logger.info(f"Wake word '{phrase}' detected, command recognizer ready {ready_ms:.1f} ms after it")
+
+        if self.on_wake:
+            self.on_wake(phrase)
+
+    def _sleep(self, command_text):
+        """Return to the wake stage, counting the window as a false wake if nothing was said."""
+        self.awake = False
+        self.wake_recognizer.Reset()
+        self._wake_samples = 0
+        if command_text:
+            self.commands += 1
+        else:
+            self.false_wakes += 1
+            logger.debug("Command window closed without a command (false wake)")
+
+    def process(self, data, segment_ended=False, received_at=None):
+        """
+        Feed a block of audio through the cascade.
+
+        Audio in the same block after the wake phrase goes straight to the command
+        stage, so "hey nova pause" said in one breath is not clipped.
+
+        Args:
+            data (bytes): 16-bit mono PCM (may be empty when a VAD dropped the block)
+            segment_ended (bool): True if an upstream VAD just closed a speech segment
+            received_at (float, optional): perf_counter time the block's last sample was
+                captured; defaults to now
+
+        Returns:
+            str | None: A command transcript recognized inside a wake window, else None
+        """
+        received_at = received_at if received_at is not None else time.perf_counter()
+        if not self.awake:
+            if not data:
+                return None
+            block_start = self._wake_samples
+            block_samples = len(data) // 2
+            self._wake_samples += block_samples
+            if self.wake_recognizer.AcceptWaveform(data):
+                result = json.loads(self.wake_recognizer.Result())
+                text, words = result.get("text", ""), result.get("result", [])
+            else:
+                # Checking the partial result fires as soon as the phrase is heard
+                result = json.loads(self.wake_recognizer.PartialResult())
+                text, words = result.get("partial", ""), result.get("partial_result", [])
+            phrase = self._match_wake_word(text)
+            if not phrase:
+                return None
+            offset = self._wake_end_offset(words, phrase, block_start, block_samples)
+            self._wake(phrase, received_at - (block_samples - offset) / self.sample_rate)
+            remainder = data[offset * 2:]
+            return self.process(remainder, segment_ended, received_at) if remainder or segment_ended else None
+
+        if data and self.command_recognizer.AcceptWaveform(data):
+            text = json.loads(self.command_recognizer.Result()).get("text", "").lower()
+        elif segment_ended or time.monotonic() >= self._window_deadline:
+            text = json.loads(self.command_recognizer.FinalResult()).get("text", "").lower()
+        else:
+            return None
+
+        # A bare repeat of the wake phrase is not a command; keep waiting until the
+        # window closes (e.g. the user paused between "hey nova" and the command)
+        text = self._strip_wake_word(text)
+        if not text and time.monotonic() < self._window_deadline:
+            return None
+
+        self._sleep(text)
+        return text or None
+
+    def stats(self):
+        """
+        Get wake cascade counters.
+
+        Returns:
+            dict: Wake/command counts, false wake rate and wake-to-ready latency
+        """
+        latencies = sorted(self.wake_to_ready_ms)
+        return {
+            "wakes": self.wakes,
+            "commands": self.commands,
+            "false_wakes": self.false_wakes,
+            "false_wake_rate": self.false_wakes / self.wakes if self.wakes else 0.0,
+            "wake_to_ready_ms_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "wake_to_ready_ms_max": latencies[-1] if latencies else 0.0,
+        }